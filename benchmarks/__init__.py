@@ -0,0 +1,7 @@
+"""Benchmarks for the Reactonite transpiler, run them with
+
+python -m benchmarks --sizes 10 100 1000 --output results.json
+
+Sites are generated with SiteGenerator and Node is replaced by
+StubNodeWrapper, so the suite runs offline and only measures Python code.
+"""
@@ -0,0 +1,76 @@
+import json
+import sys
+
+import click
+
+from .runner import DEFAULT_SIZES, compare_results, run_benchmarks
+
+
+@click.command()
+@click.option('--sizes', default=",".join(str(s) for s in DEFAULT_SIZES),
+              help='Comma separated numbers of pages to benchmark with.')
+@click.option('--repeat', '-r', default=3, type=click.IntRange(min=1),
+              help='Number of runs of every benchmark.')
+@click.option('--links', default=10, type=click.IntRange(min=0),
+              help='Links per page.')
+@click.option('--images', default=2, type=click.IntRange(min=0),
+              help='Images per page.')
+@click.option('--scripts', default=1, type=click.IntRange(min=0),
+              help='Inline scripts per page.')
+@click.option('--styles', default=1, type=click.IntRange(min=0),
+              help='Inline style tags per page.')
+@click.option('--depth', default=2, type=click.IntRange(min=0),
+              help='Maximum directory depth of the pages.')
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help='Write the results to this JSON file.')
+@click.option('--baseline', '-b', type=click.Path(exists=True),
+              help='Compare the results with this JSON file.')
+@click.option('--threshold', default=0.1, type=float,
+              help='Slowdown over the baseline counted as a regression.')
+def main(sizes, repeat, links, images, scripts, styles, depth, output,
+         baseline, threshold):
+    """Benchmarks the transpiler on generated sites, exits with status 1
+    if any benchmark regressed compared to the baseline.
+    """
+
+    results = run_benchmarks(
+        sizes=[int(size) for size in sizes.split(",")],
+        repeat=repeat,
+        progress=lambda size: click.echo(
+            "Benchmarking {} pages...".format(size), err=True
+        ),
+        links_per_page=links,
+        images_per_page=images,
+        scripts_per_page=scripts,
+        styles_per_page=styles,
+        depth=depth
+    )
+
+    for size, benchmarks in results["results"].items():
+        for name, timings in benchmarks.items():
+            click.echo("{:>6} pages  {:<24} {:10.4f}s  {:8.3f}ms/page".format(
+                size, name, timings["min"], timings["per_page"] * 1000
+            ))
+
+    if output:
+        with open(output, 'w') as outfile:
+            json.dump(results, outfile, indent=2, sort_keys=True)
+
+    if baseline:
+        with open(baseline) as infile:
+            baseline_results = json.load(infile)
+        regressed = False
+        click.echo("\nCompared to " + baseline)
+        for size, name, ratio, regression in compare_results(
+            results, baseline_results, threshold
+        ):
+            regressed = regressed or regression
+            click.echo("{:>6} pages  {:<24} {:6.2f}x{}".format(
+                size, name, ratio, "  REGRESSION" if regression else ""
+            ))
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from reactonite import __version__
+from reactonite.PropsMap import props_map
+from reactonite.SourceIndex import SourceIndex
+from reactonite.Transpiler import AttributesParser, ReactCodeMapper, Transpiler
+
+from .sitegen import SiteGenerator
+from .stubs import StubNodeWrapper
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+def _time(function, repeat):
+    """Runs function repeat times and summarizes the wall times.
+
+    Parameters
+    ----------
+    function : callable
+        Function to be timed, called without arguments
+    repeat : int
+        Number of runs
+
+    Returns
+    -------
+    dict
+        Fastest and median run time in seconds
+    """
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {"min": min(timings), "median": statistics.median(timings)}
+
+
+def run_size(pages, repeat=3, work_dir=None, **site_options):
+    """Benchmarks the transpiler on a generated site.
+
+    Parameters
+    ----------
+    pages : int
+        Number of pages of the site
+    repeat : int, optional
+        Number of runs of every benchmark, defaults to 3
+    work_dir : str, optional
+        Directory to generate the site in, a temporary directory which is
+        removed afterwards is used if None
+    **site_options
+        Other parameters for SiteGenerator
+
+    Returns
+    -------
+    dict
+        Timings of every benchmark
+    """
+
+    cleanup = work_dir is None
+    if cleanup:
+        work_dir = tempfile.mkdtemp(prefix="reactonite-bench-")
+
+    try:
+        src_dir = os.path.join(work_dir, "src")
+        dest_dir = os.path.join(work_dir, "dist")
+        os.makedirs(os.path.join(dest_dir, "src"), exist_ok=True)
+        open(os.path.join(dest_dir, "src", "index.js"), 'a').close()
+        filepaths = SiteGenerator(pages=pages, **site_options).generate(
+            src_dir
+        )
+
+        config = {
+            "project_name": "benchmark",
+            "src_dir": src_dir,
+            "dest_dir": dest_dir
+        }
+        transpiler = Transpiler(config, props_map, npm=StubNodeWrapper())
+        source_index = SourceIndex(src_dir)
+        source_index.scan()
+        transpiler.source_index = source_index
+
+        pages_tags = []
+        for filepath in filepaths:
+            parser = AttributesParser()
+            with open(filepath) as infile:
+                parser.feed(infile.read())
+            filepath_from_src = os.path.dirname(
+                os.path.relpath(filepath, src_dir)
+            )
+            pages_tags.append((parser.data, filepath_from_src))
+
+        def get_react_maps():
+            for tags, filepath_from_src in pages_tags:
+                mapper = ReactCodeMapper(
+                    src_dir, dest_dir, props_map, source_index
+                )
+                mapper.getReactMap(tags, filepath_from_src)
+
+        def transpile_files():
+            for filepath in filepaths:
+                transpiler.transpileFile(filepath, prettify=False)
+
+        results = {
+            "getReactMap": _time(get_react_maps, repeat),
+            "transpileFile": _time(transpile_files, repeat),
+            "transpile_project_cold": _time(
+                lambda: transpiler.transpile_project(force=True), repeat
+            ),
+            "transpile_project_warm": _time(
+                transpiler.transpile_project, repeat
+            ),
+            "index_js": _time(transpiler.generate_index_js, repeat),
+        }
+        for timings in results.values():
+            timings["per_page"] = timings["min"] / pages
+        return results
+    finally:
+        if cleanup:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, progress=None,
+                   **site_options):
+    """Benchmarks the transpiler on generated sites of every size.
+
+    Parameters
+    ----------
+    sizes : iterable, optional
+        Number of pages of every site, defaults to DEFAULT_SIZES
+    repeat : int, optional
+        Number of runs of every benchmark, defaults to 3
+    progress : callable, optional
+        Called with the size before benchmarking it, defaults to None
+    **site_options
+        Other parameters for SiteGenerator
+
+    Returns
+    -------
+    dict
+        Environment and options of the run along with the results, keyed
+        by size as a string so they survive a JSON round trip
+    """
+
+    results = {}
+    for size in sizes:
+        if progress is not None:
+            progress(size)
+        results[str(size)] = run_size(size, repeat=repeat, **site_options)
+
+    return {
+        "meta": {
+            "reactonite": __version__,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+            "site": site_options
+        },
+        "results": results
+    }
+
+
+def compare_results(current, baseline, threshold=0.1):
+    """Compares the fastest run of every benchmark with a baseline.
+
+    Parameters
+    ----------
+    current : dict
+        Results from run_benchmarks
+    baseline : dict
+        Stored results from run_benchmarks
+    threshold : float, optional
+        Slowdown tolerated before a benchmark counts as a regression,
+        defaults to 0.1 i.e. 10%
+
+    Returns
+    -------
+    list
+        Tuples of size, benchmark name, ratio of current to baseline time
+        and whether it regressed, for benchmarks present in both
+    """
+
+    comparison = []
+    for size, benchmarks in current["results"].items():
+        baseline_benchmarks = baseline["results"].get(size, {})
+        for name, timings in benchmarks.items():
+            if name not in baseline_benchmarks:
+                continue
+            ratio = timings["min"] / max(baseline_benchmarks[name]["min"],
+                                         1e-9)
+            comparison.append((size, name, ratio, ratio > 1 + threshold))
+    return comparison
@@ -0,0 +1,178 @@
+import os
+import random
+
+# 1x1 transparent PNG
+PNG_BYTES = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000001e221bc330000000049454e44"
+    "ae426082"
+)
+
+
+class SiteGenerator:
+    """Generates a synthetic static site to benchmark the transpiler with.
+    The same parameters and seed always generate the same site. Here's an
+    usage example:
+
+    generator = SiteGenerator(pages=100, links_per_page=10, depth=2)
+    generator.generate("site/src")
+
+    Attributes
+    ----------
+    pages : int
+        Number of HTML pages, including the index.html entry point
+    links_per_page : int
+        Number of links to other pages on every page
+    images_per_page : int
+        Number of images on every page, shared between pages
+    scripts_per_page : int
+        Number of inline scripts on every page
+    styles_per_page : int
+        Number of inline style tags on every page
+    paragraphs_per_page : int
+        Number of paragraphs of text on every page
+    depth : int
+        Maximum directory depth of the pages
+    seed : int
+        Seed of the random generator
+    """
+
+    WORDS = (
+        "lorem ipsum dolor sit amet consectetur adipiscing elit sed do "
+        "eiusmod tempor incididunt ut labore et dolore magna aliqua"
+    ).split()
+
+    def __init__(self, pages=100, links_per_page=10, images_per_page=2,
+                 scripts_per_page=1, styles_per_page=1,
+                 paragraphs_per_page=10, depth=2, seed=0):
+        self.pages = pages
+        self.links_per_page = links_per_page
+        self.images_per_page = images_per_page
+        self.scripts_per_page = scripts_per_page
+        self.styles_per_page = styles_per_page
+        self.paragraphs_per_page = paragraphs_per_page
+        self.depth = depth
+        self.seed = seed
+
+    def get_page_paths(self):
+        """Gets the paths of the pages relative to the source directory,
+        spread over directories up to depth levels deep.
+
+        Returns
+        -------
+        list
+            Relative paths of the pages, index.html first
+        """
+
+        rng = random.Random(self.seed)
+        paths = ["index.html"]
+        for number in range(1, self.pages):
+            level = rng.randint(0, self.depth)
+            dirs = ["section{}".format(rng.randint(0, 9))
+                    for _ in range(level)]
+            paths.append(
+                "/".join(dirs + ["page{}.html".format(number)])
+            )
+        return paths
+
+    def __words(self, rng, count):
+        return " ".join(rng.choice(self.WORDS) for _ in range(count))
+
+    def __relative(self, path, start_page):
+        start = os.path.dirname(start_page) or "."
+        return os.path.relpath(path, start).replace(os.sep, "/")
+
+    def generate_page(self, path, paths, rng):
+        """Generates the HTML of a page.
+
+        Parameters
+        ----------
+        path : str
+            Path of the page relative to the source directory
+        paths : list
+            Paths of all the pages, to link to
+        rng : random.Random
+            Random generator to use
+
+        Returns
+        -------
+        str
+            HTML of the page
+        """
+
+        head = ['<title>{}</title>'.format(self.__words(rng, 3)),
+                '<meta charset="utf-8">',
+                '<link rel="stylesheet" href="{}">'.format(
+                    self.__relative("static/site.css", path))]
+        for _ in range(self.styles_per_page):
+            head.append("<style>.c{0} {{ color: #{0:06x}; }}</style>".format(
+                rng.randint(0, 0xffffff)
+            ))
+
+        body = ['<nav class="menu">']
+        for _ in range(self.links_per_page):
+            body.append('<a href="{}" class="link">{}</a>'.format(
+                self.__relative(rng.choice(paths), path),
+                self.__words(rng, 2)
+            ))
+        body.append('</nav>')
+        for number in range(self.images_per_page):
+            body.append('<img src="{}" alt="{}" width="10">'.format(
+                self.__relative(
+                    "static/img{}.png".format(number % 5), path
+                ),
+                self.__words(rng, 2)
+            ))
+        for _ in range(self.paragraphs_per_page):
+            body.append(
+                '<div class="row" style="margin: 0"><p onclick="f()">'
+                '{}<!-- note --><b>{}</b></p></div>'.format(
+                    self.__words(rng, 30), self.__words(rng, 3)
+                )
+            )
+        body.append('<a href="https://example.com">External</a>')
+        for _ in range(self.scripts_per_page):
+            body.append("<script>console.log({});</script>".format(
+                rng.randint(0, 1000)
+            ))
+
+        return (
+            "<!DOCTYPE html>\n<html>\n<head>\n{}\n</head>\n"
+            "<body>\n{}\n</body>\n</html>\n"
+        ).format("\n".join(head), "\n".join(body))
+
+    def generate(self, src_dir):
+        """Writes the site to src_dir, along with the images and the style
+        sheet the pages link to.
+
+        Parameters
+        ----------
+        src_dir : str
+            Source directory to write the site to
+
+        Returns
+        -------
+        list
+            Paths of the generated pages
+        """
+
+        rng = random.Random(self.seed)
+        paths = self.get_page_paths()
+
+        static_dir = os.path.join(src_dir, "static")
+        os.makedirs(static_dir, exist_ok=True)
+        with open(os.path.join(static_dir, "site.css"), 'w') as outfile:
+            outfile.write("body { margin: 0; }\n")
+        for number in range(5):
+            filename = "img{}.png".format(number)
+            with open(os.path.join(static_dir, filename), 'wb') as outfile:
+                outfile.write(PNG_BYTES)
+
+        filepaths = []
+        for path in paths:
+            filepath = os.path.join(src_dir, *path.split("/"))
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, 'w') as outfile:
+                outfile.write(self.generate_page(path, paths, rng))
+            filepaths.append(filepath)
+        return filepaths
@@ -0,0 +1,37 @@
+class StubNodeWrapper:
+    """Stands in for NodeWrapper so the transpiler can be benchmarked
+    without Node installed, every command succeeds without doing anything.
+
+    Attributes
+    ----------
+    versions : dict
+        Versions reported for the node toolchain, always empty
+    calls : list
+        Names of the methods called, with their first argument
+    """
+
+    def __init__(self):
+        self.versions = {}
+        self.calls = []
+
+    def __record(self, name, arg=None):
+        self.calls.append((name, arg))
+
+    def create_react_app(self, project_name, rename_to, working_dir='.'):
+        self.__record("create_react_app", project_name)
+
+    def install(self, package_name, working_dir):
+        self.__record("install", package_name)
+
+    def build(self, working_dir):
+        self.__record("build", working_dir)
+
+    def prettify(self, path, working_dir="."):
+        self.__record("prettify", path)
+
+    def prettify_files(self, paths, working_dir=".", max_args_length=8000):
+        self.__record("prettify_files", len(paths))
+        return True
+
+    def prettier_worker(self, working_dir=".", module_dir=None):
+        return None
@@ -0,0 +1,142 @@
+import threading
+
+
+class BuildWorker:
+    """Runs builds one after the other on a dedicated thread, taking build
+    requests from a queue. Here's an usage example:
+
+    worker = BuildWorker(build)
+    worker.start()
+    worker.submit({"src/index.html": "changed"})
+    worker.stop()
+
+    Requests waiting in the queue are merged into a single build, the last
+    change of a path wins. When a request touches paths the running build
+    is working on, that build is cancelled through its cancel event and its
+    changes are merged back into the queue, so the next build covers both.
+
+    Attributes
+    ----------
+    build : callable
+        Called on the worker thread with the changes to build, a dict of
+        paths mapped to their kind, and a threading.Event set when the build
+        should stop. Returns False if it stopped before completing.
+    builds : int
+        Number of builds run so far, completed or not
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.builds = 0
+
+        self.__pending = {}
+        self.__running = None
+        self.__cancel_event = None
+        self.__stopped = False
+        self.__condition = threading.Condition()
+        self.__thread = None
+
+    def submit(self, changes):
+        """Queues a build of the given changes.
+
+        Parameters
+        ----------
+        changes : dict
+            Paths mapped to their kind, like EventScheduler batches
+        """
+
+        with self.__condition:
+            for path, kind in changes.items():
+                self.__pending.pop(path, None)
+                self.__pending[path] = kind
+
+            # The running build would be out of date before it's done
+            if self.__running is not None and \
+                    any(path in self.__running for path in changes):
+                self.__cancel_event.set()
+            self.__condition.notify_all()
+
+    def __getBuild(self):
+        """Waits for changes to build, called on the worker thread.
+
+        Returns
+        -------
+        dict or None
+            Changes to build, None once stopped
+        """
+
+        with self.__condition:
+            while not self.__pending and not self.__stopped:
+                self.__condition.wait()
+            if not self.__pending:
+                return None
+
+            changes = self.__pending
+            self.__pending = {}
+            self.__running = changes
+            self.__cancel_event = threading.Event()
+            return changes
+
+    def __finishBuild(self, changes, completed):
+        with self.__condition:
+            if not completed:
+                # Newer changes to the same paths win over the cancelled ones
+                requeued = {
+                    path: kind for path, kind in changes.items()
+                    if path not in self.__pending
+                }
+                requeued.update(self.__pending)
+                self.__pending = requeued
+            self.__running = None
+            self.__cancel_event = None
+            self.builds += 1
+            self.__condition.notify_all()
+
+    def __run(self):
+        while True:
+            changes = self.__getBuild()
+            if changes is None:
+                return
+            completed = True
+            try:
+                completed = self.build(changes, self.__cancel_event)
+            except Exception as e:
+                print("Build failed: " + str(e))
+            self.__finishBuild(changes, completed is not False)
+
+    def wait_idle(self, timeout=None):
+        """Waits until the queue is empty and no build is running.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum seconds to wait, defaults to None i.e. no limit
+
+        Returns
+        -------
+        bool
+            True if the worker is idle, False if the timeout expired
+        """
+
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: not self.__pending and self.__running is None,
+                timeout
+            )
+
+    def start(self):
+        """Starts the worker thread."""
+
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Builds the queued changes and stops the worker thread."""
+
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify_all()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
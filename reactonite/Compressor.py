@@ -0,0 +1,174 @@
+import gzip
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class AssetCompressor:
+    """Writes precompressed .gz and .br versions of the compressible files in
+    a directory next to the originals, so static servers can send them
+    without compressing on every request. Here's an usage example:
+
+    compressor = AssetCompressor(gzip_level=9, brotli_level=11)
+    compressor.compress_dir("build")
+
+    Files are compressed on a thread pool, zlib and brotli release the GIL
+    while compressing. Brotli needs the optional brotli package, without it
+    only .gz files are written.
+
+    Attributes
+    ----------
+    COMPRESSIBLE_EXTENSIONS : tuple
+        Extensions of the files worth compressing
+    BROTLI_AVAILABLE : bool
+        Whether the brotli package is installed
+    gzip_level : int or None
+        Gzip compression level from 1 to 9, None disables gzip
+    brotli_level : int or None
+        Brotli quality from 0 to 11, None disables brotli
+    min_size : int
+        Files smaller than this many bytes are not compressed
+    jobs : int or None
+        Number of threads to compress with, None uses a thread per core
+    """
+
+    COMPRESSIBLE_EXTENSIONS = (
+        '.css', '.eot', '.htm', '.html', '.ico', '.js', '.json', '.map',
+        '.mjs', '.otf', '.svg', '.ttf', '.txt', '.wasm', '.webmanifest',
+        '.xml'
+    )
+    BROTLI_AVAILABLE = brotli is not None
+
+    def __init__(self, gzip_level=9, brotli_level=11, min_size=1024,
+                 jobs=None):
+        self.gzip_level = gzip_level
+        self.brotli_level = brotli_level
+        self.min_size = min_size
+        self.jobs = jobs
+
+        if self.gzip_level is not None and \
+                not 1 <= self.gzip_level <= 9:
+            raise RuntimeError("gzip level should be between 1 and 9")
+        if self.brotli_level is not None and \
+                not 0 <= self.brotli_level <= 11:
+            raise RuntimeError("brotli level should be between 0 and 11")
+
+    def get_encoders(self):
+        """Gets the encodings to be written with the configured levels.
+
+        Returns
+        -------
+        list
+            Tuples of file extension and function compressing bytes
+        """
+
+        encoders = []
+        if self.gzip_level is not None:
+            encoders.append(('.gz', self.__gzip))
+        if self.brotli_level is not None and self.BROTLI_AVAILABLE:
+            encoders.append(('.br', self.__brotli))
+        return encoders
+
+    def __gzip(self, data):
+        # Fixed mtime keeps the output the same for the same input
+        buffer = io.BytesIO()
+        with gzip.GzipFile(filename='', mode='wb', fileobj=buffer,
+                           compresslevel=self.gzip_level, mtime=0) as outfile:
+            outfile.write(data)
+        return buffer.getvalue()
+
+    def __brotli(self, data):
+        return brotli.compress(data, quality=self.brotli_level)
+
+    def is_compressible(self, path):
+        """Checks whether a file should be compressed based on its extension
+        and size.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file
+
+        Returns
+        -------
+        bool
+            True if the file should be compressed
+        """
+
+        _, ext = os.path.splitext(path)
+        if ext.lower() not in self.COMPRESSIBLE_EXTENSIONS:
+            return False
+        return os.path.getsize(path) >= self.min_size
+
+    def compress_file(self, path):
+        """Writes the compressed versions of a file. Compressed files which
+        are up to date are kept, and versions which wouldn't be smaller than
+        the original are not written.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file
+
+        Returns
+        -------
+        list
+            Paths of the compressed files written
+        """
+
+        written = []
+        data = None
+        mtime = os.path.getmtime(path)
+        for ext, encode in self.get_encoders():
+            dest = path + ext
+            if os.path.isfile(dest) and os.path.getmtime(dest) >= mtime:
+                continue
+
+            if data is None:
+                with open(path, 'rb') as infile:
+                    data = infile.read()
+            compressed = encode(data)
+            if len(compressed) >= len(data):
+                if os.path.isfile(dest):
+                    os.remove(dest)
+                continue
+
+            tmp_dest = dest + '.tmp'
+            with open(tmp_dest, 'wb') as outfile:
+                outfile.write(compressed)
+            os.replace(tmp_dest, dest)
+            written.append(dest)
+        return written
+
+    def compress_dir(self, directory):
+        """Writes the compressed versions of every compressible file in a
+        directory and its subdirectories.
+
+        Parameters
+        ----------
+        directory : str
+            Directory to compress, like the build folder
+
+        Returns
+        -------
+        list
+            Paths of the compressed files written
+        """
+
+        paths = []
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if self.is_compressible(path):
+                    paths.append(path)
+
+        written = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            for compressed in executor.map(self.compress_file, paths):
+                written.extend(compressed)
+        return written
@@ -14,8 +14,52 @@ class DEFAULTS:
         Destination directory for React codebase.
     CONFIG_FILE_NAME : str
         Config file name for config variables.
+    MANIFEST_FILE_NAME : str
+        File name of the incremental build manifest in the project dir.
     PROPS_MAP : dict
         Mapping for HTML to React props
+    STATIC_SYNC_MODE : str
+        How static files are synced to dest_dir, "copy", "hardlink" or
+        "reflink", can be overridden by static_sync_mode in config.json.
+    STATIC_SYNC_CHECK : str
+        How existing static files are compared, "mtime" or "hash", can be
+        overridden by static_sync_check in config.json.
+    CODE_SPLITTING : bool
+        Whether pages are loaded lazily with React.lazy in index.js, can be
+        overridden by code_splitting in config.json.
+    EAGER_ROUTES : list
+        Routes imported eagerly even with code splitting, can be overridden
+        by eager_routes in config.json.
+    PREFETCH_LINKS : bool
+        Whether router links prefetch the chunk of their page when hovered
+        or scrolled into view, can be overridden by prefetch_links in
+        config.json.
+    PREFETCH_MODULE_NAME : str
+        Name of the generated module providing prefetching links in the
+        React src directory.
+    GZIP_LEVEL : int
+        Compression level of the .gz files written after a build, can be
+        overridden by gzip_level in config.json, null disables them.
+    BROTLI_LEVEL : int
+        Quality of the .br files written after a build, can be overridden
+        by brotli_level in config.json, null disables them.
+    COMPRESS_MIN_SIZE : int
+        Built files smaller than this many bytes aren't compressed, can be
+        overridden by compress_min_size in config.json.
+    WATCH_QUIET_PERIOD : float
+        Seconds without file system events after which the watcher
+        rebuilds, can be overridden by watch_quiet_period in config.json.
+    WATCH_MAX_DELAY : float
+        Maximum seconds the watcher waits for events to quiet down before
+        rebuilding, can be overridden by watch_max_delay in config.json.
+    IGNORE_FILE_NAME : str
+        File in the project dir listing files to leave out of the project,
+        in the gitignore syntax.
+    IGNORE_PATTERNS : list
+        Patterns always ignored before the ones of the ignore file: version
+        control directories, OS metadata, editor swap, backup and temporary
+        files. Other hidden files, like .well-known/ or .htaccess, are part
+        of the project.
     """
 
     def __init__(self):
@@ -23,4 +67,22 @@ class DEFAULTS:
         self.SRC_DIR = 'src'
         self.DEST_DIR = 'dist'
         self.CONFIG_FILE_NAME = 'config.json'
+        self.MANIFEST_FILE_NAME = '.reactonite-manifest.json'
         self.PROPS_MAP = props_map
+        self.STATIC_SYNC_MODE = 'copy'
+        self.STATIC_SYNC_CHECK = 'mtime'
+        self.CODE_SPLITTING = False
+        self.EAGER_ROUTES = []
+        self.PREFETCH_LINKS = False
+        self.PREFETCH_MODULE_NAME = 'ReactonitePrefetch'
+        self.GZIP_LEVEL = 9
+        self.BROTLI_LEVEL = 11
+        self.COMPRESS_MIN_SIZE = 1024
+        self.WATCH_QUIET_PERIOD = 0.2
+        self.WATCH_MAX_DELAY = 2.0
+        self.IGNORE_FILE_NAME = '.reactoniteignore'
+        self.IGNORE_PATTERNS = [
+            '.git/', '.hg/', '.svn/', '.DS_Store', 'Thumbs.db', '.*.sw?',
+            '*.swp', '*.swo', '*.swx', '*~', '.#*', '#*#', '*.tmp', '*.bak',
+            '4913'
+        ]
@@ -0,0 +1,188 @@
+import threading
+import time
+
+
+class EventScheduler:
+    """Collects file system events and hands them over in batches, once no
+    new event arrived for a quiet period. Bursts of events, like the ones
+    caused by editors saving or git checkouts, end up in a single build.
+    Here's an usage example:
+
+    scheduler = EventScheduler(build, quiet_period=0.2)
+    scheduler.start()
+    scheduler.changed("src/index.html")
+    scheduler.moved("src/a.html", "src/b.html")
+    scheduler.stop()
+
+    Events for the same path are collapsed, only the last one counts: a
+    file created and then modified is changed, a file modified and then
+    deleted is deleted. A move is the deletion of the old path and a change
+    of the new one.
+
+    Attributes
+    ----------
+    CHANGED : str
+        Kind of the paths created or modified
+    DELETED : str
+        Kind of the paths deleted
+    callback : callable
+        Called on the scheduler thread with a dict of the paths changed
+        since the last batch mapped to their kind, ordered by their last
+        event
+    quiet_period : float
+        Seconds without events after which a batch is handed over
+    max_delay : float
+        Maximum seconds a batch waits for the events to quiet down, so a
+        steady stream of events doesn't hold builds back forever
+    """
+
+    CHANGED = "changed"
+    DELETED = "deleted"
+
+    def __init__(self, callback, quiet_period=0.2, max_delay=2.0):
+        self.callback = callback
+        self.quiet_period = quiet_period
+        self.max_delay = max_delay
+
+        self.__pending = {}
+        self.__first_event = None
+        self.__last_event = None
+        self.__stopped = False
+        self.__condition = threading.Condition()
+        self.__thread = None
+
+    def changed(self, path):
+        """Records the creation or modification of a path.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file or directory
+        """
+
+        self.add(path, self.CHANGED)
+
+    def deleted(self, path):
+        """Records the deletion of a path.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file or directory
+        """
+
+        self.add(path, self.DELETED)
+
+    def moved(self, src_path, dest_path):
+        """Records a path being moved.
+
+        Parameters
+        ----------
+        src_path : str
+            Old path of the file or directory
+        dest_path : str
+            New path of the file or directory
+        """
+
+        with self.__condition:
+            self.__add(src_path, self.DELETED)
+            self.__add(dest_path, self.CHANGED)
+            self.__condition.notify()
+
+    def add(self, path, kind):
+        """Records an event, the batch is handed over once events quiet
+        down.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file or directory
+        kind : str
+            CHANGED or DELETED
+        """
+
+        with self.__condition:
+            self.__add(path, kind)
+            self.__condition.notify()
+
+    def __add(self, path, kind):
+        now = time.monotonic()
+        if not self.__pending:
+            self.__first_event = now
+        self.__last_event = now
+        # The last event for a path wins and moves it to the end
+        self.__pending.pop(path, None)
+        self.__pending[path] = kind
+
+    def __getBatch(self):
+        """Waits for a batch of events, called on the scheduler thread.
+
+        Returns
+        -------
+        dict or None
+            Paths mapped to their kind, None once stopped
+        """
+
+        with self.__condition:
+            while True:
+                if self.__pending:
+                    now = time.monotonic()
+                    wait = min(
+                        self.__last_event + self.quiet_period,
+                        self.__first_event + self.max_delay
+                    ) - now
+                    if wait <= 0 or self.__stopped:
+                        return self.__popPending()
+                    self.__condition.wait(wait)
+                elif self.__stopped:
+                    return None
+                else:
+                    self.__condition.wait()
+
+    def __popPending(self):
+        batch = self.__pending
+        self.__pending = {}
+        self.__first_event = self.__last_event = None
+        return batch
+
+    def __run(self):
+        while True:
+            batch = self.__getBatch()
+            if batch is None:
+                return
+            try:
+                self.callback(batch)
+            except Exception as e:
+                print("Build failed: " + str(e))
+
+    def flush(self):
+        """Hands the pending events over right away, on the calling thread.
+
+        Returns
+        -------
+        dict
+            Paths handed over mapped to their kind
+        """
+
+        with self.__condition:
+            batch = self.__popPending()
+        if batch:
+            self.callback(batch)
+        return batch
+
+    def start(self):
+        """Starts the scheduler thread."""
+
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Hands over the pending events and stops the scheduler thread."""
+
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
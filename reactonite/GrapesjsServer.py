@@ -0,0 +1,43 @@
+from flask import Flask, request, make_response, jsonify
+from flask_cors import CORS
+
+from .Constants import DEFAULTS
+from .CreateHtmlCss import saveCss, saveHtml
+
+
+def create_app():
+    """Creates the Flask app receiving the pages saved in the GrapesJS
+    editor, used by the gui command. Here's an usage example:
+
+    app = create_app()
+    app.run('localhost', 5000)
+
+    Returns
+    -------
+    Flask
+        App saving the HTML and CSS posted to /grapesjs into src_dir
+    """
+
+    app = Flask(__name__)
+    CORS(app)
+
+    @app.route('/grapesjs', methods=['POST'])
+    def fetchCodeFromGrapesjs():
+        if request.method == 'POST':
+            try:
+                CONSTANTS = DEFAULTS()
+
+                src_dir = CONSTANTS.SRC_DIR
+
+                saveCss(request.form['css'], src_dir)
+                saveHtml(request.form['html'], src_dir)
+
+                data = {'Status': 'Data Received Successfully'}
+                return make_response(jsonify(data), 200)
+            except Exception as e:
+                print('Error in handling POST Request - ', e)
+                data = {'Status': 'Error in Handling POST Request',
+                        'Error': str(e)}
+                return make_response(jsonify(data), 550)
+
+    return app
@@ -1,5 +1,15 @@
+import hashlib
 import json
 import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# ioctl request to clone a file's extents on Linux (btrfs, xfs etc.)
+FICLONE = 0x40049409
 
 
 def get_parent_dir(path):
@@ -97,3 +107,139 @@ def write_to_json_file(path, content):
             json.dump(content, outfile, indent=4, sort_keys=True)
     else:
         raise RuntimeError('Not enough permissions to write at ' + str(path))
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """Generates the sha1 hash of a file's content, reading it in chunks.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file to be hashed.
+    chunk_size : int, optional
+        Number of bytes read at a time, defaults to 1 MiB.
+
+    Returns
+    -------
+    str
+        Hex digest of the file content
+    """
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as infile:
+        for chunk in iter(lambda: infile.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def files_match(src, dest, check="mtime"):
+    """Checks whether dest already has the same content as src.
+
+    Parameters
+    ----------
+    src : str
+        Path to the source file.
+    dest : str
+        Path to the destination file.
+    check : str, optional
+        "mtime" compares size and modification time, "hash" compares size
+        and content hash, defaults to "mtime".
+
+    Returns
+    -------
+    bool
+        True if dest exists and matches src
+
+    Raises
+    ------
+    RuntimeError
+        Raised if check is not a known method.
+    """
+
+    if check not in ("mtime", "hash"):
+        raise RuntimeError("Unknown file check " + str(check))
+
+    try:
+        src_stat = os.stat(src)
+        dest_stat = os.stat(dest)
+    except FileNotFoundError:
+        return False
+
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if check == "mtime":
+        return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+    return hash_file(src) == hash_file(dest)
+
+
+def _reflink_file(src, dest):
+    """Clones src to dest sharing the same data blocks, only possible on
+    filesystems supporting reflinks.
+
+    Raises
+    ------
+    OSError
+        Raised if the platform or filesystem doesn't support reflinks.
+    """
+
+    if fcntl is None:
+        raise OSError("reflinks are not supported on this platform")
+
+    with open(src, 'rb') as infile, open(dest, 'wb') as outfile:
+        fcntl.ioctl(outfile.fileno(), FICLONE, infile.fileno())
+    shutil.copystat(src, dest)
+
+
+def sync_file(src, dest, mode="copy", check="mtime"):
+    """Makes dest a copy of src, skipping the copy if dest already matches.
+    Falls back to a regular copy if a hardlink or reflink can't be created,
+    for example across devices.
+
+    Parameters
+    ----------
+    src : str
+        Path to the source file.
+    dest : str
+        Path to the destination file.
+    mode : str, optional
+        "copy", "hardlink" or "reflink", defaults to "copy".
+    check : str, optional
+        How an existing dest is compared, "mtime" or "hash", defaults to
+        "mtime".
+
+    Returns
+    -------
+    bool
+        True if dest was written, False if it was already up to date
+
+    Raises
+    ------
+    RuntimeError
+        Raised if mode or check is not a known method.
+    """
+
+    if mode not in ("copy", "hardlink", "reflink"):
+        raise RuntimeError("Unknown file sync mode " + str(mode))
+
+    if mode == "hardlink" and os.path.exists(dest):
+        if os.path.samefile(src, dest):
+            return False
+    elif files_match(src, dest, check=check):
+        return False
+
+    if os.path.lexists(dest):
+        os.remove(dest)
+
+    try:
+        if mode == "hardlink":
+            os.link(src, dest)
+            return True
+        if mode == "reflink":
+            _reflink_file(src, dest)
+            return True
+    except OSError:
+        if os.path.lexists(dest):
+            os.remove(dest)
+
+    shutil.copy2(src, dest)
+    return True
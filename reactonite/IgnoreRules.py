@@ -0,0 +1,226 @@
+import os
+import re
+
+
+class IgnoreRules:
+    """Files left out of a Reactonite project, written in the gitignore
+    syntax and compiled once into a single regular expression. Here's an
+    usage example:
+
+    rules = IgnoreRules.load(".", ["*~", ".*"])
+    rules.is_ignored("src/.DS_Store")
+    list(rules.walk("src"))
+
+    Paths are matched relative to base_dir. As in gitignore, patterns with
+    a slash at the beginning or in the middle are anchored to base_dir,
+    other patterns match at any depth. A trailing slash only matches
+    directories, "!" includes a path again and the last matching pattern
+    wins. Everything inside an ignored directory is ignored.
+
+    Attributes
+    ----------
+    base_dir : str
+        Directory the patterns are relative to
+    patterns : list
+        Patterns in the order they were given
+    """
+
+    def __init__(self, base_dir, patterns):
+        self.base_dir = base_dir
+        self.patterns = []
+
+        regexes = []
+        self.__negated = []
+        for pattern in patterns:
+            compiled = self.__compile(pattern)
+            if compiled is None:
+                continue
+            self.patterns.append(pattern)
+            regexes.append(compiled[0])
+            self.__negated.append(compiled[1])
+
+        # Reversed so the first alternative matching is the last pattern
+        self.__negated.reverse()
+        self.__has_negations = any(self.__negated)
+        if regexes:
+            self.__regex = re.compile('|'.join(
+                '(' + regex + ')' for regex in reversed(regexes)
+            ))
+        else:
+            self.__regex = None
+
+    @classmethod
+    def load(cls, base_dir, default_patterns=(), filename=None):
+        """Reads the patterns of an ignore file, if it exists, after the
+        default ones.
+
+        Parameters
+        ----------
+        base_dir : str
+            Directory containing the ignore file
+        default_patterns : iterable, optional
+            Patterns applied before the ones in the file, defaults to none
+        filename : str, optional
+            Name of the ignore file, defaults to None i.e. only the default
+            patterns are used
+
+        Returns
+        -------
+        IgnoreRules
+            Compiled rules
+        """
+
+        patterns = list(default_patterns)
+        if filename is not None:
+            path = os.path.join(base_dir, filename)
+            if os.path.isfile(path):
+                with open(path, 'r') as infile:
+                    patterns.extend(infile.read().splitlines())
+        return cls(base_dir, patterns)
+
+    @staticmethod
+    def __translate(part):
+        """Translates a glob for a single path component into a regex."""
+
+        regex = ''
+        i = 0
+        while i < len(part):
+            char = part[i]
+            i += 1
+            if char == '*':
+                regex += '[^/]*'
+            elif char == '?':
+                regex += '[^/]'
+            elif char == '\\' and i < len(part):
+                regex += re.escape(part[i])
+                i += 1
+            elif char == '[':
+                end = part.find(']', i + 1 if part[i:i + 1] in '!^' else i)
+                if end == -1:
+                    regex += re.escape(char)
+                    continue
+                chars = part[i:end]
+                if chars[:1] in ('!', '^'):
+                    chars = '^' + chars[1:]
+                regex += '[' + chars.replace('\\', '\\\\') + ']'
+                i = end + 1
+            else:
+                regex += re.escape(char)
+        return regex
+
+    def __compile(self, pattern):
+        """Compiles a gitignore pattern.
+
+        Parameters
+        ----------
+        pattern : str
+            Line of the ignore file
+
+        Returns
+        -------
+        tuple or None
+            Regex matching the path, with a trailing slash for directories,
+            and whether the pattern is negated. None for blank lines and
+            comments.
+        """
+
+        # Trailing spaces are dropped unless escaped
+        pattern = re.sub(r'(?<!\\) +$', '', pattern)
+        if not pattern or pattern.startswith('#'):
+            return None
+
+        negated = pattern.startswith('!')
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\!') or pattern.startswith('\\#'):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        if not pattern:
+            return None
+
+        anchored = '/' in pattern
+        parts = pattern.lstrip('/').split('/')
+
+        regex = '' if anchored else '(?:.*/)?'
+        for i, part in enumerate(parts):
+            last = i == len(parts) - 1
+            if part == '**':
+                regex += '.*' if last else '(?:.*/)?'
+            else:
+                regex += self.__translate(part) + ('' if last else '/')
+        regex += '/' if dir_only else '/?'
+        return regex + '$', negated
+
+    def __match(self, path):
+        if self.__regex is None:
+            return False
+        match = self.__regex.match(path)
+        if match is None:
+            return False
+        if not self.__has_negations:
+            return True
+        return not self.__negated[match.lastindex - 1]
+
+    def is_ignored(self, path, is_dir=None):
+        """Checks whether a path is ignored, either by itself or because a
+        directory containing it is.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file or directory
+        is_dir : bool, optional
+            Whether path is a directory, defaults to None i.e. checked on
+            the file system
+
+        Returns
+        -------
+        bool
+            True if the path should be left out
+        """
+
+        relpath = os.path.relpath(path, self.base_dir)
+        if relpath.startswith(os.pardir):
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+
+        parts = relpath.split(os.path.sep)
+        for i in range(1, len(parts)):
+            if self.__match('/'.join(parts[:i]) + '/'):
+                return True
+        return self.__match('/'.join(parts) + ('/' if is_dir else ''))
+
+    def walk(self, top):
+        """Walks a directory like os.walk, without descending into ignored
+        directories.
+
+        Parameters
+        ----------
+        top : str
+            Directory to walk
+
+        Yields
+        ------
+        str
+            Paths of the files which are not ignored
+        """
+
+        if self.is_ignored(top, is_dir=True):
+            return
+        for dirpath, dirnames, filenames in os.walk(top, followlinks=True):
+            relpath = os.path.relpath(dirpath, self.base_dir)
+            if relpath == os.curdir:
+                prefix = ''
+            else:
+                prefix = '/'.join(relpath.split(os.path.sep)) + '/'
+            # Pruned in place so os.walk skips them
+            dirnames[:] = [
+                dirname for dirname in dirnames
+                if not self.__match(prefix + dirname + '/')
+            ]
+            for filename in filenames:
+                if not self.__match(prefix + filename):
+                    yield os.path.join(dirpath, filename)
@@ -0,0 +1,133 @@
+import io
+import re
+
+from bs4.dammit import EntitySubstitution
+from bs4.element import NavigableString, PreformattedString
+
+
+class JSXEmitter:
+    """Serializes a BeautifulSoup tree straight to JSX into a single buffer.
+
+    Attribute values listed in expressions are written as JSX expressions
+    instead of strings, and style tag bodies are written as template
+    literals. Here's an usage example:
+
+    emitter = JSXEmitter(expressions=["{logo_png}"])
+    emitter.write("return (<>")
+    emitter.write_node(soup.body)
+    emitter.write("</>);")
+    jsx = emitter.getvalue()
+
+    Attributes
+    ----------
+    TEMPLATE_LITERAL_TAGS : tuple
+        Tags whose contents are written as a template literal
+    expressions : set
+        Attribute values to be written as JSX expressions, like "{var}"
+    """
+
+    TEMPLATE_LITERAL_TAGS = ('style',)
+
+    __JSX_BRACES = re.compile(r'[{}]')
+    __TEMPLATE_LITERAL_SPECIAL = re.compile(r'\\|`|\$\{')
+
+    def __init__(self, expressions=None):
+        self.expressions = set(expressions or [])
+        self.__buffer = io.StringIO()
+
+    def write(self, code):
+        """Writes code to the buffer as it is.
+
+        Parameters
+        ----------
+        code : str
+            Code to be written
+        """
+
+        self.__buffer.write(code)
+
+    def write_node(self, node, strip=False):
+        """Writes a tag with all of its descendants, or a string, as JSX.
+
+        Parameters
+        ----------
+        node : bs4.element.PageElement
+            Tag or string to be written
+        strip : bool, optional
+            Strips surrounding whitespace if node is a string, defaults to
+            False
+        """
+
+        if isinstance(node, NavigableString):
+            self.__writeString(node, strip=strip)
+            return
+
+        # Iterative walk so deeply nested pages don't hit the recursion limit
+        stack = [(node, False)]
+        while stack:
+            element, closing = stack.pop()
+
+            if closing:
+                self.__buffer.write('</' + element.name + '>')
+            elif isinstance(element, NavigableString):
+                self.__writeString(element)
+            elif element.is_empty_element:
+                self.__writeStartTag(element, self_closing=True)
+            elif element.name in self.TEMPLATE_LITERAL_TAGS:
+                self.__writeStartTag(element)
+                self.__writeTemplateLiteral(element)
+                self.__buffer.write('</' + element.name + '>')
+            else:
+                self.__writeStartTag(element)
+                stack.append((element, True))
+                for child in reversed(element.contents):
+                    stack.append((child, False))
+
+    def getvalue(self):
+        """Returns everything written so far.
+
+        Returns
+        -------
+        str
+            Generated code
+        """
+
+        return self.__buffer.getvalue()
+
+    def __writeStartTag(self, tag, self_closing=False):
+        self.__buffer.write('<' + tag.name)
+        for key, value in sorted(tag.attrs.items()):
+            if isinstance(value, list):
+                value = " ".join(value)
+            self.__buffer.write(' ' + key + '=')
+            if value in self.expressions:
+                self.__buffer.write(value)
+            else:
+                self.__buffer.write(
+                    EntitySubstitution.quoted_attribute_value(
+                        EntitySubstitution.substitute_xml(value)
+                    )
+                )
+        self.__buffer.write('/>' if self_closing else '>')
+
+    def __writeString(self, string, strip=False):
+        # Comments, doctypes, CDATA etc. have no JSX representation
+        if isinstance(string, PreformattedString):
+            return
+
+        text = str(string)
+        if strip:
+            text = text.strip()
+        text = EntitySubstitution.substitute_xml(text)
+        self.__buffer.write(self.__JSX_BRACES.sub(
+            lambda match: "{'" + match.group(0) + "'}", text
+        ))
+
+    def __writeTemplateLiteral(self, tag):
+        text = "".join(str(child) for child in tag.contents
+                       if not isinstance(child, PreformattedString))
+        self.__buffer.write('{`')
+        self.__buffer.write(self.__TEMPLATE_LITERAL_SPECIAL.sub(
+            lambda match: '\\' + match.group(0), text
+        ))
+        self.__buffer.write('`}')
@@ -0,0 +1,177 @@
+import json
+import os
+
+from .Helpers import hash_file
+
+
+class BuildManifest:
+    """Keeps track of the source files transpiled in previous runs, so files
+    whose content didn't change can be skipped.
+
+    Every entry maps a source file to its size, modification time, content
+    hash, the outputs it produced and the paths it probed while resolving
+    links. The whole manifest is discarded if the fingerprint (props map,
+    Reactonite version, parser etc.) or the manifest format changes.
+
+    Attributes
+    ----------
+    FORMAT_VERSION : int
+        Version of the manifest file format
+    path : str
+        Path of the manifest file
+    fingerprint : dict
+        Settings the transpiled output depends on
+    entries : dict
+        Stored state for each source file
+    generated : dict
+        Hashes of the output files formatted after being written, like
+        index.js, before and after formatting, kept up to date by the
+        OutputWriter of the build
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries = {}
+        self.generated = {}
+
+        self.load()
+
+    def load(self):
+        """Loads the manifest from path, if it exists and was created with
+        the same fingerprint.
+        """
+
+        self.entries = {}
+        self.generated = {}
+        if not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path) as infile:
+                manifest = json.load(infile)
+        except (OSError, ValueError):
+            return
+
+        if manifest.get("version") == self.FORMAT_VERSION and \
+                manifest.get("fingerprint") == self.fingerprint:
+            self.entries = manifest.get("files", {})
+            self.generated = manifest.get("generated", {})
+
+    def save(self):
+        """Saves the manifest to path, dropping entries for source files
+        and outputs which don't exist anymore.
+        """
+
+        for filepath in list(self.entries):
+            if not os.path.isfile(filepath):
+                del self.entries[filepath]
+        for path in list(self.generated):
+            if not os.path.isfile(path):
+                del self.generated[path]
+
+        with open(self.path, 'w') as outfile:
+            json.dump({
+                "version": self.FORMAT_VERSION,
+                "fingerprint": self.fingerprint,
+                "files": self.entries,
+                "generated": self.generated
+            }, outfile, sort_keys=True)
+
+    def get_file_state(self, filepath):
+        """Gets the current state of a source file. The content is only
+        hashed if size or modification time differ from the stored entry.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source file
+
+        Returns
+        -------
+        dict
+            Size, modification time and content hash of the file
+        """
+
+        stat = os.stat(filepath)
+        entry = self.entries.get(filepath)
+
+        if entry is not None and entry["size"] == stat.st_size and \
+                entry["mtime"] == stat.st_mtime_ns:
+            file_hash = entry["hash"]
+        else:
+            file_hash = hash_file(filepath)
+
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": file_hash
+        }
+
+    def is_unchanged(self, filepath, state, isfile=os.path.isfile):
+        """Checks whether a source file is unchanged since it was recorded,
+        all of its outputs still exist and every path it probed still
+        exists, or is still missing, as before.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source file
+        state : dict
+            Current state of the file from get_file_state
+        isfile : callable, optional
+            Function used to check whether probed paths exist, defaults to
+            os.path.isfile
+
+        Returns
+        -------
+        bool
+            True if the file can be skipped
+        """
+
+        entry = self.entries.get(filepath)
+        if entry is None or entry["hash"] != state["hash"]:
+            return False
+
+        if not all(os.path.isfile(output) for output in entry["outputs"]):
+            return False
+
+        return all(
+            isfile(path) == existed
+            for path, existed in entry["probes"].items()
+        )
+
+    def record(self, filepath, state, outputs, probes=None):
+        """Records the state of a source file along with the outputs it
+        produced and the paths it probed.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source file
+        state : dict
+            State of the file from get_file_state
+        outputs : list
+            Paths of the files generated from the source file
+        probes : dict, optional
+            Paths probed while resolving links mapped to whether they
+            existed, defaults to None i.e. no probes
+        """
+
+        entry = dict(state)
+        entry["outputs"] = list(outputs)
+        entry["probes"] = dict(probes or {})
+        self.entries[filepath] = entry
+
+    def remove(self, filepath):
+        """Forgets a deleted source file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source file
+        """
+
+        self.entries.pop(filepath, None)
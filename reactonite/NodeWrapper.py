@@ -1,5 +1,219 @@
+import json
 import os
+import queue
+import shutil
 import subprocess
+import threading
+
+# Versions of the node toolchain detected so far, keyed by PATH and the
+# location and modification time of the binaries.
+_TOOLCHAIN_CACHE = {}
+
+
+class PrettierWorker:
+    """Long-lived prettier process which formats code sent over stdin, used
+    to avoid spawning a new npx process for every file in watch mode. The
+    process is started on first use and restarted if it crashes. If it
+    can't be started the worker is disabled, so callers fall back to npx
+    right away instead of waiting for it to start again for every file.
+
+    Attributes
+    ----------
+    command : list
+        Commandline used to start the worker process
+    working_dir : str
+        Directory from which the worker is started
+    timeout : int, optional
+        Seconds to wait for a formatted response, defaults to 30
+    startup_timeout : int, optional
+        Seconds to wait for the worker to start, npx may need to download
+        prettier first, defaults to 120
+    version : str
+        Version of prettier loaded by the worker, None until started
+    disabled : bool
+        True once the worker failed to start, format raises without trying
+        to start it again
+    """
+
+    def __init__(self,
+                 command,
+                 working_dir=".",
+                 timeout=30,
+                 startup_timeout=120):
+        self.command = command
+        self.working_dir = working_dir
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.version = None
+        self.disabled = False
+
+        self.__process = None
+        self.__responses = None
+        self.__request_id = 0
+        self.__lock = threading.Lock()
+
+    def is_alive(self):
+        """Checks whether the worker process is running.
+
+        Returns
+        -------
+        bool
+            True if the worker process is running
+        """
+
+        return self.__process is not None and self.__process.poll() is None
+
+    def start(self):
+        """Starts the worker process and waits for it to load prettier.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the worker can't be started or prettier isn't found,
+            the worker gets disabled.
+        """
+
+        self.disabled = True
+        try:
+            process = subprocess.Popen(self.command,
+                                       shell=False,
+                                       cwd=self.working_dir,
+                                       stdin=subprocess.PIPE,
+                                       stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL,
+                                       encoding="utf-8")
+        except OSError as e:
+            raise RuntimeError("Unable to start prettier worker: " + str(e))
+
+        responses = queue.Queue()
+        reader = threading.Thread(target=self.__readResponses,
+                                  args=(process, responses))
+        reader.daemon = True
+        reader.start()
+
+        self.__process = process
+        self.__responses = responses
+
+        message = self.__getResponse(self.startup_timeout)
+        if message is None or "ready" not in message:
+            self.stop()
+            error = "no response"
+            if message is not None:
+                error = message.get("error", error)
+            raise RuntimeError("Prettier worker failed to start: " + error)
+
+        self.version = message.get("version")
+        self.disabled = False
+
+    def stop(self):
+        """Stops the worker process if it is running.
+        """
+
+        process = self.__process
+        self.__process = None
+        if process is None:
+            return
+
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def format(self, source, filepath):
+        """Formats the given source code with prettier, (re)starting the
+        worker process if needed.
+
+        Parameters
+        ----------
+        source : str
+            Code to be formatted
+        filepath : str
+            Path the code will be written to, used by prettier to pick the
+            parser and config
+
+        Returns
+        -------
+        str
+            Formatted code
+
+        Raises
+        ------
+        RuntimeError
+            Raised if prettier fails to format the code, the worker keeps
+            crashing or is disabled.
+        """
+
+        with self.__lock:
+            if self.disabled:
+                raise RuntimeError("Prettier worker is disabled")
+            for _ in range(2):
+                if not self.is_alive():
+                    self.start()
+                message = self.__request(source, filepath)
+                if message is not None:
+                    break
+            else:
+                raise RuntimeError("Prettier worker stopped responding")
+
+        if "error" in message:
+            raise RuntimeError(
+                "Prettier failed on " + str(filepath) + ": " +
+                message["error"]
+            )
+        return message["formatted"]
+
+    def __request(self, source, filepath):
+        """Sends a single request to the worker and waits for its response.
+
+        Returns
+        -------
+        dict or None
+            Response of the worker, None if the worker crashed or timed out
+        """
+
+        self.__request_id += 1
+        request = {
+            "id": self.__request_id,
+            "filepath": os.path.abspath(filepath),
+            "source": source
+        }
+
+        try:
+            self.__process.stdin.write(json.dumps(request) + "\n")
+            self.__process.stdin.flush()
+        except OSError:
+            self.stop()
+            return None
+
+        while True:
+            message = self.__getResponse(self.timeout)
+            if message is None:
+                self.stop()
+                return None
+            if message.get("id") == self.__request_id:
+                return message
+
+    def __getResponse(self, timeout):
+        try:
+            return self.__responses.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    @staticmethod
+    def __readResponses(process, responses):
+        for line in process.stdout:
+            try:
+                responses.put(json.loads(line))
+            except ValueError:
+                # npx may print its own messages on stdout
+                continue
+        responses.put(None)
 
 
 class NodeWrapper:
@@ -13,6 +227,8 @@ class NodeWrapper:
         Commandline to be used for npm according to system(Linux, Windows)
     node : str
         Commandline to be used for node according to system(Linux, Windows)
+    versions : dict
+        Versions reported by npx, npm and node
     """
 
     def __init__(self):
@@ -26,11 +242,16 @@ class NodeWrapper:
             self.npm = "npm"
             self.node = "node"
 
+        self.versions = {}
+
         self.check_react_install()
 
     def check_react_install(self):
-        """Checks the installation of Nodejs/npm/npx. If npm is not
-        available it throws an error.
+        """Checks the installation of Nodejs/npm/npx and records their
+        versions. If npm is not available it throws an error.
+
+        The version checks are run only once per process for a given PATH,
+        later calls reuse the result as long as the binaries are unchanged.
 
         Raises
         ------
@@ -38,32 +259,38 @@ class NodeWrapper:
             Raised if Nodejs/npm/npx is not available.
         """
 
-        try:
-            subprocess.run([self.npx, "--version"],
-                           shell=False,
-                           cwd='.',
-                           stdout=subprocess.DEVNULL)
-        except Exception:
-            raise RuntimeError("npx not found. Please install/reinstall node")
-
-        try:
-            subprocess.run([self.npm, "--version"],
-                           shell=False,
-                           cwd='.',
-                           stdout=subprocess.DEVNULL)
-        except Exception:
-            raise RuntimeError("npm not found. Please install/reinstall node")
-
-        try:
-            subprocess.run([self.node, "--version"],
-                           shell=False,
-                           cwd='.',
-                           stdout=subprocess.DEVNULL)
-        except Exception:
-            raise RuntimeError("nodejs not found. Please install/reinstall \
-                node")
-
-        # TODO: Log these version numbers
+        toolchain = [
+            ("npx", self.npx,
+             "npx not found. Please install/reinstall node"),
+            ("npm", self.npm,
+             "npm not found. Please install/reinstall node"),
+            ("node", self.node,
+             "nodejs not found. Please install/reinstall node"),
+        ]
+
+        cache_key = [os.environ.get("PATH", "")]
+        for _, binary, error in toolchain:
+            binary_path = shutil.which(binary)
+            if binary_path is None:
+                raise RuntimeError(error)
+            cache_key.append((binary_path, os.stat(binary_path).st_mtime))
+        cache_key = tuple(cache_key)
+
+        if cache_key not in _TOOLCHAIN_CACHE:
+            versions = {}
+            for name, binary, error in toolchain:
+                try:
+                    result = subprocess.run([binary, "--version"],
+                                            shell=False,
+                                            cwd='.',
+                                            stdout=subprocess.PIPE,
+                                            universal_newlines=True)
+                except Exception:
+                    raise RuntimeError(error)
+                versions[name] = result.stdout.strip()
+            _TOOLCHAIN_CACHE[cache_key] = versions
+
+        self.versions = dict(_TOOLCHAIN_CACHE[cache_key])
 
     def install_grapesjs(self, project_dir):
 
@@ -154,6 +381,39 @@ class NodeWrapper:
                        shell=False,
                        cwd=working_dir)
 
+    def prerender(self, routes, working_dir, build_dir="build"):
+        """Prerenders the pages of a built app to static HTML, written to
+        build_dir/<route>/index.html for the client to hydrate.
+
+        Parameters
+        ----------
+        routes : list
+            Dicts with the path of every route and the module of its page
+            relative to the React src directory
+        working_dir : str
+            Directory containing npm project root
+        build_dir : str, optional
+            Build folder within working_dir, defaults to "build"
+
+        Raises
+        ------
+        RuntimeError
+            Raised if any of the pages couldn't be prerendered
+        """
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "prerender.js")
+        request = json.dumps({"build_dir": build_dir, "routes": routes})
+        result = subprocess.run([self.node, script],
+                                input=request,
+                                universal_newlines=True,
+                                shell=False,
+                                cwd=working_dir)
+        if result.returncode != 0:
+            raise RuntimeError(
+                "Prerendering failed, see the errors above for details."
+            )
+
     def prettify(self, path, working_dir="."):
         """Runs code formatting using prettier on the given path
 
@@ -168,3 +428,73 @@ class NodeWrapper:
         subprocess.run([self.npx, "prettier", "--write", path],
                        shell=False,
                        cwd=working_dir)
+
+    def prettify_files(self, paths, working_dir=".", max_args_length=8000):
+        """Runs code formatting using prettier on all the given paths, using
+        as few prettier processes as possible. Paths are split into chunks so
+        that the commandline stays below max_args_length characters.
+
+        Parameters
+        ----------
+        paths : list
+            Filepaths to run prettier on
+        working_dir : str
+            Directory from which command is run
+        max_args_length : int, optional
+            Maximum length of the paths passed to a single prettier call,
+            defaults to 8000 which is safe on Windows as well
+
+        Returns
+        -------
+        bool
+            True if every prettier call succeeded
+        """
+
+        chunks = []
+        chunk = []
+        chunk_length = 0
+        for path in paths:
+            if chunk and chunk_length + len(path) + 1 > max_args_length:
+                chunks.append(chunk)
+                chunk = []
+                chunk_length = 0
+            chunk.append(path)
+            chunk_length += len(path) + 1
+        if chunk:
+            chunks.append(chunk)
+
+        success = True
+        for chunk in chunks:
+            result = subprocess.run([self.npx, "prettier", "--write"] + chunk,
+                                    shell=False,
+                                    cwd=working_dir)
+            if result.returncode != 0:
+                success = False
+        return success
+
+    def prettier_worker(self, working_dir=".", module_dir=None):
+        """Creates a long-lived prettier worker which is reused for every
+        file formatted through it. The worker process is started on first
+        use.
+
+        Parameters
+        ----------
+        working_dir : str
+            Directory from which the worker is run
+        module_dir : str, optional
+            Additional directory to look for a local prettier install, like
+            the React project directory
+
+        Returns
+        -------
+        PrettierWorker
+            Worker to format code with
+        """
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "prettier_worker.js")
+        command = [self.npx, "-p", "prettier", self.node, script]
+        if module_dir is not None:
+            command.append(os.path.abspath(module_dir))
+
+        return PrettierWorker(command, working_dir=working_dir)
@@ -0,0 +1,164 @@
+import hashlib
+import os
+
+from .Helpers import hash_file, sync_file
+
+
+class OutputWriter:
+    """Writes the files of the React app, leaving a file untouched when its
+    content wouldn't change. Rewriting an identical file still bumps its
+    modification time, which makes the development server recompile it.
+    Here's an usage example:
+
+    writer = OutputWriter()
+    writer.write("app/src/App.js", "export default App;\\n")
+    writer.copy("src/style.css", "app/src/style.css")
+    print(writer.skipped)
+
+    Files written before being formatted, e.g. by a batched prettier run,
+    can't be compared with the formatted file on disk. They are tracked in
+    pending until mark_formatted records the hash of the content given and
+    the hash of the formatted file, so the next write of the same content
+    can be skipped.
+
+    Attributes
+    ----------
+    formatted : dict
+        Paths of files formatted after being written mapped to the hashes
+        of their content before and after formatting, usually the
+        generated section of the build manifest
+    pending : dict
+        Paths of files written but not formatted yet mapped to the hash of
+        the content written
+    written : int
+        Number of files written or copied
+    skipped : int
+        Number of writes skipped because the file was up to date
+    """
+
+    def __init__(self, formatted=None):
+        self.formatted = formatted if formatted is not None else {}
+        self.pending = {}
+        self.written = 0
+        self.skipped = 0
+
+    def __isUnchanged(self, path, data, content_hash, formatted):
+        if formatted:
+            try:
+                if os.path.getsize(path) != len(data):
+                    return False
+                return hash_file(path) == content_hash
+            except OSError:
+                return False
+
+        entry = self.formatted.get(path)
+        if entry is None or entry["source"] != content_hash:
+            return False
+        try:
+            return hash_file(path) == entry["output"]
+        except OSError:
+            return False
+
+    def write(self, path, content, formatted=True):
+        """Writes content to path, unless the file already has it.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to be written
+        content : str
+            Content of the file
+        formatted : bool, optional
+            Whether content is final, False if the file gets formatted after
+            being written, defaults to True
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was up to date
+        """
+
+        data = content.encode('utf-8')
+        content_hash = hashlib.sha1(data).hexdigest()
+        if self.__isUnchanged(path, data, content_hash, formatted):
+            self.skipped += 1
+            return False
+
+        with open(path, 'wb') as outfile:
+            outfile.write(data)
+        self.written += 1
+        if formatted:
+            self.formatted.pop(path, None)
+        else:
+            self.pending[path] = content_hash
+        return True
+
+    def copy(self, src, dest, mode="copy", check="mtime"):
+        """Copies a static file, unless dest already matches it, see
+        sync_file.
+
+        Parameters
+        ----------
+        src : str
+            Path to the source file
+        dest : str
+            Path to the destination file
+        mode : str, optional
+            "copy", "hardlink" or "reflink", defaults to "copy"
+        check : str, optional
+            "mtime" or "hash", defaults to "mtime"
+
+        Returns
+        -------
+        bool
+            True if dest was written, False if it was up to date
+        """
+
+        if sync_file(src, dest, mode=mode, check=check):
+            self.written += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def mark_formatted(self, paths):
+        """Records pending files once they have been formatted.
+
+        Parameters
+        ----------
+        paths : iterable
+            Paths of the formatted files
+        """
+
+        for path in paths:
+            content_hash = self.pending.pop(path, None)
+            if content_hash is not None:
+                self.formatted[path] = {
+                    "source": content_hash,
+                    "output": hash_file(path)
+                }
+
+    def merge(self, other):
+        """Adds the writes done by another writer, like the copies used by
+        worker processes.
+
+        Parameters
+        ----------
+        other : OutputWriter
+            Writer to take the counts and pending files from
+        """
+
+        self.pending.update(other.pending)
+        self.written += other.written
+        self.skipped += other.skipped
+
+    def fork(self):
+        """Creates a writer sharing the formatted records, with no pending
+        files or counts, to be sent to a worker process.
+
+        Returns
+        -------
+        OutputWriter
+            New writer
+        """
+
+        return OutputWriter(self.formatted)
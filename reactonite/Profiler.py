@@ -0,0 +1,224 @@
+import json
+import os
+import threading
+import time
+
+# CPU time of the calling thread where available, so phases running in
+# other threads don't add up
+_cpu_time = getattr(time, "thread_time", time.process_time)
+
+
+class _Phase:
+    """Context manager recording a single phase into a Profiler."""
+
+    __slots__ = ("profiler", "name", "filepath", "start", "cpu_start")
+
+    def __init__(self, profiler, name, filepath):
+        self.profiler = profiler
+        self.name = name
+        self.filepath = filepath
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.cpu_start = _cpu_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.events.append({
+            "name": self.name,
+            "file": self.filepath,
+            "start": self.start,
+            "wall": time.perf_counter() - self.start,
+            "cpu": _cpu_time() - self.cpu_start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident()
+        })
+        return False
+
+
+class _NullPhase:
+    """Context manager doing nothing, used when profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Profiler:
+    """Records wall and CPU time spent in the phases of a build, for every
+    file and for the whole project. Here's an usage example:
+
+    profiler = Profiler()
+    with profiler.phase("parse"):
+        soup = BeautifulSoup(html, "html.parser")
+    print(profiler.format_summary())
+    profiler.write_chrome_trace("trace.json")
+
+    Phases can be nested, the time of a phase includes its nested phases.
+    Phases given a filepath are the per file totals.
+
+    Attributes
+    ----------
+    enabled : bool
+        Records phases if True, phase does nothing otherwise
+    events : list
+        Recorded phases with their name, file, start, wall and CPU time in
+        seconds, process and thread
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.events = []
+
+    def __getstate__(self):
+        # Copies sent to worker processes only carry their own events back
+        return {"enabled": self.enabled, "events": []}
+
+    def phase(self, name, filepath=None):
+        """Times the code run inside the returned context manager.
+
+        Parameters
+        ----------
+        name : str
+            Name of the phase
+        filepath : str, optional
+            File the phase is the total for, defaults to None
+
+        Returns
+        -------
+        context manager
+            Records the phase when exited
+        """
+
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name, filepath)
+
+    def add_events(self, events):
+        """Adds phases recorded by another profiler, like the ones in
+        worker processes.
+
+        Parameters
+        ----------
+        events : list
+            Events of the other profiler
+        """
+
+        self.events.extend(events)
+
+    def get_phase_totals(self):
+        """Sums up the time of every phase.
+
+        Returns
+        -------
+        list
+            Tuples of name, number of times run, wall and CPU time, slowest
+            first
+        """
+
+        totals = {}
+        for event in self.events:
+            count, wall, cpu = totals.get(event["name"], (0, 0.0, 0.0))
+            totals[event["name"]] = (
+                count + 1, wall + event["wall"], cpu + event["cpu"]
+            )
+        return sorted(
+            ((name,) + total for name, total in totals.items()),
+            key=lambda total: total[2],
+            reverse=True
+        )
+
+    def get_file_totals(self):
+        """Sums up the time spent on every file.
+
+        Returns
+        -------
+        list
+            Tuples of filepath, wall and CPU time, slowest first
+        """
+
+        totals = {}
+        for event in self.events:
+            if event["file"] is None:
+                continue
+            wall, cpu = totals.get(event["file"], (0.0, 0.0))
+            totals[event["file"]] = (wall + event["wall"], cpu + event["cpu"])
+        return sorted(
+            ((filepath,) + total for filepath, total in totals.items()),
+            key=lambda total: total[1],
+            reverse=True
+        )
+
+    def format_summary(self, top=10):
+        """Formats the slowest phases and files as a table.
+
+        Parameters
+        ----------
+        top : int, optional
+            Number of files listed, defaults to 10
+
+        Returns
+        -------
+        str
+            Summary to be printed
+        """
+
+        lines = ["{:<28} {:>7} {:>11} {:>11}".format(
+            "Phase", "Count", "Wall (s)", "CPU (s)"
+        )]
+        for name, count, wall, cpu in self.get_phase_totals():
+            lines.append("{:<28} {:>7} {:>11.4f} {:>11.4f}".format(
+                name, count, wall, cpu
+            ))
+
+        file_totals = self.get_file_totals()
+        if file_totals:
+            lines.append("")
+            lines.append("{:<52} {:>11} {:>11}".format(
+                "Slowest files", "Wall (s)", "CPU (s)"
+            ))
+            for filepath, wall, cpu in file_totals[:top]:
+                if len(filepath) > 52:
+                    filepath = "..." + filepath[-49:]
+                lines.append("{:<52} {:>11.4f} {:>11.4f}".format(
+                    filepath, wall, cpu
+                ))
+        return "\n".join(lines)
+
+    def write_chrome_trace(self, path):
+        """Writes the recorded phases in the Chrome trace event format, to be
+        opened in chrome://tracing or Perfetto.
+
+        Parameters
+        ----------
+        path : str
+            Path of the JSON file to be written
+        """
+
+        origin = min((event["start"] for event in self.events), default=0)
+        trace_events = []
+        for event in self.events:
+            args = {"cpu_ms": round(event["cpu"] * 1000, 3)}
+            if event["file"] is not None:
+                args["file"] = event["file"]
+            trace_events.append({
+                "name": event["name"],
+                "cat": "file" if event["file"] is not None else "project",
+                "ph": "X",
+                "ts": round((event["start"] - origin) * 1e6, 3),
+                "dur": round(event["wall"] * 1e6, 3),
+                "pid": event["pid"],
+                "tid": event["tid"],
+                "args": args
+            })
+
+        with open(path, 'w') as outfile:
+            json.dump({
+                "traceEvents": trace_events,
+                "displayTimeUnit": "ms"
+            }, outfile)
@@ -0,0 +1,287 @@
+import sys
+import time
+
+
+class TranspileProgress:
+    """Reports the progress of transpile_project: files done out of total,
+    files and bytes per second and the estimated time left, followed by a
+    summary of the run. Here's an usage example:
+
+    progress = TranspileProgress()
+    progress.start(total_files=100, total_bytes=250000)
+    progress.file_done("src/index.html", 2500, TranspileProgress.PAGE)
+    progress.close()
+    progress.summary(routes=42)
+
+    On a terminal the progress is a single line updated in place, otherwise
+    it's printed as key=value lines which are easy to parse in CI logs.
+
+    Attributes
+    ----------
+    PAGE : str
+        Kind of the files transpiled to React
+    COPIED : str
+        Kind of the static files copied to dest_dir
+    SKIPPED : str
+        Kind of the static files which were already up to date
+    stream : file
+        Stream the progress is written to, sys.stdout by default. It's None
+        in copies sent to worker processes, which only record the files done
+        so they can be merged into the reporter of the parent
+    interactive : bool
+        Updates a single line in place if True
+    min_interval : float
+        Minimum number of seconds between two progress updates
+    counts : dict
+        Number of files done of every kind, plus the unchanged pages and
+        static files skipped using the build manifest
+    node_time : float
+        Seconds spent waiting on Node subprocesses like prettier
+    """
+
+    PAGE = "page"
+    COPIED = "copied"
+    SKIPPED = "skipped"
+
+    def __init__(self, stream=None, interactive=None, min_interval=None):
+        if stream is None:
+            stream = sys.stdout
+        self.stream = stream
+        if interactive is None:
+            interactive = stream.isatty()
+        self.interactive = interactive
+        if min_interval is None:
+            min_interval = 0.1 if interactive else 1.0
+        self.min_interval = min_interval
+
+        self.total_files = 0
+        self.total_bytes = 0
+        self.files_done = 0
+        self.bytes_done = 0
+        self.counts = {
+            self.PAGE: 0, self.COPIED: 0, self.SKIPPED: 0,
+            "unchanged_pages": 0, "unchanged_static": 0
+        }
+        self.node_time = 0.0
+        self.records = []
+        self.start_time = time.perf_counter()
+        self.__last_update = 0.0
+        self.__line_open = False
+
+    def __getstate__(self):
+        # Copies in worker processes record what they did for the parent
+        state = self.__dict__.copy()
+        state["stream"] = None
+        return state
+
+    def start(self, total_files, total_bytes, unchanged_pages=0,
+              unchanged_static=0):
+        """Starts reporting for the files about to be processed.
+
+        Parameters
+        ----------
+        total_files : int
+            Number of files to be processed
+        total_bytes : int
+            Size of the files to be processed
+        unchanged_pages : int, optional
+            Pages skipped using the build manifest, defaults to 0
+        unchanged_static : int, optional
+            Static files skipped using the build manifest, defaults to 0
+        """
+
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.counts["unchanged_pages"] = unchanged_pages
+        self.counts["unchanged_static"] = unchanged_static
+        self.start_time = time.perf_counter()
+
+    def file_done(self, filepath, size, kind):
+        """Records a processed file and updates the progress.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the source file
+        size : int
+            Size of the source file in bytes
+        kind : str
+            PAGE, COPIED or SKIPPED
+        """
+
+        self.files_done += 1
+        self.bytes_done += size
+        self.counts[kind] += 1
+
+        if self.stream is None:
+            self.records.append((filepath, size, kind))
+            return
+
+        now = time.perf_counter()
+        if now - self.__last_update >= self.min_interval or \
+                self.files_done == self.total_files:
+            self.__last_update = now
+            self.__render(now)
+
+    def merge(self, other):
+        """Replays the files recorded by a reporter in a worker process.
+
+        Parameters
+        ----------
+        other : TranspileProgress
+            Reporter returned by the worker
+        """
+
+        for filepath, size, kind in other.records:
+            self.file_done(filepath, size, kind)
+        self.node_time += other.node_time
+
+    def add_node_time(self, seconds):
+        """Adds time spent waiting on a Node subprocess.
+
+        Parameters
+        ----------
+        seconds : float
+            Time spent
+        """
+
+        self.node_time += seconds
+
+    def get_rates(self, now=None):
+        """Computes the current throughput and time left.
+
+        Parameters
+        ----------
+        now : float, optional
+            Current time.perf_counter(), defaults to None i.e. now
+
+        Returns
+        -------
+        tuple
+            Files per second, bytes per second and the estimated seconds
+            left, None if unknown
+        """
+
+        if now is None:
+            now = time.perf_counter()
+        elapsed = max(now - self.start_time, 1e-9)
+        files_per_s = self.files_done / elapsed
+        bytes_per_s = self.bytes_done / elapsed
+        eta = None
+        if files_per_s > 0:
+            eta = (self.total_files - self.files_done) / files_per_s
+        return files_per_s, bytes_per_s, eta
+
+    def __render(self, now):
+        files_per_s, bytes_per_s, eta = self.get_rates(now)
+        if self.interactive:
+            percent = 100 * self.files_done // max(self.total_files, 1)
+            line = "[{}/{}] {:3d}% {:.1f} files/s {} ETA {}".format(
+                self.files_done, self.total_files, percent, files_per_s,
+                format_bytes(bytes_per_s) + "/s",
+                "?" if eta is None else format_duration(eta)
+            )
+            self.stream.write("\r" + line.ljust(79)[:79])
+            self.__line_open = True
+        else:
+            self.stream.write(
+                "progress files={}/{} bytes={}/{} files_per_s={:.1f} "
+                "bytes_per_s={:.0f} eta_s={}\n".format(
+                    self.files_done, self.total_files, self.bytes_done,
+                    self.total_bytes, files_per_s, bytes_per_s,
+                    "-" if eta is None else "{:.1f}".format(eta)
+                )
+            )
+        self.stream.flush()
+
+    def close(self):
+        """Ends the progress line, call it before printing anything else.
+        """
+
+        if self.stream is not None and self.__line_open:
+            self.stream.write("\n")
+            self.stream.flush()
+            self.__line_open = False
+
+    def summary(self, routes, writes_skipped=0):
+        """Prints the summary of the run.
+
+        Parameters
+        ----------
+        routes : int
+            Number of routes in index.js
+        writes_skipped : int, optional
+            Outputs left untouched because they were up to date, defaults
+            to 0
+        """
+
+        self.close()
+        total_time = time.perf_counter() - self.start_time
+        pages = self.counts[self.PAGE]
+        if self.interactive:
+            self.stream.write(
+                "Transpiled {} pages ({} unchanged), copied {} static files "
+                "({} skipped), {} routes in {} ({} in Node), {} unchanged "
+                "outputs kept\n".format(
+                    pages, self.counts["unchanged_pages"],
+                    self.counts[self.COPIED],
+                    self.counts[self.SKIPPED] +
+                    self.counts["unchanged_static"],
+                    routes, format_duration(total_time),
+                    format_duration(self.node_time), writes_skipped
+                )
+            )
+        else:
+            self.stream.write(
+                "summary pages={} unchanged_pages={} static_copied={} "
+                "static_skipped={} routes={} bytes={} total_s={:.3f} "
+                "node_s={:.3f} writes_skipped={}\n".format(
+                    pages, self.counts["unchanged_pages"],
+                    self.counts[self.COPIED],
+                    self.counts[self.SKIPPED] +
+                    self.counts["unchanged_static"],
+                    routes, self.bytes_done, total_time, self.node_time,
+                    writes_skipped
+                )
+            )
+        self.stream.flush()
+
+
+def format_bytes(size):
+    """Formats a number of bytes in a human readable way.
+
+    Parameters
+    ----------
+    size : float
+        Number of bytes
+
+    Returns
+    -------
+    str
+        Size like "1.5 MB"
+    """
+
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return "{:.1f} {}".format(size, unit)
+        size /= 1024
+
+
+def format_duration(seconds):
+    """Formats a duration in a human readable way.
+
+    Parameters
+    ----------
+    seconds : float
+        Duration in seconds
+
+    Returns
+    -------
+    str
+        Duration like "1m05s" or "2.3s"
+    """
+
+    if seconds < 60:
+        return "{:.1f}s".format(seconds)
+    minutes, seconds = divmod(int(seconds), 60)
+    return "{}m{:02d}s".format(minutes, seconds)
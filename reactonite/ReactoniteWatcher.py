@@ -5,13 +5,19 @@ import shutil
 from watchdog.events import PatternMatchingEventHandler
 from watchdog.observers import Observer
 
-from .Transpiler import Transpiler
+from .BuildWorker import BuildWorker
 from .Constants import DEFAULTS
+from .EventScheduler import EventScheduler
+from .Transpiler import Transpiler
 
 
 class ReactoniteWatcher():
     """A file/directory watcher to report events incase
-    they are modified/created/deleted.
+    they are modified/created/deleted. Events for paths matching the
+    ignore rules of the transpiler, like editor swap files, are dropped
+    right away. Other events are collected until they
+    quiet down, then a single incremental build handles all of them on the
+    build worker thread.
 
     Attributes
     ----------
@@ -34,6 +40,21 @@ class ReactoniteWatcher():
     recursive : bool
         Parameter whether the watcher should recursively watch
         inside directories or not, defaults to True
+    npm : NodeWrapper, optional
+        Node wrapper to be shared with the transpiler, defaults to None
+    profiler : Profiler, optional
+        Profiler recording the phases of every rebuild, defaults to None
+    transpiler : Transpiler, optional
+        Transpiler which already ran transpile_project, reused so the first
+        rebuild is incremental, a new one is created if None, defaults to
+        None
+    scheduler : EventScheduler
+        Collects the events and submits every batch to the build worker,
+        its quiet period and maximum delay are set by watch_quiet_period
+        and watch_max_delay in config.json
+    worker : BuildWorker
+        Runs the builds, a build is cancelled when files it's working on
+        change again
     """
 
     def __init__(self,
@@ -42,7 +63,10 @@ class ReactoniteWatcher():
                  ignore_patterns="",
                  ignore_directories=False,
                  case_sensitive=True,
-                 recursive=True):
+                 recursive=True,
+                 npm=None,
+                 profiler=None,
+                 transpiler=None):
 
         self.src_dir = config_settings["src_dir"]
         self.dest_dir = config_settings["dest_dir"]
@@ -67,17 +91,39 @@ class ReactoniteWatcher():
         self.recursive = recursive
 
         CONSTANTS = DEFAULTS()
-        self.transpiler = Transpiler(
-            config_settings,
-            props_map=CONSTANTS.PROPS_MAP,
-            verbose=True)
+        if transpiler is None:
+            transpiler = Transpiler(
+                config_settings,
+                props_map=CONSTANTS.PROPS_MAP,
+                verbose=True,
+                npm=npm)
+        self.transpiler = transpiler
+        if profiler is not None:
+            self.transpiler.profiler = profiler
+
+        self.worker = BuildWorker(self.build)
+        self.scheduler = EventScheduler(
+            self.worker.submit,
+            quiet_period=config_settings.get(
+                "watch_quiet_period", CONSTANTS.WATCH_QUIET_PERIOD
+            ),
+            max_delay=config_settings.get(
+                "watch_max_delay", CONSTANTS.WATCH_MAX_DELAY
+            )
+        )
 
     def start(self):
         """Runs the watchdog service on the given path. Handles
         various events to different functions as per the
-        requirement
+        requirement. Generated files are formatted by a single
+        prettier worker which lives as long as the watcher.
         """
 
+        npm = self.transpiler.npm
+        self.transpiler.prettier_worker = npm.prettier_worker(
+            module_dir=self.dest_dir
+        )
+
         event_handler = PatternMatchingEventHandler(self.patterns,
                                                     self.ignore_patterns,
                                                     self.ignore_directories,
@@ -96,6 +142,8 @@ class ReactoniteWatcher():
             recursive=go_recursively
         )
 
+        self.worker.start()
+        self.scheduler.start()
         observer.start()
 
         print(f'Started watching for changes on path {self.src_dir}')
@@ -105,6 +153,55 @@ class ReactoniteWatcher():
         except KeyboardInterrupt:
             observer.stop()
             observer.join()
+        finally:
+            self.scheduler.stop()
+            self.worker.stop()
+            self.transpiler.prettier_worker.stop()
+
+    def build(self, changes, cancel_event=None):
+        """Handles a batch of events with a single incremental update.
+        Outputs of deleted paths are removed, then only the changed files
+        and the pages whose links to created or deleted files flip are
+        transpiled, and index.js is rebuilt if routes changed. The
+        transpiler lock is held during the build.
+
+        Parameters
+        ----------
+        changes : dict
+            Paths mapped to EventScheduler.CHANGED or EventScheduler.DELETED
+        cancel_event : threading.Event, optional
+            Stops the build between files once set, defaults to None
+
+        Returns
+        -------
+        bool
+            False if the build was cancelled, True otherwise
+
+        Raises
+        ------
+        RuntimeError
+            Raised if a file can't be transpiled, the BuildWorker reports
+            the failure and carries on with the next build
+        """
+
+        with self.transpiler.lock:
+            print("Rebuilding after changes to {} paths".format(len(changes)))
+            changed = []
+            deleted = []
+            for path, kind in changes.items():
+                # Paths deleted and then created again are treated as changed
+                if kind == EventScheduler.DELETED and \
+                        not os.path.exists(path):
+                    deleted.append(path)
+                    self.__delete_file(path)
+                else:
+                    changed.append(path)
+
+            self.transpiler.cancel_event = cancel_event
+            try:
+                return self.transpiler.update_files(changed, deleted)
+            finally:
+                self.transpiler.cancel_event = None
 
     def __on_created(self, event):
         """This event is called when a file/directory
@@ -115,15 +212,9 @@ class ReactoniteWatcher():
         event : obj
             An event object containing necessary details about it.
         """
-        print(f"{event.src_path} has been created!")
-        if os.path.isdir(event.src_path):
-            return
-        if os.path.isfile(event.src_path) or os.path.islink(event.src_path):
-            try:
-                self.transpiler.transpile_project()
-            except:
-                print("transpile project failed")
-        
+
+        if not self.__isIgnored(event.src_path, event.is_directory):
+            self.scheduler.changed(event.src_path)
 
     def __on_deleted(self, event):
         """This event is called when a file/directory
@@ -135,13 +226,9 @@ class ReactoniteWatcher():
             An event object containing necessary details about it.
         """
 
-        print(f"deleted {event.src_path}!")
-        try:
-            self.transpiler.transpile_project(copy_static=False)
-        except:
-            print("transpile project failed")
-        self.__delete_file(event.src_path)
-    
+        if not self.__isIgnored(event.src_path, event.is_directory):
+            self.scheduler.deleted(event.src_path)
+
     def __on_modified(self, event):
         """This event is called when a file/directory
         is modified.
@@ -151,11 +238,12 @@ class ReactoniteWatcher():
         event : obj
             An event object containing necessary details about it.
         """
-        print(f"{event.src_path} has been modified")
-        if os.path.isdir(event.src_path):
+
+        # Directories are modified whenever their files are, nothing to do
+        if event.is_directory or \
+                self.__isIgnored(event.src_path, event.is_directory):
             return
-        if os.path.isfile(event.src_path) or os.path.islink(event.src_path):
-            self.__new_file(event.src_path)
+        self.scheduler.changed(event.src_path)
 
     def __on_moved(self, event):
         """This event is called when a file/directory
@@ -167,37 +255,38 @@ class ReactoniteWatcher():
             An event object containing necessary details about it.
         """
 
-        print(f"moved {event.src_path} to {event.dest_path}")
-        self.__delete_file(event.src_path)
-        self.__new_file(event.dest_path)
-        try:
-            self.transpiler.transpile_project(copy_static=False)
-        except:
-            print("transpile project failed")
+        # Editors save by moving a temporary file over the original
+        src_ignored = self.__isIgnored(event.src_path, event.is_directory)
+        dest_ignored = self.__isIgnored(event.dest_path, event.is_directory)
+        if not src_ignored and not dest_ignored:
+            self.scheduler.moved(event.src_path, event.dest_path)
+        elif not src_ignored:
+            self.scheduler.deleted(event.src_path)
+        elif not dest_ignored:
+            self.scheduler.changed(event.dest_path)
 
-    def __new_file(self, filepath):
-        _, filename = os.path.split(filepath)
-        try:
-            self.transpiler.transpileFile(filepath)
-        except:
-            print("transpiler failed")
+    def __isIgnored(self, path, is_dir):
+        return self.transpiler.ignore_rules.is_ignored(path, is_dir=is_dir)
 
     def __delete_file(self, filepath):
-        filePathFromSrc, _ = os.path.split(filepath[filepath.find('src') + 4:])
-        _, filename = os.path.split(filepath)
+        filePathFromSrc, filename = self.transpiler.get_path_from_src(
+            filepath
+        )
         filenameWithNoExtension, file_extension = os.path.splitext(filename)
         if file_extension == ".html":
             filename = filenameWithNoExtension + ".js"
         dest_filepath = os.path.join(
                 self.dest_dir, 'src', filePathFromSrc, filename
             )
+        # Already removed by a cancelled build of the same changes
+        if not os.path.lexists(dest_filepath):
+            return
         # dest_filepath can be a dir also
         print("removing", dest_filepath)
         try:
             self.__remove(dest_filepath)
-        except:
-            print("could not remove the file")
-        return
+        except OSError as e:
+            print("could not remove the file: " + str(e))
 
     def __remove(self, path):
         if os.path.isfile(path) or os.path.islink(path):
@@ -0,0 +1,128 @@
+import os
+
+
+class SourceIndex:
+    """In-memory index of the files in the source directory, built with a
+    single scan so links can be resolved without a stat call per link.
+
+    Call scan to build the index, and add/remove/move to keep it updated
+    from filesystem events. Here's an usage example:
+
+    source_index = SourceIndex("src")
+    source_index.scan()
+    source_index.isfile("src/index.html")
+
+    Attributes
+    ----------
+    src_dir : str
+        Source directory being indexed
+    files : set
+        Normalized paths of all files in the source directory
+    ignore_rules : IgnoreRules, optional
+        Files and directories left out of the index, defaults to None
+    """
+
+    def __init__(self, src_dir, ignore_rules=None):
+        self.src_dir = src_dir
+        self.files = set()
+        self.ignore_rules = ignore_rules
+
+    def __normalize(self, path):
+        return os.path.normcase(os.path.normpath(path))
+
+    def __walk(self, path):
+        if self.ignore_rules is not None:
+            yield from self.ignore_rules.walk(path)
+            return
+        for dirpath, _, filenames in os.walk(path, followlinks=True):
+            for filename in filenames:
+                yield os.path.join(dirpath, filename)
+
+    def scan(self):
+        """Builds the index by walking the whole source directory.
+
+        Returns
+        -------
+        list
+            Paths of all files found
+        """
+
+        filepaths = list(self.__walk(self.src_dir))
+        self.files = set(self.__normalize(path) for path in filepaths)
+        return filepaths
+
+    def isfile(self, path):
+        """Checks whether path is a file in the source directory. Paths
+        outside of the source directory aren't indexed and are checked on
+        the file system, like os.path.isfile does.
+
+        Parameters
+        ----------
+        path : str
+            Path to be checked
+
+        Returns
+        -------
+        bool
+            True if the file is in the index, or is an existing file
+            outside of the source directory
+        """
+
+        relpath = os.path.relpath(path, self.src_dir)
+        if relpath == os.pardir or relpath.startswith(os.pardir + os.sep):
+            return os.path.isfile(path)
+        return self.__normalize(path) in self.files
+
+    def add(self, path):
+        """Adds a file to the index, for directories all the files inside
+        it are added.
+
+        Parameters
+        ----------
+        path : str
+            Path to the created file or directory
+        """
+
+        if os.path.isdir(path):
+            for filepath in self.__walk(path):
+                self.files.add(self.__normalize(filepath))
+        elif os.path.isfile(path):
+            if self.ignore_rules is not None and \
+                    self.ignore_rules.is_ignored(path, is_dir=False):
+                return
+            self.files.add(self.__normalize(path))
+
+    def remove(self, path):
+        """Removes a file from the index, for directories all the files
+        inside it are removed.
+
+        Parameters
+        ----------
+        path : str
+            Path to the deleted file or directory
+        """
+
+        path = self.__normalize(path)
+        if path in self.files:
+            self.files.remove(path)
+            return
+
+        prefix = os.path.join(path, '')
+        self.files = set(
+            filepath for filepath in self.files
+            if not filepath.startswith(prefix)
+        )
+
+    def move(self, src_path, dest_path):
+        """Updates the index for a moved file or directory.
+
+        Parameters
+        ----------
+        src_path : str
+            Old path of the file or directory
+        dest_path : str
+            New path of the file or directory
+        """
+
+        self.remove(src_path)
+        self.add(dest_path)
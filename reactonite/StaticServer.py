@@ -0,0 +1,260 @@
+import mimetypes
+import os
+import posixpath
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import unquote, urlsplit
+
+
+class BuildRequestHandler(BaseHTTPRequestHandler):
+    """Serves the files of a production build like a static host would.
+
+    Paths without an extension which don't match a file are served
+    build/index.html, so the router handles them on the client. Hashed
+    assets are cached forever, everything else is revalidated using ETags.
+    Precompressed .br and .gz files are sent to clients which accept them,
+    and single byte ranges are supported.
+
+    Attributes
+    ----------
+    HASHED_ASSET : re.Pattern
+        Matches file names with a content hash, like main.1a2b3c4d.chunk.js
+    ENCODINGS : tuple
+        Precompressed encodings looked for, in order of preference, with
+        their file extensions
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    HASHED_ASSET = re.compile(r'\.[0-9a-f]{8,}(\.chunk)?\.[^./]+$')
+    ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+    def do_GET(self):
+        self.__serve(send_body=True)
+
+    def do_HEAD(self):
+        self.__serve(send_body=False)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def __resolvePath(self):
+        """Maps the request path to a file in the build directory.
+
+        Returns
+        -------
+        str or None
+            Path to the file to be served, None if there is none
+        """
+
+        path = posixpath.normpath(unquote(urlsplit(self.path).path))
+        parts = [part for part in path.split('/') if part not in ('', '.')]
+        if '..' in parts:
+            return None
+
+        filepath = os.path.join(self.server.build_dir, *parts)
+        if os.path.isdir(filepath):
+            filepath = os.path.join(filepath, 'index.html')
+        if os.path.isfile(filepath):
+            return filepath
+
+        # Routes are handled by the router in index.html
+        if not parts or '.' not in parts[-1]:
+            filepath = os.path.join(self.server.build_dir, 'index.html')
+            if os.path.isfile(filepath):
+                return filepath
+        return None
+
+    def __getAcceptedEncodings(self):
+        accepted = set()
+        header = self.headers.get('Accept-Encoding', '')
+        for value in header.split(','):
+            coding, _, params = value.strip().partition(';')
+            quality = 1.0
+            for param in params.split(';'):
+                key, _, number = param.strip().partition('=')
+                if key == 'q':
+                    try:
+                        quality = float(number)
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(coding.strip().lower())
+        return accepted
+
+    def __selectRepresentation(self, filepath):
+        """Picks the precompressed version of a file the client accepts.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the file to be served
+
+        Returns
+        -------
+        tuple
+            Path of the file to send, its content encoding or None and
+            whether precompressed versions exist
+        """
+
+        accepted = self.__getAcceptedEncodings()
+        has_variants = False
+        for encoding, ext in self.ENCODINGS:
+            if os.path.isfile(filepath + ext):
+                has_variants = True
+                if encoding in accepted:
+                    return filepath + ext, encoding, True
+        return filepath, None, has_variants
+
+    def __getRange(self, size, etag):
+        """Parses the Range header of the request.
+
+        Parameters
+        ----------
+        size : int
+            Size of the representation in bytes
+        etag : str
+            ETag of the representation, for If-Range
+
+        Returns
+        -------
+        tuple or None
+            First and last byte requested, None to send the whole file. An
+            empty tuple is returned if the range is not satisfiable.
+        """
+
+        header = self.headers.get('Range')
+        if not header or not header.startswith('bytes='):
+            return None
+
+        if_range = self.headers.get('If-Range')
+        if if_range is not None and if_range.strip() != etag:
+            return None
+
+        ranges = header[len('bytes='):].split(',')
+        # Multipart responses are not supported, send the whole file
+        if len(ranges) != 1:
+            return None
+
+        start, _, end = ranges[0].strip().partition('-')
+        try:
+            if start:
+                first = int(start)
+                last = int(end) if end else size - 1
+            else:
+                first = max(size - int(end), 0)
+                last = size - 1
+        except ValueError:
+            return None
+
+        last = min(last, size - 1)
+        if first > last:
+            return ()
+        return first, last
+
+    def __isNotModified(self, etag):
+        header = self.headers.get('If-None-Match')
+        if header is None:
+            return False
+        for value in header.split(','):
+            value = value.strip()
+            if value == '*' or value.replace('W/', '', 1) == etag:
+                return True
+        return False
+
+    def __serve(self, send_body):
+        filepath = self.__resolvePath()
+        if filepath is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return
+
+        sendpath, encoding, has_variants = \
+            self.__selectRepresentation(filepath)
+        stat = os.stat(sendpath)
+        etag = '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size)
+
+        headers = [('ETag', etag), ('Accept-Ranges', 'bytes')]
+        if self.HASHED_ASSET.search(filepath):
+            headers.append(
+                ('Cache-Control', 'public, max-age=31536000, immutable')
+            )
+        else:
+            headers.append(('Cache-Control', 'no-cache'))
+        if has_variants:
+            headers.append(('Vary', 'Accept-Encoding'))
+
+        if self.__isNotModified(etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        content_type, _ = mimetypes.guess_type(filepath)
+        headers.append(
+            ('Content-Type', content_type or 'application/octet-stream')
+        )
+        if encoding is not None:
+            headers.append(('Content-Encoding', encoding))
+
+        size = stat.st_size
+        byte_range = self.__getRange(size, etag)
+        if byte_range == ():
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header('Content-Range', 'bytes */{}'.format(size))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if byte_range is None:
+            first, length = 0, size
+            self.send_response(HTTPStatus.OK)
+        else:
+            first, length = byte_range[0], byte_range[1] - byte_range[0] + 1
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            headers.append(('Content-Range', 'bytes {}-{}/{}'.format(
+                byte_range[0], byte_range[1], size
+            )))
+        headers.append(('Content-Length', str(length)))
+
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+
+        if send_body:
+            self.wfile.flush()
+            # Uses os.sendfile where available, avoiding copies in Python
+            with open(sendpath, 'rb') as infile:
+                self.connection.sendfile(infile, first, length)
+
+
+class BuildServer(ThreadingMixIn, HTTPServer):
+    """Threaded HTTP server for the production build of a Reactonite app,
+    to check caching and compression locally or run load tests against.
+    Here's an usage example:
+
+    server = BuildServer(("127.0.0.1", 5000), "build")
+    server.serve_forever()
+
+    Attributes
+    ----------
+    build_dir : str
+        Directory containing the production build
+    verbose : bool
+        Logs every request if True
+    """
+
+    daemon_threads = True
+
+    def __init__(self, server_address, build_dir, verbose=False):
+        if not os.path.isdir(build_dir):
+            raise RuntimeError(
+                "Build directory doesn't exist at " + str(build_dir) +
+                ", run reactonite build first."
+            )
+        self.build_dir = os.path.abspath(build_dir)
+        self.verbose = verbose
+        super().__init__(server_address, BuildRequestHandler)
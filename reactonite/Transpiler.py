@@ -1,11 +1,24 @@
-import glob
+import hashlib
+import json
 import os
-from distutils.file_util import copy_file
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from html.parser import HTMLParser
 
 from bs4 import BeautifulSoup, Comment
 
+from . import __version__
+from .Constants import DEFAULTS
+from .Helpers import get_parent_dir
+from .IgnoreRules import IgnoreRules
+from .JSXEmitter import JSXEmitter
+from .Manifest import BuildManifest
 from .NodeWrapper import NodeWrapper
+from .OutputWriter import OutputWriter
+from .Profiler import Profiler
+from .Progress import TranspileProgress
+from .SourceIndex import SourceIndex
 
 
 class AttributesParser(HTMLParser):
@@ -59,6 +72,9 @@ class ReactCodeMapper:
     react_map = reactCodeMapper.getReactMap(tag_with_attributes)
     print(react_map)
 
+    Links are resolved against source_index if one is given, otherwise the
+    filesystem is checked for every link.
+
     Attributes
     ----------
     CUSTOM_TAG_HANDLERS : dict
@@ -69,21 +85,34 @@ class ReactCodeMapper:
         Destination directory for the React codebase.
     props_map : dict
         Mapping of attrs for HTML to React from props_map.py
+    source_index : SourceIndex, optional
+        Index of the files in src_dir used to resolve links, defaults to None
+    prefetch_module : str, optional
+        Name of the generated prefetching module, if given router links are
+        imported from it and get a prefetch prop with the route they point
+        to, defaults to None
     add_to_import : list
         Stores imports corresponding to variables created during transpilation.
     add_variables : list
         Stores newly created variables during transpilation.
     router_link_imported : bool, optional
         Saves wether Link tag needs to be imported for current page.
+    probed_paths : dict
+        Paths checked while resolving links mapped to whether they existed,
+        the output depends on these paths staying the same.
     """
 
-    def __init__(self, src_dir, dest_dir, props_map):
+    def __init__(self, src_dir, dest_dir, props_map, source_index=None,
+                 prefetch_module=None):
         self.src_dir = src_dir
         self.dest_dir = dest_dir
         self.props_map = props_map
+        self.source_index = source_index
+        self.prefetch_module = prefetch_module
         self.add_to_import = []
         self.add_variables = []
         self.router_link_imported = False
+        self.probed_paths = {}
 
         self.__A_TAG_HANDLER = 'A_TAG_HANDLER'
         self.__IMAGE_TAG_HANDLER = 'IMAGE_TAG_HANDLER'
@@ -121,6 +150,29 @@ class ReactCodeMapper:
             varName += _ch
         return varName
 
+    def __isSourceFile(self, path):
+        """Checks whether a link points to a file in the source directory and
+        records the check in probed_paths.
+
+        Parameters
+        ----------
+        path : str
+            Path to the linked file
+
+        Returns
+        -------
+        bool
+            True if the file exists
+        """
+
+        path = os.path.normpath(path)
+        if self.source_index is not None:
+            exists = self.source_index.isfile(path)
+        else:
+            exists = os.path.isfile(path)
+        self.probed_paths[path] = exists
+        return exists
+
     def __getLinkInfo(self, link, filepath_from_src, no_var=False):
         """Generates link information.
 
@@ -146,7 +198,8 @@ class ReactCodeMapper:
         if link:
             pathToLink = os.path.join(self.src_dir, filepath_from_src, link)
             pathToIndexLink = os.path.join(pathToLink, 'index.html')
-            if os.path.isfile(pathToLink) or os.path.isfile(pathToIndexLink):
+            if self.__isSourceFile(pathToLink) or \
+                    self.__isSourceFile(pathToIndexLink):
                 var = self.__getSafeName(link)
                 if no_var:
                     self.add_to_import.append(
@@ -242,7 +295,8 @@ class ReactCodeMapper:
                 pathRefIndex = os.path.join(
                     self.src_dir, filepath_from_src, href_info, "index.html"
                 )
-                if os.path.isfile(pathRef) or os.path.isfile(pathRefIndex):
+                if self.__isSourceFile(pathRef) or \
+                        self.__isSourceFile(pathRefIndex):
                     htmlPath = os.path.normpath(
                         os.path.join(filepath_from_src, href_info)
                     )
@@ -252,12 +306,58 @@ class ReactCodeMapper:
                         jsPath = "/"
                     is_internal = True
                     final_attrs["to"] = jsPath
+                    if self.prefetch_module and jsPath != "/":
+                        final_attrs["prefetch"] = self.__getRoute(jsPath)
                 else:
                     final_attrs["href"] = href_info
             else:
                 final_attrs[attrKey] = attrs[attrKey]
         return final_attrs, is_internal
 
+    def __getRoute(self, jsPath):
+        """Gets the route in index.js a router link points to, pages named
+        index are routed by their directory.
+
+        Parameters
+        ----------
+        jsPath : str
+            Link to the page from src directory without extension
+
+        Returns
+        -------
+        str
+            Route of the page
+        """
+
+        if jsPath.endswith("/index"):
+            return jsPath[:-len("/index")]
+        return jsPath
+
+    def __getRouterLinkImport(self, filepath_from_src):
+        """Generates the import for the Link component used by the page.
+
+        Parameters
+        ----------
+        filepath_from_src : str
+            Path to file from src directory
+
+        Returns
+        -------
+        str
+            Import statement for Link
+        """
+
+        if not self.prefetch_module:
+            return 'import {Link} from "react-router-dom";'
+
+        depth = len([
+            part for part in os.path.normpath(filepath_from_src).split(
+                os.path.sep
+            ) if part not in ('', '.')
+        ])
+        prefix = '../' * depth if depth else './'
+        return 'import Link from "{}{}";'.format(prefix, self.prefetch_module)
+
     def __customTagAttrsHandler(self, attrs, tag_handler, filepath_from_src):
         """Custom tag and attributes handler for parsing attrs from CUSTOM_TAG_HANDLERS
 
@@ -283,7 +383,7 @@ class ReactCodeMapper:
             )
             if not self.router_link_imported and is_internal_link:
                 self.add_to_import.append(
-                    'import {Link} from "react-router-dom";'
+                    self.__getRouterLinkImport(filepath_from_src)
                 )
                 self.router_link_imported = True
         elif tag_handler == self.__IMAGE_TAG_HANDLER:
@@ -339,6 +439,35 @@ class ReactCodeMapper:
             final_attrs[useKey] = attrs[attrKey]
         return final_attrs
 
+    def getReactTagAttrs(self, tag_name, attrs, filepath_from_src):
+        """Maps the attributes of a single HTML tag to React, running the
+        custom tag handlers if the tag needs one.
+
+        Parameters
+        ----------
+        tag_name : str
+            Name of the HTML tag
+        attrs : dict
+            Attributes of the tag in HTML format
+        filepath_from_src : str
+            Path to file from src directory
+
+        Returns
+        -------
+        dict
+            Final attributes for the tag in React format, if None is returned
+            the tag needs to be deleted
+        """
+
+        attrs = self.__getReactAttrs(attrs)
+        if tag_name in self.CUSTOM_TAG_HANDLERS:
+            attrs = self.__customTagAttrsHandler(
+                attrs,
+                self.CUSTOM_TAG_HANDLERS[tag_name],
+                filepath_from_src
+            )
+        return attrs
+
     def getReactMap(self, tags, filepath_from_src):
         """Wrapper to generate React Map object comprising of all data needed
         to convert HTML to React
@@ -364,19 +493,47 @@ class ReactCodeMapper:
         }
         for tag in tags:
             tag_name = list(tag.keys())[0]
-            attrs = self.__getReactAttrs(tag[tag_name])
-            if tag_name in self.CUSTOM_TAG_HANDLERS:
-                attrs = self.__customTagAttrsHandler(
-                    attrs,
-                    self.CUSTOM_TAG_HANDLERS[tag_name],
-                    filepath_from_src
-                )
+            attrs = self.getReactTagAttrs(
+                tag_name, tag[tag_name], filepath_from_src
+            )
             final_map['tags'].append({tag_name: attrs})
         final_map['imports'] = "\n".join(self.add_to_import)
         final_map['variables'] = self.add_variables
         return final_map
 
 
+def _transpile_files(transpiler, filepaths):
+    """Transpiles a chunk of files inside a worker process.
+
+    Parameters
+    ----------
+    transpiler : Transpiler
+        Copy of the transpiler sent to the worker process
+    filepaths : list
+        Paths of the files to be transpiled
+
+    Returns
+    -------
+    tuple
+        List of tuples of the path of the generated or copied file and the
+        paths probed while resolving its links, the phases recorded by the
+        profiler of the worker, the files recorded by its progress reporter,
+        None if there's none, and its output writer
+    """
+
+    results = []
+    for filepath in filepaths:
+        dest_filepath = transpiler.transpileFile(filepath, prettify=False)
+        results.append((
+            dest_filepath,
+            transpiler.link_dependencies.get(filepath)
+        ))
+    return (
+        results, transpiler.profiler.events, transpiler.progress,
+        transpiler.output_writer
+    )
+
+
 class Transpiler:
     """Transpiler responsible for translating HTML code to React
 
@@ -395,26 +552,79 @@ class Transpiler:
         to "html.parser"
     verbose : bool, optional
         Specify the verbosity of the transpiler, defaults to False
+    manifest_path : str
+        Path of the incremental build manifest in the project directory
+    link_dependencies : dict
+        Paths probed by each transpiled page while resolving its links,
+        mapped to whether they existed
+    source_index : SourceIndex
+        Index of the files in src_dir used to resolve links, built by
+        transpile_project, None until then
+    ignore_rules : IgnoreRules
+        Files left out of the project: version control, OS and editor
+        temporary files, dest_dir if it's inside src_dir and the patterns of
+        the .reactoniteignore file in the project dir
+    static_sync_mode : str
+        How static files are synced to dest_dir, "copy", "hardlink" or
+        "reflink", set by static_sync_mode in config.json
+    static_sync_check : str
+        How existing static files in dest_dir are compared before syncing,
+        "mtime" or "hash", set by static_sync_check in config.json
+    code_splitting : bool
+        Loads every page with React.lazy inside a Suspense boundary in
+        index.js so each one ends up in its own chunk, set by code_splitting
+        in config.json
+    eager_routes : set
+        Routes imported eagerly even with code splitting, like "about" or
+        "blog/post", set by eager_routes in config.json
+    prefetch_links : bool
+        Makes router links prefetch the chunk of their page when hovered or
+        scrolled into view, set by prefetch_links in config.json
+    npm : NodeWrapper
+        Node wrapper shared by everything the transpiler runs through node
+    prettier_worker : PrettierWorker, optional
+        Long-lived prettier process used to format generated files in
+        memory instead of running npx for each of them, defaults to None
+    prerender : bool
+        Generates an index.js which hydrates the markup of prerendered
+        pages instead of rendering from scratch, defaults to False
+    profiler : Profiler
+        Records the time spent in every phase of transpilation, disabled
+        by default
+    output_writer : OutputWriter
+        Writes the generated and copied files, skipping the ones which are
+        already up to date, recreated for every build
+    lock : threading.RLock
+        Held while transpiling, so builds started from different threads
+        don't modify index_routes and the other state at the same time
+    cancel_event : threading.Event, optional
+        Stops transpile_project between files once set, defaults to None
     """
 
     def __init__(self,
                  config_settings,
                  props_map,
                  verbose=False,
-                 create_project=False):
+                 create_project=False,
+                 npm=None):
         """Transpiler initiator takes config settings and unpacks variables.
 
         Parameters
         ----------
         config_settings : dict
             project_name, src_dir, dest_dir as dict object stored
-            in config.json
+            in config.json, optionally static_sync_mode,
+            static_sync_check, code_splitting, eager_routes and
+            prefetch_links
         props_map : dict
             Mapping of props for HTML to React used during transpilation
         verbose : bool, optional
             Specify the verbosity of the transpiler, deafults to False
         create_project : bool, optional
             Set to True if create project is calling method, deafults to False
+        npm : NodeWrapper, optional
+            Node wrapper to reuse, a new one is created if None, defaults to
+            None
 
         Raises
         ------
@@ -427,14 +637,61 @@ class Transpiler:
         self.dest_dir = config_settings["dest_dir"]
         self.props_map = props_map
         self.index_routes = {}
+        self.link_dependencies = {}
+        self.__link_dependents = {}
+        self.source_index = None
         self.parser = "html.parser"
         self.verbose = verbose
+        self.prettier_worker = None
+        self.prerender = False
+        self.profiler = Profiler(enabled=False)
+        self.progress = None
+        self.output_writer = OutputWriter()
+        self.lock = threading.RLock()
+        self.cancel_event = None
+        self.__project_transpiled = False
+        self.__unfinished_files = set()
 
         if create_project:
             self.src_dir = os.path.join('.', self.project_name, self.src_dir)
             self.dest_dir = os.path.join('.', self.project_name, self.dest_dir)
 
-        npm = NodeWrapper()
+        CONSTANTS = DEFAULTS()
+        project_dir = get_parent_dir(self.src_dir)
+        self.manifest_path = os.path.join(
+            project_dir, CONSTANTS.MANIFEST_FILE_NAME
+        )
+        # Generated files must never be picked up as sources
+        dest_from_project = os.path.relpath(self.dest_dir, project_dir)
+        self.ignore_rules = IgnoreRules.load(
+            project_dir,
+            CONSTANTS.IGNORE_PATTERNS + [
+                '/' + '/'.join(dest_from_project.split(os.path.sep)) + '/'
+            ],
+            CONSTANTS.IGNORE_FILE_NAME
+        )
+        self.static_sync_mode = config_settings.get(
+            "static_sync_mode", CONSTANTS.STATIC_SYNC_MODE
+        )
+        self.static_sync_check = config_settings.get(
+            "static_sync_check", CONSTANTS.STATIC_SYNC_CHECK
+        )
+        self.code_splitting = bool(config_settings.get(
+            "code_splitting", CONSTANTS.CODE_SPLITTING
+        ))
+        self.eager_routes = set(
+            route.strip("/") for route in config_settings.get(
+                "eager_routes", CONSTANTS.EAGER_ROUTES
+            )
+        )
+        self.prefetch_links = bool(config_settings.get(
+            "prefetch_links", CONSTANTS.PREFETCH_LINKS
+        ))
+        self.prefetch_module = CONSTANTS.PREFETCH_MODULE_NAME
+
+        if npm is None:
+            npm = NodeWrapper()
+        self.npm = npm
 
         if not os.path.exists(os.path.join(".", self.src_dir)):
             raise RuntimeError(
@@ -463,68 +720,146 @@ class Transpiler:
                 working_dir=self.dest_dir
             )
 
-    def __replaceAttrs(self, soup, tag_name, or_attrs, f_attrs):
-        """Replaces the attrs for updated tags comparing original and final attrs.
+    def __getstate__(self):
+        """Drops the prettier worker when the transpiler is sent to worker
+        processes, a running process can't be shared.
+        """
+
+        state = self.__dict__.copy()
+        state['prettier_worker'] = None
+        # Workers send back the dependencies of the pages they transpile
+        state['link_dependencies'] = {}
+        state['_Transpiler__link_dependents'] = {}
+        # Locks and events can't be pickled, workers get their own lock
+        state['lock'] = None
+        state['cancel_event'] = None
+        # Workers send back the writes they did, counted from zero
+        state['output_writer'] = self.output_writer.fork()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    def __isCancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def __recordLinkDependencies(self, filepath, probed_paths):
+        """Stores the paths probed by a page and updates the reverse mapping
+        used to find pages depending on a path.
 
         Parameters
         ----------
-        soup : BeautifulSoup
-            bs4.BeautifulSoup passed by reference.
-        tag_name : str
-            Name of tag being worked upon.
-        or_attrs : dict
-            Dictonary consisting of original attributes of HTML.
-        f_attrs : dict
-            Dictonary consisting of final attributes for React.
+        filepath : str
+            Path to the source HTML file
+        probed_paths : dict
+            Paths probed while resolving links mapped to whether they existed
         """
 
-        if or_attrs == f_attrs:
-            return
+        for path in self.link_dependencies.get(filepath, {}):
+            dependents = self.__link_dependents.get(path)
+            if dependents is not None:
+                dependents.discard(filepath)
+                if not dependents:
+                    del self.__link_dependents[path]
+
+        self.link_dependencies[filepath] = probed_paths
+        for path in probed_paths:
+            self.__link_dependents.setdefault(path, set()).add(filepath)
 
-        htmlTag = soup.find(tag_name, attrs=or_attrs)
+    def get_dependent_pages(self, path):
+        """Gets the pages whose output depends on whether the given path
+        exists, i.e. pages which link to it.
 
-        upperAttrs = {}
-        lowerAttrs = {}
+        Parameters
+        ----------
+        path : str
+            Path to a file in the source directory
+
+        Returns
+        -------
+        list
+            Paths to the source HTML files linking to path
+        """
+
+        return sorted(self.__link_dependents.get(os.path.normpath(path), ()))
+
+    def get_path_from_src(self, filepath):
+        """Splits a path inside src_dir into its directory relative to
+        src_dir and its name.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to a file or directory inside src_dir
 
-        if htmlTag is None:
-            for attr in or_attrs.keys():
-                upperAttrs[attr] = or_attrs[attr].upper()
-                lowerAttrs[attr] = or_attrs[attr].lower()
-            htmlTag = soup.find(tag_name, attrs=upperAttrs)
-            if htmlTag is None:
-                htmlTag = soup.find(tag_name, attrs=lowerAttrs)
+        Returns
+        -------
+        tuple
+            Directory relative to src_dir, empty for src_dir itself, and
+            the name of the file or directory
+        """
+
+        return os.path.split(os.path.relpath(filepath, self.src_dir))
+
+    def __getFingerprint(self):
+        """Generates the settings the transpiled output depends on, stored
+        in the build manifest to invalidate it when any of them changes.
 
-        if not (htmlTag is None):
-            htmlTag.attrs = f_attrs
-            if tag_name == "a" and "to" in f_attrs:
-                htmlTag.name = "Link"
+        Returns
+        -------
+        dict
+            Reactonite version, props map hash, parser, dest_dir and
+            whether links prefetch
+        """
+
+        props_map_json = json.dumps(self.props_map, sort_keys=True)
+        return {
+            "reactonite": __version__,
+            "props_map": hashlib.sha1(
+                props_map_json.encode('utf-8')
+            ).hexdigest(),
+            "parser": self.parser,
+            "dest_dir": self.dest_dir,
+            "prefetch_links": self.prefetch_links
+        }
 
-    def __deleteTag(self, soup, tag_name, attrs):
-        """Deletes the tag corresponding to given tag_name and attrs.
+    def __rewriteTree(self, soup, reactCodeMapper, filepath_from_src):
+        """Walks the soup once and applies the React mapping to every tag in
+        place, renaming attributes, running custom tag handlers and deleting
+        tags which are not needed in React.
 
         Parameters
         ----------
         soup : BeautifulSoup
             bs4.BeautifulSoup passed by reference.
-        tag_name : str
-            Name of tag being worked upon.
-        attrs : dict
-            Dictonary consisting of original attributes of HTML.
+        reactCodeMapper : ReactCodeMapper
+            Mapper used to generate React attributes and imports.
+        filepath_from_src : str
+            Path to file from src directory
         """
 
-        htmlTag = soup.find(tag_name, attrs=attrs)
+        for htmlTag in soup.find_all(True):
+            # Descendants of a tag deleted earlier in the walk are cleared
+            if htmlTag.decomposed:
+                continue
+            or_attrs = {}
+            for attrKey, attrValue in htmlTag.attrs.items():
+                # Multi valued attributes like class are stored as lists
+                if isinstance(attrValue, list):
+                    attrValue = " ".join(attrValue)
+                or_attrs[attrKey] = attrValue
+
+            f_attrs = reactCodeMapper.getReactTagAttrs(
+                htmlTag.name, or_attrs, filepath_from_src
+            )
 
-        upperAttrs = {}
-        lowerAttrs = {}
-        if htmlTag is None:
-            for attr in attrs.keys():
-                upperAttrs[attr] = attrs[attr].upper()
-                lowerAttrs[attr] = attrs[attr].lower()
-            htmlTag = soup.find(tag_name, attrs=upperAttrs)
-            if htmlTag is None:
-                htmlTag = soup.find(tag_name, attrs=lowerAttrs)
-        if not (htmlTag is None):
-            htmlTag.decompose()
+            if f_attrs is None:
+                htmlTag.decompose()
+            elif f_attrs != or_attrs:
+                htmlTag.attrs = f_attrs
+                if htmlTag.name == "a" and "to" in f_attrs:
+                    htmlTag.name = "Link"
 
     def __generateReactFileContent(
         self, soup, function_name, filepath_from_src
@@ -547,40 +882,24 @@ class Transpiler:
             Content for React file.
         """
 
-        styleTags = [style.extract() for style in soup.find_all('style')]
-        scriptTags = [
-            script.extract() for script in soup.find_all('script', src=False)
-        ]
-        attributes_parser = AttributesParser()
-        attributes_parser.feed(soup.prettify())
-        tag_with_attributes = attributes_parser.data
-
-        reactCodeMapper = ReactCodeMapper(
-            self.src_dir, self.dest_dir, self.props_map
-        )
-        react_map = reactCodeMapper.getReactMap(
-            tag_with_attributes, filepath_from_src
-        )
-
-        final_tags = react_map['tags']
-        react_variables = react_map['variables']
-
-        for orignal_tag, fianl_tag in zip(tag_with_attributes, final_tags):
-            or_tag_name = list(orignal_tag.keys())[0]
-            or_attrs = orignal_tag[or_tag_name]
-            f_tag_name = list(fianl_tag.keys())[0]
-            f_attrs = fianl_tag[f_tag_name]
+        with self.profiler.phase("rewrite"):
+            styleTags = [
+                style.extract() for style in soup.find_all('style')
+            ]
+            scriptTags = [
+                script.extract()
+                for script in soup.find_all('script', src=False)
+            ]
+            reactCodeMapper = ReactCodeMapper(
+                self.src_dir, self.dest_dir, self.props_map,
+                self.source_index,
+                prefetch_module=self.prefetch_module if self.prefetch_links
+                else None
+            )
+            self.__rewriteTree(soup, reactCodeMapper, filepath_from_src)
+            self.__probed_paths = reactCodeMapper.probed_paths
 
-            if or_tag_name == f_tag_name:
-                if f_attrs is None:
-                    self.__deleteTag(soup, or_tag_name, or_attrs)
-                else:
-                    self.__replaceAttrs(soup, or_tag_name, or_attrs, f_attrs)
-            else:
-                raise RuntimeWarning(
-                    "There's an error in processing " +
-                    or_tag_name
-                )
+        imports = "\n".join(reactCodeMapper.add_to_import)
 
         reactHead = None
         if soup.head:
@@ -594,53 +913,39 @@ class Transpiler:
             for style in styleTags:
                 reactHead.append(style)
 
-        contents = soup.body.contents
-
-        body_contents = [
-            x.encode('utf-8').decode("utf-8").strip() for x in contents
-        ]
-        body_str = "".join(body_contents)
-
         if reactHead:
-            content_str = reactHead.prettify() + body_str
-            react_map['imports'] += "import Helmet from 'react-helmet';"
-        else:
-            content_str = body_str
-
-        for variable in react_variables:
-            content_str = content_str.replace(
-                '"{' + variable + '}"',
-                '{' + variable + '}'
-            )
+            imports += "import Helmet from 'react-helmet';"
 
         if len(scriptTags):
-            react_map['imports'] += "import React, { useEffect } from 'react';"
+            imports += "import React, { useEffect } from 'react';"
             scriptContent = ""
             for script in scriptTags:
                 scriptContent += "".join(script.contents)
             useEffect = "useEffect(() => {" + scriptContent + "}, []);"
         else:
-            react_map['imports'] += "import React from 'react';"
+            imports += "import React from 'react';"
             useEffect = ""
 
-        if len(styleTags):
-            content_str = content_str.replace("<style>", "<style>{`")
-            content_str = content_str.replace("</style>", "`}</style>")
-
-        react_function = "function " + function_name + "() {  " + useEffect + \
-            "  return (<>" + content_str + "</>);}"
-
-        return """
-        {imports}
-
-        {function}
+        with self.profiler.phase("emit"):
+            emitter = JSXEmitter(expressions=[
+                "{" + variable + "}"
+                for variable in reactCodeMapper.add_variables
+            ])
+            emitter.write("\n        " + imports + "\n\n        ")
+            emitter.write(
+                "function " + function_name + "() {  " + useEffect +
+                "  return (<>"
+            )
+            if reactHead:
+                emitter.write_node(reactHead)
+            for node in soup.body.contents:
+                emitter.write_node(node, strip=True)
+            emitter.write("</>);}")
+            emitter.write(
+                "\n\n        export default " + function_name + ";\n        "
+            )
 
-        export default {function_name};
-        """.format(
-            function_name=function_name,
-            function=react_function,
-            imports=react_map['imports']
-        )
+            return emitter.getvalue()
 
     def __getReactComponentName(self, link):
         """Generates safe name for React compnents from path to file.
@@ -664,8 +969,18 @@ class Transpiler:
             varName += _ch
         return "REACTONITE" + varName.upper()
 
-    def __generateIndexJsContent(self):
-        """Generates content for index.js file in React codebase with handled routes
+    def __isLazyRoute(self, link):
+        return self.code_splitting and link not in self.eager_routes
+
+    def generate_index_js(self):
+        """Generates content for index.js file in React codebase with handled
+        routes from index_routes, without writing it. With code splitting,
+        pages not in eager_routes are imported with React.lazy and the
+        routes are wrapped in a Suspense boundary.
+
+        With prerender, prerendered markup is hydrated. Lazy pages can then
+        be preloaded, the page being hydrated is loaded before hydration
+        starts so it renders without suspending.
 
         Returns
         -------
@@ -678,14 +993,28 @@ class Transpiler:
                         Switch,
                         Route
                     } from "react-router-dom";"""
+        if self.prerender:
+            router = router.replace("Route\n", "Route,\n    matchPath\n", 1)
 
         imports = []
+        lazyImports = []
         routes = []
+        preloads = []
 
         for link, path in self.index_routes.items():
             componentName = self.__getReactComponentName(path)
-            importReact = 'import ' + componentName + ' from "' + path + '";'
-            imports.append(importReact)
+            lazy = 'lazyRoute' if self.prerender else 'React.lazy'
+            if self.__isLazyRoute(link):
+                lazyImports.append('const ' + componentName + ' = ' + lazy +
+                                   '(() => import("' + path + '"));')
+                preload = componentName + '.preload'
+            else:
+                imports.append('import ' + componentName +
+                               ' from "' + path + '";')
+                preload = 'null'
+            preloads.append(
+                '{ path: "/' + link + '", preload: ' + preload + ' },'
+            )
             routeReact = """
             <Route path="/{link}">
                 <{componentName} />
@@ -696,6 +1025,72 @@ class Transpiler:
         imports = '\n'.join(imports)
         routes = '\n'.join(routes)
 
+        # Declarations have to follow every import, for eslint's import/first
+        if self.prerender:
+            lazyImports.insert(0, """
+            // Lazy page which can be loaded ahead of rendering, once loaded it
+            // renders without suspending
+            function lazyRoute(load) {
+                let loaded = null;
+                const preload = () => load().then((module) => {
+                    loaded = module;
+                    return module;
+                });
+                const Component = React.lazy(() =>
+                    loaded ? { then: (resolve) => resolve(loaded) } : preload()
+                );
+                Component.preload = preload;
+                return Component;
+            }
+            """)
+        if lazyImports:
+            imports += '\n\n' + '\n'.join(lazyImports)
+
+        switch = """<Switch>
+            {routes}
+            <Route path="/">
+                <App />
+            </Route>
+            </Switch>""".format(routes=routes)
+        if any(self.__isLazyRoute(link) for link in self.index_routes):
+            switch = """<React.Suspense fallback={{null}}>
+            {switch}
+            </React.Suspense>""".format(switch=switch)
+
+        if self.prerender:
+            render = """const routes = [
+            {preloads}
+            {{ path: "/", preload: null }},
+        ];
+
+        const app = (
+        <Router>
+            {switch}
+        </Router>
+        );
+
+        const rootElement = document.getElementById("root");
+        if (rootElement.hasChildNodes()) {{
+            const hydrate = () => ReactDOM.hydrate(app, rootElement);
+            const route = routes.find((route) =>
+                matchPath(window.location.pathname, {{ path: route.path }})
+            );
+            if (route && route.preload) {{
+                route.preload().then(hydrate, hydrate);
+            }} else {{
+                hydrate();
+            }}
+        }} else {{
+            ReactDOM.render(app, rootElement);
+        }}""".format(preloads='\n'.join(preloads), switch=switch)
+        else:
+            render = """ReactDOM.render(
+        <Router>
+            {switch}
+        </Router>,
+        document.getElementById("root")
+        );""".format(switch=switch)
+
         return """
         import React from "react";
         import ReactDOM from "react-dom";
@@ -707,17 +1102,7 @@ class Transpiler:
         import App from "./App";
         {imports}
 
-        ReactDOM.render(
-        <Router>
-            <Switch>
-            {routes}
-            <Route path="/">
-                <App />
-            </Route>
-            </Switch>
-        </Router>,
-        document.getElementById("root")
-        );
+        {render}
 
         // If you don't want your app to work offline, you can change
         // register() to unregister() below. Note this comes with some
@@ -728,11 +1113,121 @@ class Transpiler:
         // function to log results (for example: reportWebVitals(console.log))
         // or send to analytics endpoint. Learn more: https://bit.ly/CRA-vitals
         reportWebVitals();
-        """.format(imports=imports, routes=routes, router=router)
+        """.format(imports=imports, render=render, router=router)
+
+    def __generatePrefetchJsContent(self):
+        """Generates content for the prefetching module in React codebase,
+        providing a Link which loads the chunk of its route when hovered or
+        scrolled into view. Only lazily loaded routes have chunks to load.
+
+        Returns
+        -------
+        str
+            Content for the prefetching module in React codebase
+        """
+
+        routes = []
+        for link, path in self.index_routes.items():
+            if self.__isLazyRoute(link):
+                routes.append('"{link}": () => import("{path}"),'.format(
+                    link=link, path=path
+                ))
+        routes = '\n'.join(routes)
+
+        return """
+        import React, {{ useEffect, useRef }} from "react";
+        import {{ Link }} from "react-router-dom";
+
+        // Same imports as the lazy routes in index.js, so both share a chunk
+        const routes = {{
+            {routes}
+        }};
+
+        const prefetched = {{}};
+
+        export function prefetchRoute(route) {{
+            if (!routes[route] || prefetched[route]) {{
+                return;
+            }}
+            prefetched[route] = routes[route]().catch(() => {{
+                delete prefetched[route];
+            }});
+        }}
+
+        function PrefetchLink({{ prefetch, onMouseEnter, ...props }}) {{
+            const ref = useRef(null);
+
+            useEffect(() => {{
+                if (!routes[prefetch] || !ref.current ||
+                        typeof IntersectionObserver === "undefined") {{
+                    return undefined;
+                }}
+                const observer = new IntersectionObserver((entries) => {{
+                    if (entries.some((entry) => entry.isIntersecting)) {{
+                        prefetchRoute(prefetch);
+                        observer.disconnect();
+                    }}
+                }});
+                observer.observe(ref.current);
+                return () => observer.disconnect();
+            }}, [prefetch]);
+
+            const handleMouseEnter = (event) => {{
+                prefetchRoute(prefetch);
+                if (onMouseEnter) {{
+                    onMouseEnter(event);
+                }}
+            }};
+
+            return (
+                <Link {{...props}} innerRef={{ref}}
+                    onMouseEnter={{handleMouseEnter}} />
+            );
+        }}
+
+        export default PrefetchLink;
+        """.format(routes=routes)
+
+    def __writeGeneratedFile(self, dest_filepath, file_content,
+                             prettify=True):
+        """Writes a file generated from the whole project, like index.js.
+        The file is left untouched if its content didn't change since it was
+        last written, rewriting it makes the development server rebuild the
+        whole app.
+
+        Parameters
+        ----------
+        dest_filepath : str
+            Path of the generated file
+        file_content : str
+            Generated content, before formatting
+        prettify : bool, optional
+            Runs prettier on the generated file if True, default True
 
-    def __rebuildIndexJs(self):
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was up to date
+        """
+
+        written = self.__writeReactFile(dest_filepath, file_content, prettify)
+        if not written and self.verbose:
+            print("Routes unchanged, keeping " + str(dest_filepath))
+        return written
+
+    def __rebuildIndexJs(self, prettify=True):
         """Generates the index.js for React apps entry point, needed to handle
-        links to pages
+        links to pages, only written if the route table changed.
+
+        Parameters
+        ----------
+        prettify : bool, optional
+            Runs prettier on the generated file if True, default True
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was up to date
 
         Raises
         ------
@@ -745,11 +1240,95 @@ class Transpiler:
             raise RuntimeError("Looks like you are missing index.js file in \
                 React directory! It seems to be an NPM/React issue rather.")
 
-        with open(pathToIndexJs, 'w') as outfile:
-            file_content = self.__generateIndexJsContent()
-            outfile.write(file_content)
+        return self.__writeGeneratedFile(
+            pathToIndexJs, self.generate_index_js(), prettify
+        )
+
+    def __rebuildPrefetchJs(self, prettify=True):
+        """Generates the prefetching module imported by pages for their
+        router links, only written if the route table changed.
+
+        Parameters
+        ----------
+        prettify : bool, optional
+            Runs prettier on the generated file if True, default True
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was up to date
+        """
+
+        pathToPrefetchJs = os.path.join(
+            self.dest_dir, 'src', self.prefetch_module + '.js'
+        )
+        return self.__writeGeneratedFile(
+            pathToPrefetchJs, self.__generatePrefetchJsContent(), prettify
+        )
+
+    def __writeReactFile(self, dest_filepath, file_content, prettify):
+        """Writes generated React code to dest_filepath through the output
+        writer, so an up to date file is left untouched. If a prettier
+        worker is attached the code is formatted in memory before writing,
+        otherwise prettier is run on the written file.
+
+        Parameters
+        ----------
+        dest_filepath : str
+            Path of the React file to be written
+        file_content : str
+            Generated React code
+        prettify : bool
+            Formats the code with prettier if True, if False the file is
+            left pending in the output writer for a batched prettier run
+
+        Returns
+        -------
+        bool
+            True if the file was written, False if it was up to date
+        """
+
+        formatted = False
+        if prettify and self.prettier_worker is not None and \
+                not self.prettier_worker.disabled:
+            start = time.perf_counter()
+            try:
+                with self.profiler.phase("prettier worker"):
+                    file_content = self.prettier_worker.format(
+                        file_content, dest_filepath
+                    )
+                prettify = False
+                formatted = True
+            except RuntimeError as e:
+                if self.verbose:
+                    print(str(e) + ", falling back to npx prettier")
+            self.__addNodeTime(start)
+
+        with self.profiler.phase("write"):
+            written = self.output_writer.write(
+                dest_filepath, file_content, formatted=formatted
+            )
+
+        if prettify and written:
+            start = time.perf_counter()
+            with self.profiler.phase("prettier"):
+                self.npm.prettify(path=dest_filepath)
+            self.__addNodeTime(start)
+            self.output_writer.mark_formatted([dest_filepath])
+        return written
 
-        NodeWrapper().prettify(path=pathToIndexJs)
+    def __addNodeTime(self, start):
+        """Reports the time spent in a Node subprocess since start to the
+        progress reporter, if any.
+
+        Parameters
+        ----------
+        start : float
+            time.perf_counter() before calling Node
+        """
+
+        if self.progress is not None:
+            self.progress.add_node_time(time.perf_counter() - start)
 
     def __addRoutesToIndexLinkArray(self, filePathFromSrc, filenameNoExt):
         """Adds links to self.index_routes to be used in index.js generation
@@ -773,7 +1352,83 @@ class Transpiler:
             jsPath = '/'.join(htmlPath.split(os.path.sep))
             self.index_routes[jsPath] = "./" + jsPath
 
-    def transpileFile(self, filepath):
+    def __removeRoutesFromIndexLinkArray(self, filePathFromSrc,
+                                         filenameNoExt):
+        """Removes links from self.index_routes added by
+        __addRoutesToIndexLinkArray
+
+        Parameters
+        ----------
+        filePathFromSrc : str
+            Path to the folder where file is in dest_dir folder from src
+        filenameNoExt : str
+            Filename with no extension
+        """
+
+        if filenameNoExt == "index":
+            htmlPath = os.path.normpath(filePathFromSrc)
+        else:
+            htmlPath = os.path.normpath(os.path.join(
+                filePathFromSrc, filenameNoExt
+            ))
+        jsPath = '/'.join(htmlPath.split(os.path.sep))
+        self.index_routes.pop(jsPath, None)
+
+    def __addRoutesForFile(self, filepath):
+        """Adds the route for a source HTML file to self.index_routes, the
+        entry point is served by App and doesn't get a route.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source HTML file
+        """
+
+        if filepath == os.path.join(self.src_dir, 'index.html'):
+            return
+
+        filePathFromSrc, filename = self.get_path_from_src(filepath)
+        filenameWithNoExtension, _ = os.path.splitext(filename)
+        self.__addRoutesToIndexLinkArray(
+            filePathFromSrc, filenameWithNoExtension
+        )
+
+    def __removeRoutesForFile(self, filepath):
+        """Removes the route of a deleted source HTML file from
+        self.index_routes.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source HTML file
+        """
+
+        if filepath == os.path.join(self.src_dir, 'index.html'):
+            return
+
+        filePathFromSrc, filename = self.get_path_from_src(filepath)
+        filenameWithNoExtension, _ = os.path.splitext(filename)
+        self.__removeRoutesFromIndexLinkArray(
+            filePathFromSrc, filenameWithNoExtension
+        )
+
+    def get_prerender_routes(self):
+        """Gets the pages to be prerendered after a build, the entry point
+        followed by every route in index.js.
+
+        Returns
+        -------
+        list
+            Dicts with the path of every route and the module of its page
+            relative to the React src directory
+        """
+
+        routes = [{"path": "/", "module": "./App"}]
+        for link, path in self.index_routes.items():
+            routes.append({"path": "/" + link, "module": path})
+        return routes
+
+    def transpileFile(self, filepath, prettify=True):
         """Transpiles the source HTML file given at the given filepath
         to a React code, which is then copied over to the React build
         directory, if not HTML file then get's copied directly.
@@ -782,6 +1437,15 @@ class Transpiler:
         ----------
         filepath : str
             Path to the source HTML file which is to be transpiled
+        prettify : bool, optional
+            Runs prettier on the generated React file if True, set to False
+            when formatting is batched by the caller, default True
+
+        Returns
+        -------
+        str
+            Path to the generated React file, or to the copy for non HTML
+            files
 
         Raises
         ------
@@ -789,22 +1453,53 @@ class Transpiler:
             Raised if the source html file is not found
         """
 
-        filePathFromSrc, _ = os.path.split(filepath[filepath.find('src') + 4:])
-        _, filename = os.path.split(filepath)
+        with self.lock:
+            return self.__transpileFile(filepath, prettify)
+
+    def __transpileFile(self, filepath, prettify):
+        """Transpiles or copies a single file, see transpileFile.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source file
+        prettify : bool
+            Runs prettier on the generated React file if True
+
+        Returns
+        -------
+        str
+            Path to the generated React file, or to the copy
+        """
+
+        filePathFromSrc, filename = self.get_path_from_src(filepath)
         filenameWithNoExtension, file_extension = os.path.splitext(filename)
 
         if file_extension != ".html":
             dest_filepath = os.path.join(
                 self.dest_dir, 'src', filePathFromSrc, filename
             )
-            if self.verbose:
+            with self.profiler.phase("sync static", filepath):
+                os.makedirs(os.path.dirname(dest_filepath), exist_ok=True)
+                copied = self.output_writer.copy(
+                    filepath,
+                    dest_filepath,
+                    mode=self.static_sync_mode,
+                    check=self.static_sync_check
+                )
+            if self.progress is not None:
+                self.progress.file_done(
+                    filepath,
+                    os.path.getsize(filepath),
+                    TranspileProgress.COPIED if copied
+                    else TranspileProgress.SKIPPED
+                )
+            elif self.verbose:
                 print(
-                    "Copying file " + str(filepath) +
-                    " -> " + str(dest_filepath)
+                    ("Copying file " if copied else "Unchanged file ") +
+                    str(filepath) + " -> " + str(dest_filepath)
                 )
-            os.makedirs(os.path.dirname(dest_filepath), exist_ok=True)
-            copy_file(filepath, dest_filepath)
-            return
+            return dest_filepath
 
         if not os.path.isfile(filepath):
             raise RuntimeError("{} file not found".format(filepath))
@@ -827,45 +1522,208 @@ class Transpiler:
             self.dest_dir, 'src', filePathFromSrc, filename
         )
 
-        if self.verbose:
+        if self.verbose and self.progress is None:
             print(
                 "Transpiling file " + str(filepath) +
                 " -> " + str(dest_filepath)
             )
 
-        with open(filepath, 'r') as index:
-            soup = BeautifulSoup(index, self.parser)
+        with self.profiler.phase("transpile file", filepath):
+            with self.profiler.phase("parse"):
+                with open(filepath, 'r') as index:
+                    soup = BeautifulSoup(index, self.parser)
 
-        # Remove all comments
-        comments = soup.findAll(text=lambda text: isinstance(text, Comment))
-        [comment.extract() for comment in comments]
+            # Remove all comments
+            with self.profiler.phase("strip comments"):
+                comments = soup.findAll(
+                    text=lambda text: isinstance(text, Comment)
+                )
+                [comment.extract() for comment in comments]
 
-        os.makedirs(os.path.dirname(dest_filepath), exist_ok=True)
-        with open(dest_filepath, 'w') as outfile:
+            os.makedirs(os.path.dirname(dest_filepath), exist_ok=True)
             file_content = self.__generateReactFileContent(
                 soup,
                 filenameWithNoExtension.capitalize(),
                 filePathFromSrc
             )
-            outfile.write(file_content)
-
-        NodeWrapper().prettify(path=dest_filepath)
+            self.__writeReactFile(dest_filepath, file_content, prettify)
+        self.__recordLinkDependencies(filepath, self.__probed_paths)
 
         if not is_entry_point:
             self.__addRoutesToIndexLinkArray(
                 filePathFromSrc, filenameWithNoExtension
             )
 
-    def transpile_project(self, copy_static=True):
+        if self.progress is not None:
+            self.progress.file_done(
+                filepath, os.path.getsize(filepath), TranspileProgress.PAGE
+            )
+
+        return dest_filepath
+
+    def __finishBuild(self, manifest, dest_filepaths, file_states,
+                      batch_prettify):
+        """Records the transpiled files in the build manifest, rebuilds
+        index.js, formats the generated files and saves the manifest.
+
+        Parameters
+        ----------
+        manifest : BuildManifest
+            Build manifest of the run
+        dest_filepaths : dict
+            Paths of the transpiled files mapped to their outputs
+        file_states : dict
+            Paths of the transpiled files mapped to their state
+        batch_prettify : bool
+            Formats the generated files with a single prettier run if True
+        """
+
+        for filepath, dest_filepath in dest_filepaths.items():
+            manifest.record(
+                filepath,
+                file_states[filepath],
+                [dest_filepath],
+                probes=self.link_dependencies.get(filepath, {})
+            )
+
+        with self.profiler.phase("index.js"):
+            self.__rebuildIndexJs(prettify=not batch_prettify)
+            if self.prefetch_links:
+                self.__rebuildPrefetchJs(prettify=not batch_prettify)
+
+        # Only the files written need formatting, unchanged ones are kept
+        generated_files = list(self.output_writer.pending)
+        formatted = True
+        if batch_prettify and generated_files:
+            if self.verbose:
+                print("Formatting {} files...".format(len(generated_files)))
+            start = time.perf_counter()
+            with self.profiler.phase("prettier"):
+                formatted = self.npm.prettify_files(generated_files)
+            self.__addNodeTime(start)
+
+        # Unformatted outputs must not be skipped by the next run
+        if formatted:
+            with self.profiler.phase("save manifest"):
+                self.output_writer.mark_formatted(generated_files)
+                manifest.save()
+
+    def __scanSources(self, manifest, copy_static):
+        """Builds the source index with a single scan of src_dir, which
+        links are resolved against later on, and finds the files changed
+        since the last run. Files matching ignore_rules are left out.
+
+        Parameters
+        ----------
+        manifest : BuildManifest
+            Build manifest of the last run
+        copy_static : bool
+            Includes non .html files if True
+
+        Returns
+        -------
+        tuple
+            List of the paths of the files in the project, in walk order,
+            and dict of the changed ones mapped to their current state
+        """
+
+        self.source_index = SourceIndex(self.src_dir, self.ignore_rules)
+
+        filepaths = []
+        changed_files = {}
+        for filepath in self.source_index.scan():
+            _, filename = os.path.split(filepath)
+            _, file_extension = os.path.splitext(filename)
+            if file_extension == ".html" or copy_static:
+                filepaths.append(filepath)
+                state = manifest.get_file_state(filepath)
+                if not manifest.is_unchanged(
+                    filepath, state, isfile=self.source_index.isfile
+                ):
+                    changed_files[filepath] = state
+
+        return filepaths, changed_files
+
+    def __transpileParallel(self, changed_files, jobs):
+        """Transpiles files in worker processes, links probed, phases
+        profiled and progress made in the workers are merged back.
+
+        Parameters
+        ----------
+        changed_files : dict
+            Paths of the files to be transpiled
+        jobs : int
+            Number of worker processes
+
+        Returns
+        -------
+        dict
+            Paths of the transpiled files mapped to their outputs
+        """
+
+        # Chunks keep the number of times the transpiler gets pickled low,
+        # routes are added afterwards in the same order as a serial run.
+        changed_list = list(changed_files)
+        chunk_size = len(changed_list) // (jobs * 4) + 1
+        chunks = [
+            changed_list[i:i + chunk_size]
+            for i in range(0, len(changed_list), chunk_size)
+        ]
+
+        dest_filepaths = {}
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            chunk_results = executor.map(
+                _transpile_files, [self] * len(chunks), chunks
+            )
+            for chunk, (results, events, progress, writer) in zip(
+                    chunks, chunk_results):
+                self.profiler.add_events(events)
+                self.output_writer.merge(writer)
+                if progress is not None:
+                    self.progress.merge(progress)
+                for filepath, result in zip(chunk, results):
+                    dest_filepath, probed_paths = result
+                    dest_filepaths[filepath] = dest_filepath
+                    if probed_paths is not None:
+                        self.__recordLinkDependencies(filepath, probed_paths)
+        return dest_filepaths
+
+    def transpile_project(self, copy_static=True, jobs=1, force=False):
         """Runs initial checks like ensuring the source
         directories exist, and the source file is present.
         After that, copies non html files and transpiles the source.
+        Generated React files are formatted with a single batched prettier
+        run at the end, or one by one by the prettier worker if attached.
+
+        Files which are unchanged since the last run, according to the build
+        manifest, are skipped. Pages are transpiled again if any path they
+        link to appeared or disappeared.
+        Outputs are written through output_writer, files which would be
+        written with the same content are left untouched so the development
+        server doesn't recompile them.
+
+        In verbose mode the progress is reported with files done, throughput
+        and ETA, followed by a summary of the run.
+
+        The transpiler lock is held for the whole run. If cancel_event gets
+        set the run stops before the next file and the build manifest isn't
+        saved, so the next run picks up the files which were left out.
 
         Parameters
         ----------
         copy_static : bool, optional
             Will copy non .html files if True, only .html files will be
             transpiled if False, default True
+        jobs : int, optional
+            Number of processes used to transpile files, 0 uses all
+            available cores, default 1 i.e. transpile in this process
+        force : bool, optional
+            Transpiles every file ignoring the build manifest, default False
+
+        Returns
+        -------
+        bool
+            True if the run completed, False if it was cancelled
 
         Raises
         ------
@@ -881,16 +1739,271 @@ class Transpiler:
                 str(entry_point_html)
             )
 
-        if self.verbose:
-            print("Transpiling files...")
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+
+        with self.lock:
+            if self.verbose:
+                print("Transpiling files...")
+                self.progress = TranspileProgress()
+
+            try:
+                completed = self.__transpileProject(copy_static, jobs, force)
+            finally:
+                if self.progress is not None:
+                    self.progress.close()
+                self.progress = None
+
+        if not completed and self.verbose:
+            print("Build cancelled")
+        return completed
+
+    def __transpileProject(self, copy_static, jobs, force):
+        """Transpiles the changed files and rebuilds index.js, see
+        transpile_project.
+
+        Parameters
+        ----------
+        copy_static : bool
+            Will copy non .html files if True
+        jobs : int
+            Number of processes used to transpile files
+        force : bool
+            Transpiles every file ignoring the build manifest
+
+        Returns
+        -------
+        bool
+            True if the run completed, False if it was cancelled
+        """
+
+        manifest = BuildManifest(self.manifest_path, self.__getFingerprint())
+        if force:
+            manifest.entries = {}
+        self.output_writer = OutputWriter(manifest.generated)
 
-        for filepath in glob.iglob(self.src_dir + '**/**', recursive=True):
-            if os.path.isfile(filepath):
-                _, filename = os.path.split(filepath)
-                _, file_extension = os.path.splitext(filename)
-                if file_extension == ".html" or copy_static:
-                    self.transpileFile(
+        with self.profiler.phase("scan"):
+            filepaths, changed_files = self.__scanSources(
+                manifest, copy_static
+            )
+        if self.progress is not None:
+            unchanged_pages = sum(
+                1 for filepath in filepaths
+                if filepath not in changed_files and filepath.endswith(".html")
+            )
+            self.progress.start(
+                len(changed_files),
+                sum(state["size"] for state in changed_files.values()),
+                unchanged_pages=unchanged_pages,
+                unchanged_static=(
+                    len(filepaths) - len(changed_files) - unchanged_pages
+                )
+            )
+
+        # The worker formats files in memory, no need to batch npx calls
+        batch_prettify = self.prettier_worker is None or jobs > 1
+        dest_filepaths = {}
+
+        with self.profiler.phase("transpile"):
+            if jobs > 1 and changed_files:
+                dest_filepaths = self.__transpileParallel(changed_files, jobs)
+
+            for filepath in filepaths:
+                if self.__isCancelled():
+                    return False
+                if filepath in changed_files and \
+                        filepath not in dest_filepaths:
+                    dest_filepaths[filepath] = self.transpileFile(
+                        filepath,
+                        prettify=not batch_prettify
+                    )
+                elif filepath.endswith(".html"):
+                    self.__addRoutesForFile(filepath)
+                    if filepath not in changed_files:
+                        self.__recordLinkDependencies(
+                            filepath, manifest.entries[filepath]["probes"]
+                        )
+
+        if self.progress is not None:
+            self.progress.close()
+        if self.__isCancelled():
+            return False
+
+        self.__finishBuild(
+            manifest, dest_filepaths, changed_files, batch_prettify
+        )
+        self.__project_transpiled = True
+
+        if self.progress is not None:
+            self.progress.summary(
+                routes=len(self.index_routes) + 1,
+                writes_skipped=self.output_writer.skipped
+            )
+        return True
+
+    def __removeDeletedFiles(self, manifest, deleted):
+        """Forgets the routes, link dependencies and manifest entries of
+        deleted files, see update_files. Deleted files are looked up in
+        the state kept in memory as well, pages transpiled by a cancelled
+        update or a run whose formatting failed aren't in the saved
+        manifest.
+
+        Parameters
+        ----------
+        manifest : BuildManifest
+            Build manifest of the run
+        deleted : iterable
+            Paths to the files or directories deleted
+
+        Returns
+        -------
+        list
+            Paths of the source files which were removed
+        """
+
+        known_files = set(manifest.entries)
+        known_files.update(self.link_dependencies)
+        known_files.update(self.__unfinished_files)
+
+        removed = []
+        for path in deleted:
+            prefix = os.path.join(path, '')
+            filepaths = sorted(
+                filepath for filepath in known_files
+                if filepath == path or filepath.startswith(prefix)
+            )
+            self.source_index.remove(path)
+            for filepath in filepaths:
+                if filepath.endswith(".html"):
+                    self.__removeRoutesForFile(filepath)
+                self.__recordLinkDependencies(filepath, {})
+                del self.link_dependencies[filepath]
+                self.__unfinished_files.discard(filepath)
+                manifest.remove(filepath)
+            removed.extend(filepaths)
+        return removed
+
+    def __findChangedFiles(self, manifest, changed, created):
+        """Finds the files to be transpiled among the changed paths, see
+        update_files.
+
+        Parameters
+        ----------
+        manifest : BuildManifest
+            Build manifest of the run
+        changed : iterable
+            Paths to the files or directories created or modified
+        created : list
+            Paths of the files missing from the manifest are appended to it
+
+        Returns
+        -------
+        dict
+            Paths of the changed files mapped to their current state
+        """
+
+        changed_files = {}
+        for path in changed:
+            self.source_index.add(path)
+            if os.path.isdir(path):
+                filepaths = self.ignore_rules.walk(path)
+            elif os.path.isfile(path) and \
+                    not self.ignore_rules.is_ignored(path, is_dir=False):
+                filepaths = [path]
+            else:
+                filepaths = []
+            for filepath in filepaths:
+                state = manifest.get_file_state(filepath)
+                if not manifest.is_unchanged(
+                    filepath, state, isfile=self.source_index.isfile
+                ):
+                    changed_files[filepath] = state
+                if filepath not in manifest.entries:
+                    created.append(filepath)
+        return changed_files
+
+    def __addDependentPages(self, manifest, touched, changed_files):
+        """Adds the pages linking to created or deleted files to
+        changed_files, if the link switches between internal and external.
+
+        Parameters
+        ----------
+        manifest : BuildManifest
+            Build manifest of the run
+        touched : list
+            Paths of the files created or deleted
+        changed_files : dict
+            Paths of the files to be transpiled mapped to their state
+        """
+
+        for path in touched:
+            path = os.path.normpath(path)
+            exists = self.source_index.isfile(path)
+            for page in self.get_dependent_pages(path):
+                if page not in changed_files and \
+                        self.link_dependencies[page][path] != exists:
+                    changed_files[page] = manifest.get_file_state(page)
+
+    def update_files(self, changed=(), deleted=()):
+        """Updates the React project for files created, modified or deleted
+        since the last run, without scanning and checking the whole project
+        like transpile_project. Routes of created and deleted pages are
+        added to or removed from index.js, which is rebuilt if they changed.
+        Pages are transpiled again only if a link they have to a created or
+        deleted file switches between internal and external.
+
+        The first call runs transpile_project, which sets up the routes and
+        the link dependencies this relies on.
+
+        Parameters
+        ----------
+        changed : iterable, optional
+            Paths to the files or directories created or modified
+        deleted : iterable, optional
+            Paths to the files or directories deleted, their outputs are
+            left to the caller
+
+        Returns
+        -------
+        bool
+            True if the update completed, False if it was cancelled
+        """
+
+        with self.lock:
+            if not self.__project_transpiled:
+                return self.transpile_project()
+
+            manifest = BuildManifest(
+                self.manifest_path, self.__getFingerprint()
+            )
+            self.output_writer = OutputWriter(manifest.generated)
+
+            touched = self.__removeDeletedFiles(manifest, deleted)
+            changed_files = self.__findChangedFiles(manifest, changed, touched)
+
+            # Files a cancelled update already went through but didn't save
+            for filepath in self.__unfinished_files:
+                if filepath not in changed_files and \
+                        os.path.isfile(filepath):
+                    changed_files[filepath] = manifest.get_file_state(
                         filepath
                     )
 
-        self.__rebuildIndexJs()
+            self.__addDependentPages(manifest, touched, changed_files)
+
+            # The worker formats files in memory, no need to batch npx calls
+            batch_prettify = self.prettier_worker is None
+            dest_filepaths = {}
+            for filepath in changed_files:
+                if self.__isCancelled():
+                    self.__unfinished_files.update(changed_files)
+                    return False
+                dest_filepaths[filepath] = self.transpileFile(
+                    filepath, prettify=not batch_prettify
+                )
+
+            self.__finishBuild(
+                manifest, dest_filepaths, changed_files, batch_prettify
+            )
+            self.__unfinished_files = set()
+            return True
@@ -2,7 +2,6 @@ import _thread
 import os
 import shutil
 import sys
-from distutils.dir_util import copy_tree
 from threading import Thread
 
 import click
@@ -10,38 +9,11 @@ import click
 from .Config import Config
 from .Constants import DEFAULTS
 from .Helpers import create_dir
-from .NodeWrapper import NodeWrapper
-from .ReactoniteWatcher import ReactoniteWatcher
-from .Transpiler import Transpiler
 
 from reactonite import __version__
-from flask import Flask, request, make_response, jsonify
-from flask_cors import CORS
 
-from .CreateHtmlCss import saveCss, saveHtml
-
-app = Flask(__name__)
-CORS(app)
-
-
-@app.route('/grapesjs', methods=['POST'])
-def fetchCodeFromGrapesjs():
-    if request.method == 'POST':
-        try:
-            CONSTANTS = DEFAULTS()
-
-            src_dir = CONSTANTS.SRC_DIR
-
-            saveCss(request.form['css'], src_dir)
-            saveHtml(request.form['html'], src_dir)
-
-            data = {'Status': 'Data Received Successfully'}
-            return make_response(jsonify(data), 200)
-        except Exception as e:
-            print('Error in handling POST Request - ', e)
-            data = {'Status': 'Error in Handling POST Request',
-                    'Error': str(e)}
-            return make_response(jsonify(data), 550)
+# Commands import the modules they need, the transpiler, watcher and GUI
+# pull in bs4, watchdog and Flask which would slow down every invocation.
 
 
 @click.group()
@@ -53,6 +25,40 @@ def cli(ctx):
     pass
 
 
+def profile_options(command):
+    """Adds the --profile and --trace options to a command."""
+
+    command = click.option(
+        '--trace', type=click.Path(dir_okay=False),
+        help='Write a Chrome trace of the phases to this file, implies '
+             '--profile.'
+    )(command)
+    return click.option(
+        '--profile', is_flag=True,
+        help='Print the wall and CPU time of every phase and the slowest '
+             'files.'
+    )(command)
+
+
+def report_profile(profiler, trace=None):
+    """Prints the summary of a profiler and writes its Chrome trace.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        Profiler to report, nothing is done if it's disabled
+    trace : str, optional
+        Path of the trace file to be written, defaults to None
+    """
+
+    if not profiler.enabled:
+        return
+    print(profiler.format_summary())
+    if trace:
+        profiler.write_chrome_trace(trace)
+        print("Wrote trace to " + trace)
+
+
 @cli.command()
 @click.argument('project-name')
 def create_project(project_name):
@@ -72,6 +78,8 @@ def create_project(project_name):
         If project name is invalid.
     """
 
+    from .Transpiler import Transpiler
+
     CONSTANTS = DEFAULTS()
 
     project_dir = os.path.join(".", project_name)
@@ -111,7 +119,7 @@ def create_project(project_name):
     # Initial setup of project/src directory
     package_path = os.path.dirname(sys.modules[__name__].__file__)
     init_src_dir_path = os.path.join(package_path, CONSTANTS.INIT_FILES_DIR)
-    copy_tree(init_src_dir_path, src_dir)
+    shutil.copytree(init_src_dir_path, src_dir)
 
     # Move .gitignore to outerlayer
     gitignore_src = os.path.join(src_dir, '.gitignore')
@@ -134,7 +142,12 @@ def create_project(project_name):
 
 @cli.command()
 @click.option('--verbose', '-v', is_flag=True)
-def transpile_project(verbose):
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=0),
+              help='Number of processes to transpile with, 0 uses all cores.')
+@click.option('--force', '-f', is_flag=True,
+              help='Transpile all files, even if unchanged since last run.')
+@profile_options
+def transpile_project(verbose, jobs, force, profile, trace):
     """Command for transpiling a Reactonite project built using
     create-project commandline.
 
@@ -142,6 +155,14 @@ def transpile_project(verbose):
     ----------
     verbose : bool, optional
         Verbosity of the command
+    jobs : int, optional
+        Number of processes used to transpile files, 0 uses all cores
+    force : bool, optional
+        Transpile all files ignoring the build manifest
+    profile : bool, optional
+        Prints the time spent in every phase and the slowest files
+    trace : str, optional
+        Writes a Chrome trace of the phases to this path
 
     Raises
     ------
@@ -149,6 +170,9 @@ def transpile_project(verbose):
         If config.json file doesn't exist.
     """
 
+    from .Profiler import Profiler
+    from .Transpiler import Transpiler
+
     CONSTANTS = DEFAULTS()
     config_file = CONSTANTS.CONFIG_FILE_NAME
     config_settings = Config(config_file, load=True)
@@ -158,15 +182,27 @@ def transpile_project(verbose):
         props_map=CONSTANTS.PROPS_MAP,
         verbose=verbose
     )
-    transpiler.transpile_project()
+    transpiler.profiler = Profiler(enabled=profile or bool(trace))
+    transpiler.transpile_project(jobs=jobs, force=force)
+    report_profile(transpiler.profiler, trace)
 
 
 @cli.command()
-def start():
+@profile_options
+def start(profile, trace):
     """Command to start realtime development transpiler for Reactonite. It
     starts react development server in a seperate thread as well and watches
     for changes in project directory and transpiles codebase.
 
+    Parameters
+    ----------
+    profile : bool, optional
+        Prints the time spent in every phase and the slowest files after
+        the initial transpile and when the watcher stops
+    trace : str, optional
+        Writes a Chrome trace of the phases to this path when the watcher
+        stops
+
     Raises
     ------
     FileNotFoundError
@@ -175,6 +211,10 @@ def start():
         If ReactJs development thread is not able to start
     """
 
+    from .Profiler import Profiler
+    from .ReactoniteWatcher import ReactoniteWatcher
+    from .Transpiler import Transpiler
+
     CONSTANTS = DEFAULTS()
     config_file = CONSTANTS.CONFIG_FILE_NAME
     config_settings = Config(config_file, load=True)
@@ -185,10 +225,16 @@ def start():
         props_map=CONSTANTS.PROPS_MAP,
         verbose=True
     )
+    profiler = Profiler(enabled=profile or bool(trace))
+    transpiler.profiler = profiler
     transpiler.transpile_project()
+    report_profile(profiler)
 
-    npm = NodeWrapper()
-    watcher = ReactoniteWatcher(config_settings.get_config())
+    # Reused so the first rebuild is incremental instead of a full run
+    npm = transpiler.npm
+    watcher = ReactoniteWatcher(
+        config_settings.get_config(), transpiler=transpiler
+    )
 
     try:
         _thread.start_new_thread(npm.start, (os.path.join(".", dest_dir),))
@@ -197,6 +243,7 @@ def start():
 
     # Starting Watcher
     watcher.start()
+    report_profile(profiler, trace)
 
 
 @cli.command()
@@ -219,6 +266,11 @@ def gui(project_name):
         If ReactJs development thread is not able to start
     """
 
+    from .GrapesjsServer import create_app
+    from .NodeWrapper import NodeWrapper
+    from .ReactoniteWatcher import ReactoniteWatcher
+    from .Transpiler import Transpiler
+
     CONSTANTS = DEFAULTS()
 
     project_dir = os.path.join(".", project_name)
@@ -258,7 +310,7 @@ def gui(project_name):
     # Initial setup of project/src directory
     package_path = os.path.dirname(sys.modules[__name__].__file__)
     init_src_dir_path = os.path.join(package_path, CONSTANTS.INIT_FILES_DIR)
-    copy_tree(init_src_dir_path, src_dir)
+    shutil.copytree(init_src_dir_path, src_dir)
 
     # Move .gitignore to outerlayer
     gitignore_src = os.path.join(src_dir, '.gitignore')
@@ -305,7 +357,8 @@ def gui(project_name):
     dest_dir = config_settings.get("dest_dir")
 
     npm = NodeWrapper()
-    watcher = ReactoniteWatcher(config_settings.get_config())
+    watcher = ReactoniteWatcher(config_settings.get_config(), npm=npm)
+    app = create_app()
 
     npm.install_grapesjs(os.path.abspath('.'))
 
@@ -340,15 +393,44 @@ def gui(project_name):
 
 
 @cli.command()
-def build():
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=0),
+              help='Number of processes to transpile with, 0 uses all cores.')
+@click.option('--force', '-f', is_flag=True,
+              help='Transpile all files, even if unchanged since last run.')
+@click.option('--prerender', is_flag=True,
+              help='Render every page to static HTML hydrated by React.')
+@click.option('--compress/--no-compress', default=True,
+              help='Write .gz and .br versions of the built assets.')
+@profile_options
+def build(jobs, force, prerender, compress, profile, trace):
     """Command to get a static build of your app after transpilation.
 
+    Parameters
+    ----------
+    jobs : int, optional
+        Number of processes used to transpile files, 0 uses all cores
+    force : bool, optional
+        Transpile all files ignoring the build manifest
+    prerender : bool, optional
+        Writes the rendered markup of every page to build/<route>/index.html
+    compress : bool, optional
+        Writes precompressed versions of the built assets, levels and the
+        minimum file size are set by gzip_level, brotli_level and
+        compress_min_size in config.json
+    profile : bool, optional
+        Prints the time spent in every phase and the slowest files
+    trace : str, optional
+        Writes a Chrome trace of the phases to this path
+
     Raises
     ------
     FileNotFoundError
         If config.json file doesn't exist.
     """
 
+    from .Profiler import Profiler
+    from .Transpiler import Transpiler
+
     CONSTANTS = DEFAULTS()
     config_file = CONSTANTS.CONFIG_FILE_NAME
     config_settings = Config(config_file, load=True)
@@ -358,15 +440,92 @@ def build():
         props_map=CONSTANTS.PROPS_MAP,
         verbose=True
     )
-    transpiler.transpile_project()
+    transpiler.prerender = prerender
+    profiler = Profiler(enabled=profile or bool(trace))
+    transpiler.profiler = profiler
+    transpiler.transpile_project(jobs=jobs, force=force)
 
     dest_dir = config_settings.get("dest_dir")
 
-    npm = NodeWrapper()
-    npm.build(working_dir=dest_dir)
+    with profiler.phase("npm build"):
+        transpiler.npm.build(working_dir=dest_dir)
+
+    if prerender:
+        with profiler.phase("prerender"):
+            transpiler.npm.prerender(
+                transpiler.get_prerender_routes(), working_dir=dest_dir
+            )
 
     # Move build folder to project_dir instead of dest_dir
     npm_build = os.path.join(dest_dir, "build")
     project_build = os.path.join(".", "build")
 
     os.rename(npm_build, project_build)
+
+    if compress:
+        from .Compressor import AssetCompressor
+
+        compressor = AssetCompressor(
+            gzip_level=config_settings.config.get(
+                "gzip_level", CONSTANTS.GZIP_LEVEL
+            ),
+            brotli_level=config_settings.config.get(
+                "brotli_level", CONSTANTS.BROTLI_LEVEL
+            ),
+            min_size=config_settings.config.get(
+                "compress_min_size", CONSTANTS.COMPRESS_MIN_SIZE
+            )
+        )
+        if compressor.brotli_level is not None and \
+                not compressor.BROTLI_AVAILABLE:
+            print("brotli is not installed, skipping .br files. "
+                  "Install it with pip install reactonite[brotli]")
+        with profiler.phase("compress"):
+            written = compressor.compress_dir(project_build)
+        print("Wrote {} precompressed files".format(len(written)))
+
+    report_profile(profiler, trace)
+
+
+@cli.command()
+@click.option('--host', '-h', default='127.0.0.1',
+              help='Address to listen on.')
+@click.option('--port', '-p', default=5000, type=click.IntRange(0, 65535),
+              help='Port to listen on.')
+@click.option('--build-dir', '-d', default='build',
+              type=click.Path(file_okay=False),
+              help='Directory containing the production build.')
+@click.option('--verbose', '-v', is_flag=True, help='Log every request.')
+def serve(host, port, build_dir, verbose):
+    """Command to serve the static build of your app locally, the way a
+    production static host would.
+
+    Parameters
+    ----------
+    host : str, optional
+        Address to listen on, defaults to 127.0.0.1
+    port : int, optional
+        Port to listen on, defaults to 5000
+    build_dir : str, optional
+        Directory containing the production build, defaults to build
+    verbose : bool, optional
+        Logs every request if True
+
+    Raises
+    ------
+    RuntimeError
+        If the build directory doesn't exist.
+    """
+
+    from .StaticServer import BuildServer
+
+    server = BuildServer((host, port), build_dir, verbose=verbose)
+    print("Serving {} at http://{}:{}".format(
+        build_dir, host, server.server_address[1]
+    ))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
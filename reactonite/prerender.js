@@ -0,0 +1,182 @@
+// Prerenders the pages of a React app built by Reactonite to static HTML.
+//
+// Run from the React project directory after `npm run build`, reads
+// {"build_dir": "build", "routes": [{"path": "/about", "module": "./about"}]}
+// from stdin. Every page is rendered with react-dom/server inside a
+// StaticRouter and written into a copy of build/index.html, at
+// build/index.html for "/" and build/<route>/index.html for the others.
+// The client side index.js hydrates this markup.
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const Module = require("module");
+
+const projectDir = process.cwd();
+const srcDir = path.join(projectDir, "src");
+
+function resolveFromProject(name) {
+  return require.resolve(name, { paths: [projectDir] });
+}
+
+// babel-preset-react-app outputs CommonJS for node in the test env
+process.env.BABEL_ENV = "test";
+process.env.NODE_ENV = "production";
+
+const babel = require(resolveFromProject("@babel/core"));
+const presetReactApp = resolveFromProject("babel-preset-react-app");
+
+// Same defaults as the webpack config of react-scripts
+const imageInlineSizeLimit = parseInt(
+  process.env.IMAGE_INLINE_SIZE_LIMIT || "10000",
+  10
+);
+const inlineImageTypes = {
+  ".bmp": "image/bmp",
+  ".gif": "image/gif",
+  ".jpeg": "image/jpeg",
+  ".jpg": "image/jpeg",
+  ".png": "image/png",
+};
+const scriptExtensions = [".js", ".jsx"];
+const styleExtensions = [".css", ".scss", ".sass"];
+
+function readStdin() {
+  return new Promise((resolve, reject) => {
+    let data = "";
+    process.stdin.setEncoding("utf8");
+    process.stdin.on("data", (chunk) => (data += chunk));
+    process.stdin.on("end", () => resolve(data));
+    process.stdin.on("error", reject);
+  });
+}
+
+// Maps "logo.png" to the URL of the hashed file emitted by webpack
+function indexMedia(buildDir, publicUrl) {
+  const media = {};
+  const mediaDir = path.join(buildDir, "static", "media");
+  if (!fs.existsSync(mediaDir)) {
+    return media;
+  }
+  for (const filename of fs.readdirSync(mediaDir)) {
+    const match = /^(.*)\.[0-9a-f]{8,}(\.[^.]+)$/.exec(filename);
+    if (match && !(match[1] + match[2] in media)) {
+      media[match[1] + match[2]] = publicUrl + "/static/media/" + filename;
+    }
+  }
+  return media;
+}
+
+function getAssetUrl(filename, media) {
+  const ext = path.extname(filename).toLowerCase();
+  const size = fs.statSync(filename).size;
+  if (ext in inlineImageTypes && size < imageInlineSizeLimit) {
+    const data = fs.readFileSync(filename).toString("base64");
+    return "data:" + inlineImageTypes[ext] + ";base64," + data;
+  }
+  return media[path.basename(filename)] || "";
+}
+
+function installRequireHook(media) {
+  const defaultLoader = Module._extensions[".js"];
+
+  // Node loads files with unknown extensions, like images, through the
+  // .js loader as well
+  Module._extensions[".js"] = (module, filename) => {
+    const ext = path.extname(filename).toLowerCase();
+    if (styleExtensions.includes(ext)) {
+      module.exports = {};
+    } else if (!scriptExtensions.includes(ext)) {
+      module.exports = {
+        __esModule: true,
+        default: getAssetUrl(filename, media),
+      };
+    } else if (filename.startsWith(srcDir + path.sep)) {
+      const { code } = babel.transformSync(fs.readFileSync(filename, "utf8"), {
+        filename: filename,
+        babelrc: false,
+        configFile: false,
+        presets: [presetReactApp],
+      });
+      module._compile(code, filename);
+    } else {
+      defaultLoader(module, filename);
+    }
+  };
+  for (const ext of styleExtensions) {
+    Module._extensions[ext] = Module._extensions[".js"];
+  }
+}
+
+function renderPage(route, template, libs) {
+  const page = require(path.join(srcDir, route.module));
+  const markup = libs.ReactDOMServer.renderToString(
+    libs.React.createElement(
+      libs.StaticRouter,
+      { location: route.path },
+      libs.React.createElement(page.default || page)
+    )
+  );
+
+  let html = template.replace(
+    /<div id="root"><\/div>/,
+    () => '<div id="root">' + markup + "</div>"
+  );
+
+  if (libs.Helmet) {
+    const head = libs.Helmet.renderStatic();
+    const names = ["base", "meta", "link", "style", "script", "noscript"];
+    // Helmet always renders a title tag, keep the template's if it's empty
+    if (/<title[^>]*>[^<]+<\/title>/.test(head.title.toString())) {
+      html = html.replace(/<title[^>]*>[^<]*<\/title>/, "");
+      names.unshift("title");
+    }
+    const tags = names.map((name) => head[name].toString()).join("");
+    html = html.replace("</head>", () => tags + "</head>");
+  }
+
+  return html;
+}
+
+async function main() {
+  const request = JSON.parse(await readStdin());
+  const buildDir = path.resolve(projectDir, request.build_dir);
+  const template = fs.readFileSync(path.join(buildDir, "index.html"), "utf8");
+  const publicUrl = (process.env.PUBLIC_URL || "").replace(/\/$/, "");
+
+  installRequireHook(indexMedia(buildDir, publicUrl));
+
+  const libs = {
+    React: require(resolveFromProject("react")),
+    ReactDOMServer: require(resolveFromProject("react-dom/server")),
+    StaticRouter: require(resolveFromProject("react-router-dom")).StaticRouter,
+    Helmet: null,
+  };
+  try {
+    libs.Helmet = require(resolveFromProject("react-helmet")).Helmet;
+  } catch (e) {
+    // Pages without a head don't import react-helmet
+  }
+
+  let failed = 0;
+  for (const route of request.routes) {
+    const outputDir = path.join(buildDir, route.path);
+    const output = path.join(outputDir, "index.html");
+    try {
+      const html = renderPage(route, template, libs);
+      fs.mkdirSync(outputDir, { recursive: true });
+      fs.writeFileSync(output, html);
+      console.log("Prerendered " + route.path);
+    } catch (err) {
+      failed += 1;
+      console.error("Failed to prerender " + route.path + ": " + err.stack);
+    }
+  }
+
+  process.exit(failed ? 1 : 0);
+}
+
+main().catch((err) => {
+  console.error(err.stack || String(err));
+  process.exit(1);
+});
@@ -0,0 +1,71 @@
+// Long-lived prettier process used by Reactonite in watch mode.
+//
+// Reads newline delimited JSON requests of the form
+// {"id": 1, "filepath": "...", "source": "..."} from stdin and writes
+// {"id": 1, "formatted": "..."} or {"id": 1, "error": "..."} to stdout.
+// Extra arguments are used as additional directories to resolve prettier
+// from.
+"use strict";
+
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+
+function loadPrettier() {
+  const searchPaths = [process.cwd()].concat(process.argv.slice(2));
+  try {
+    return require(require.resolve("prettier", { paths: searchPaths }));
+  } catch (e) {
+    // Fall through to the packages installed by npx
+  }
+
+  // npx puts the bin folder of the packages it installed on PATH
+  const dirs = (process.env.PATH || "").split(path.delimiter);
+  for (const dir of dirs) {
+    if (path.basename(dir) !== ".bin") {
+      continue;
+    }
+    const candidate = path.join(dir, "..", "prettier");
+    if (fs.existsSync(path.join(candidate, "package.json"))) {
+      return require(candidate);
+    }
+  }
+  return null;
+}
+
+function send(message) {
+  process.stdout.write(JSON.stringify(message) + "\n");
+}
+
+const prettier = loadPrettier();
+if (!prettier) {
+  send({ error: "prettier not found" });
+  process.exit(1);
+}
+send({ ready: true, version: prettier.version });
+
+const lines = readline.createInterface({ input: process.stdin });
+
+lines.on("line", (line) => {
+  let request;
+  try {
+    request = JSON.parse(line);
+  } catch (e) {
+    send({ error: "invalid request" });
+    return;
+  }
+
+  Promise.resolve(prettier.resolveConfig(request.filepath))
+    .then((config) =>
+      prettier.format(
+        request.source,
+        Object.assign({}, config, { filepath: request.filepath })
+      )
+    )
+    .then(
+      (formatted) => send({ id: request.id, formatted: formatted }),
+      (err) => send({ id: request.id, error: String((err && err.message) || err) })
+    );
+});
+
+lines.on("close", () => process.exit(0));
@@ -16,12 +16,15 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/SDOS2020/Team_3_Reactonite",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks", "tests"]),
     include_package_data=True,
     classifiers=[
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.6',
-    install_requires=REQUIREMENTS
+    install_requires=REQUIREMENTS,
+    extras_require={
+        "brotli": ["brotli"]
+    }
 )
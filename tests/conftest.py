@@ -0,0 +1,75 @@
+import os
+
+import pytest
+from reactonite.Helpers import create_dir
+from reactonite.Transpiler import Transpiler
+
+from file_vars import minimal_working_example
+
+
+class Project:
+    """Reactonite project in a temporary directory, with src, dest/src and
+    an empty dest/src/index.js, as create-project leaves them."""
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.src_dir = os.path.join(base_dir, "src")
+        self.dest_dir = os.path.join(base_dir, "dest")
+        self.index_js = os.path.join(self.dest_dir, "src", "index.js")
+        self.config = {
+            "src_dir": self.src_dir,
+            "dest_dir": self.dest_dir,
+            "project_name": "test-project"
+        }
+
+        create_dir(self.src_dir)
+        create_dir(os.path.join(self.dest_dir, "src"))
+        open(self.index_js, 'a').close()
+
+    def write(self, path, content=minimal_working_example):
+        """Writes a file in src_dir, minimal_working_example by default,
+        and returns its path."""
+
+        filepath = os.path.join(self.src_dir, path)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w') as file:
+            file.write(content)
+        return filepath
+
+    def dest_path(self, *parts):
+        """Path of a file generated in dest_dir/src."""
+
+        return os.path.join(self.dest_dir, "src", *parts)
+
+
+@pytest.fixture
+def make_project(monkeypatch):
+    """Creates projects in the given directories, generated files are not
+    formatted since prettier isn't available in tests."""
+
+    monkeypatch.setattr(
+        "reactonite.NodeWrapper.NodeWrapper.prettify_files",
+        lambda self, paths, **kwargs: True
+    )
+    return Project
+
+
+@pytest.fixture
+def project(make_project, tmp_path):
+    return make_project(str(tmp_path))
+
+
+@pytest.fixture
+def transpiled(monkeypatch):
+    """Names of the files passed to Transpiler.transpileFile in this
+    process, in order."""
+
+    names = []
+    original_transpileFile = Transpiler.transpileFile
+
+    def tracking_transpileFile(self, filepath, prettify=True):
+        names.append(os.path.basename(filepath))
+        return original_transpileFile(self, filepath, prettify=prettify)
+
+    monkeypatch.setattr(Transpiler, "transpileFile", tracking_transpileFile)
+    return names
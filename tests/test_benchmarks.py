@@ -0,0 +1,36 @@
+import os
+
+from benchmarks.runner import compare_results, run_benchmarks
+from benchmarks.sitegen import SiteGenerator
+
+
+def test_site_generator(tmp_path):
+    src_dir = os.path.join(str(tmp_path), "src")
+    generator = SiteGenerator(pages=20, links_per_page=3, depth=2, seed=1)
+    filepaths = generator.generate(src_dir)
+
+    assert len(filepaths) == 20
+    assert filepaths[0] == os.path.join(src_dir, "index.html")
+    assert generator.get_page_paths() == \
+        SiteGenerator(pages=20, depth=2, seed=1).get_page_paths()
+    with open(filepaths[-1]) as file:
+        assert file.read().count('class="link"') == 3
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(sizes=[5], repeat=1, links_per_page=2)
+    benchmarks = results["results"]["5"]
+    assert set(benchmarks) == {
+        "getReactMap", "transpileFile", "transpile_project_cold",
+        "transpile_project_warm", "index_js"
+    }
+    assert results["meta"]["site"] == {"links_per_page": 2}
+
+    slower = {"results": {"5": {
+        name: {"min": timings["min"] * 2}
+        for name, timings in benchmarks.items()
+    }}}
+    assert all(regression for _, _, _, regression
+               in compare_results(slower, results))
+    assert not any(regression for _, _, _, regression
+                   in compare_results(results, slower))
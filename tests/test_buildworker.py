@@ -0,0 +1,81 @@
+import threading
+
+from reactonite.BuildWorker import BuildWorker
+
+
+class BlockingBuild:
+    """Build which waits to be released, recording what it was given."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.builds = []
+
+    def __call__(self, changes, cancel_event):
+        self.builds.append(dict(changes))
+        self.started.set()
+        self.release.wait(5)
+        return not cancel_event.is_set()
+
+
+def test_build_worker_merges_queued_requests():
+    build = BlockingBuild()
+    worker = BuildWorker(build)
+    worker.start()
+    try:
+        worker.submit({"src/a.html": "changed"})
+        assert build.started.wait(5)
+        # Queued while the first build runs, built together afterwards
+        worker.submit({"src/b.html": "changed"})
+        worker.submit({"src/c.html": "changed", "src/b.html": "deleted"})
+        build.release.set()
+        assert worker.wait_idle(5)
+    finally:
+        worker.stop()
+
+    assert build.builds == [
+        {"src/a.html": "changed"},
+        {"src/b.html": "deleted", "src/c.html": "changed"}
+    ]
+    assert worker.builds == 2
+
+
+def test_build_worker_cancels_stale_build():
+    build = BlockingBuild()
+    worker = BuildWorker(build)
+    worker.start()
+    try:
+        worker.submit({"src/a.html": "changed", "src/b.html": "changed"})
+        assert build.started.wait(5)
+        # Newer changes to a file being built supersede the running build
+        worker.submit({"src/a.html": "deleted"})
+        build.release.set()
+        assert worker.wait_idle(5)
+    finally:
+        worker.stop()
+
+    assert build.builds == [
+        {"src/a.html": "changed", "src/b.html": "changed"},
+        {"src/b.html": "changed", "src/a.html": "deleted"}
+    ]
+
+
+def test_build_worker_survives_failed_build():
+    calls = []
+
+    def build(changes, cancel_event):
+        calls.append(changes)
+        if len(calls) == 1:
+            raise RuntimeError("broken page")
+        return True
+
+    worker = BuildWorker(build)
+    worker.start()
+    try:
+        worker.submit({"src/a.html": "changed"})
+        assert worker.wait_idle(5)
+        worker.submit({"src/b.html": "changed"})
+        assert worker.wait_idle(5)
+    finally:
+        worker.stop()
+    assert len(calls) == 2
@@ -0,0 +1,56 @@
+import gzip
+import os
+
+import pytest
+from reactonite.Compressor import AssetCompressor
+
+
+def write(path, content):
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+def test_compress_dir(tmp_path):
+    build_dir = str(tmp_path)
+    os.makedirs(os.path.join(build_dir, "static", "js"))
+    main_js = os.path.join(build_dir, "static", "js", "main.js")
+    write(main_js, "console.log('reactonite');\n" * 200)
+    write(os.path.join(build_dir, "small.css"), "p { color: red; }")
+    write(os.path.join(build_dir, "logo.png"), "x" * 4096)
+
+    compressor = AssetCompressor(gzip_level=6, brotli_level=None,
+                                 min_size=1024)
+    assert compressor.compress_dir(build_dir) == [main_js + ".gz"]
+    assert not os.path.exists(main_js + ".br")
+    with gzip.open(main_js + ".gz", 'rt') as file:
+        assert file.read() == "console.log('reactonite');\n" * 200
+
+    # Up to date files are not compressed again
+    assert compressor.compress_dir(build_dir) == []
+
+
+def test_compress_file_not_smaller(tmp_path):
+    path = os.path.join(str(tmp_path), "random.js")
+    with open(path, 'wb') as file:
+        file.write(os.urandom(2048))
+
+    compressor = AssetCompressor(brotli_level=None)
+    assert compressor.compress_file(path) == []
+    assert not os.path.exists(path + ".gz")
+
+
+def test_compress_brotli(tmp_path):
+    brotli = pytest.importorskip("brotli")
+    path = os.path.join(str(tmp_path), "index.html")
+    write(path, "<p>reactonite</p>" * 200)
+
+    compressor = AssetCompressor(gzip_level=None, brotli_level=5)
+    assert compressor.compress_file(path) == [path + ".br"]
+    with open(path + ".br", 'rb') as file:
+        assert brotli.decompress(file.read()) == \
+            ("<p>reactonite</p>" * 200).encode()
+
+
+def test_compress_invalid_level():
+    with pytest.raises(RuntimeError):
+        AssetCompressor(gzip_level=10)
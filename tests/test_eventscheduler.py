@@ -0,0 +1,78 @@
+import threading
+import time
+
+from reactonite.EventScheduler import EventScheduler
+
+
+def test_event_scheduler_collapses_events():
+    batches = []
+    scheduler = EventScheduler(batches.append)
+
+    scheduler.changed("src/a.html")
+    scheduler.changed("src/b.html")
+    scheduler.changed("src/a.html")
+    scheduler.deleted("src/b.html")
+    scheduler.moved("src/c.html", "src/d.html")
+    scheduler.deleted("src/e.html")
+    scheduler.changed("src/e.html")
+
+    assert scheduler.flush() == {
+        "src/a.html": EventScheduler.CHANGED,
+        "src/b.html": EventScheduler.DELETED,
+        "src/c.html": EventScheduler.DELETED,
+        "src/d.html": EventScheduler.CHANGED,
+        "src/e.html": EventScheduler.CHANGED
+    }
+    assert len(batches) == 1
+    assert scheduler.flush() == {}
+    assert len(batches) == 1
+
+
+def test_event_scheduler_quiet_period():
+    batches = []
+    done = threading.Event()
+
+    def callback(batch):
+        batches.append((time.monotonic(), batch))
+        done.set()
+
+    scheduler = EventScheduler(callback, quiet_period=0.2, max_delay=5)
+    scheduler.start()
+    try:
+        start = time.monotonic()
+        for i in range(5):
+            scheduler.changed("src/page{}.html".format(i % 2))
+            time.sleep(0.05)
+        assert done.wait(5)
+    finally:
+        scheduler.stop()
+
+    assert len(batches) == 1
+    handed_over, batch = batches[0]
+    # Ordered by the last event of every path
+    assert list(batch) == ["src/page1.html", "src/page0.html"]
+    assert handed_over - start >= 0.2
+
+
+def test_event_scheduler_max_delay():
+    batches = []
+    scheduler = EventScheduler(batches.append, quiet_period=1, max_delay=0.2)
+    scheduler.start()
+    try:
+        # Events keep coming faster than the quiet period
+        deadline = time.monotonic() + 1
+        while time.monotonic() < deadline and not batches:
+            scheduler.changed("src/index.html")
+            time.sleep(0.02)
+        assert batches
+    finally:
+        scheduler.stop()
+
+
+def test_event_scheduler_stop_flushes():
+    batches = []
+    scheduler = EventScheduler(batches.append, quiet_period=10)
+    scheduler.start()
+    scheduler.changed("src/index.html")
+    scheduler.stop()
+    assert batches == [{"src/index.html": EventScheduler.CHANGED}]
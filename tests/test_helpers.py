@@ -0,0 +1,58 @@
+import os
+
+import pytest
+from reactonite.Helpers import files_match, sync_file
+
+
+def write(path, content):
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+def test_sync_file_copy(tmp_path):
+    src = os.path.join(str(tmp_path), "logo.svg")
+    dest = os.path.join(str(tmp_path), "logo-copy.svg")
+    write(src, "<svg></svg>")
+
+    assert sync_file(src, dest)
+    assert files_match(src, dest)
+    assert not sync_file(src, dest)
+
+    write(src, "<svg>changed</svg>")
+    assert sync_file(src, dest)
+    with open(dest) as file:
+        assert file.read() == "<svg>changed</svg>"
+
+
+def test_sync_file_hash_check(tmp_path):
+    src = os.path.join(str(tmp_path), "main.css")
+    dest = os.path.join(str(tmp_path), "main-copy.css")
+    write(src, "p {}")
+    write(dest, "p {}")
+
+    os.utime(dest, (0, 0))
+
+    assert not files_match(src, dest, check="mtime")
+    assert files_match(src, dest, check="hash")
+    assert not sync_file(src, dest, check="hash")
+    assert sync_file(src, dest, check="mtime")
+
+
+@pytest.mark.parametrize("mode", ["hardlink", "reflink"])
+def test_sync_file_links(tmp_path, mode):
+    src = os.path.join(str(tmp_path), "video.mp4")
+    dest = os.path.join(str(tmp_path), "video-copy.mp4")
+    write(src, "frames")
+
+    assert sync_file(src, dest, mode=mode)
+    assert files_match(src, dest, check="hash")
+    assert not sync_file(src, dest, mode=mode)
+    if mode == "hardlink":
+        assert os.path.samefile(src, dest)
+
+
+def test_sync_file_unknown_mode(tmp_path):
+    src = os.path.join(str(tmp_path), "main.js")
+    write(src, "")
+    with pytest.raises(RuntimeError):
+        sync_file(src, src + ".copy", mode="symlink")
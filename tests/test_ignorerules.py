@@ -0,0 +1,64 @@
+import os
+
+from reactonite.Helpers import create_dir
+from reactonite.IgnoreRules import IgnoreRules
+
+
+def test_ignore_rules_patterns():
+    rules = IgnoreRules("project", [
+        "# comment", "", ".*", "*~", "*.sw[op]", "drafts/", "/src/private",
+        "src/**/tmp", "!.keep", "\\!important.html"
+    ])
+    assert rules.patterns[0] == ".*"
+
+    def ignored(path, is_dir=False):
+        return rules.is_ignored(os.path.join("project", path), is_dir)
+
+    assert ignored("src/.DS_Store")
+    assert ignored("src/.git", is_dir=True)
+    assert ignored("src/.git/objects/ab/cdef")
+    assert ignored("src/index.html~")
+    assert ignored("src/blog/post.html.swp")
+    assert not ignored("src/blog/post.html.swx")
+    assert not ignored("src/index.html")
+
+    # Trailing slashes only match directories, at any depth
+    assert ignored("src/blog/drafts", is_dir=True)
+    assert ignored("src/blog/drafts/post.html")
+    assert not ignored("src/drafts")
+
+    # Patterns with a slash are anchored to the project dir
+    assert ignored("src/private/page.html")
+    assert not ignored("src/blog/private", is_dir=True)
+    assert ignored("src/tmp")
+    assert ignored("src/a/b/tmp/page.html")
+
+    # The last matching pattern wins
+    assert not ignored("src/.keep")
+    assert ignored("src/!important.html")
+
+    # Paths outside the project dir are never ignored
+    assert not rules.is_ignored(os.path.join("elsewhere", ".git"), True)
+
+
+def test_ignore_rules_walk(tmp_path):
+    base_dir = str(tmp_path)
+    src_dir = os.path.join(base_dir, "src")
+    for dirname in ("blog", ".git", os.path.join("blog", "drafts")):
+        create_dir(os.path.join(src_dir, dirname))
+    for filename in ("index.html", ".DS_Store", "index.html~",
+                     os.path.join(".git", "HEAD"),
+                     os.path.join("blog", "post.html"),
+                     os.path.join("blog", "drafts", "draft.html")):
+        open(os.path.join(src_dir, filename), 'a').close()
+    with open(os.path.join(base_dir, ".reactoniteignore"), 'w') as file:
+        file.write("drafts/\n")
+
+    rules = IgnoreRules.load(
+        base_dir, [".*", "*~"], filename=".reactoniteignore"
+    )
+    assert rules.patterns == [".*", "*~", "drafts/"]
+    assert sorted(
+        os.path.relpath(path, src_dir) for path in rules.walk(src_dir)
+    ) == [os.path.join("blog", "post.html"), "index.html"]
+    assert list(rules.walk(os.path.join(src_dir, ".git"))) == []
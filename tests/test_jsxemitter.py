@@ -0,0 +1,35 @@
+from bs4 import BeautifulSoup
+from reactonite.JSXEmitter import JSXEmitter
+
+
+def emit(html, expressions=None, strip=False):
+    soup = BeautifulSoup(html, "html.parser")
+    emitter = JSXEmitter(expressions=expressions)
+    for node in soup.contents:
+        emitter.write_node(node, strip=strip)
+    return emitter.getvalue()
+
+
+def test_emit_tags_and_attributes():
+    jsx = emit('<div id="a" class="x y"><img src="{logo}"><br></div>',
+               expressions=["{logo}"])
+    assert jsx == '<div class="x y" id="a"><img src={logo}/><br/></div>'
+
+    jsx = emit('<p title=\'say "hi"\'>a &amp; b &lt; c</p>')
+    assert jsx == '<p title=\'say "hi"\'>a &amp; b &lt; c</p>'
+
+
+def test_emit_text_escapes_braces():
+    assert emit("<p>{name}</p>") == "<p>{'{'}name{'}'}</p>"
+    assert emit("  text  ", strip=True) == "text"
+
+
+def test_emit_style_template_literal():
+    jsx = emit('<style type="text/css">a::before{content:"\\f101`${x}"}'
+               '</style>')
+    assert jsx == ('<style type="text/css">'
+                   '{`a::before{content:"\\\\f101\\`\\${x}"}`}</style>')
+
+
+def test_emit_skips_comments():
+    assert emit("<p>a<!-- note -->b</p>") == "<p>ab</p>"
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from reactonite import __version__
+from reactonite.GrapesjsServer import create_app
+from reactonite.main import cli
+
+# Importing the cli must stay cheap, scripts and editors call it many times
+STARTUP_BUDGET = 0.15
+HEAVY_MODULES = (
+    "bs4", "flask", "flask_cors", "watchdog", "reactonite.Transpiler",
+    "reactonite.ReactoniteWatcher", "reactonite.NodeWrapper",
+    "reactonite.StaticServer", "reactonite.Compressor"
+)
+
+MEASURE_STARTUP = """
+import sys, time
+start = time.perf_counter()
+import reactonite.main
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(",".join(name for name in {!r} if name in sys.modules))
+""".format(HEAVY_MODULES)
+
+
+def test_cli_startup():
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    timings = []
+    for _ in range(3):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE_STARTUP],
+            cwd=package_dir, stdout=subprocess.PIPE, check=True,
+            universal_newlines=True
+        ).stdout.splitlines()
+        assert output[1] == "", "imported at startup: " + output[1]
+        timings.append(float(output[0]))
+
+    assert min(timings) < STARTUP_BUDGET
+
+
+def test_cli_version():
+    result = CliRunner().invoke(cli, ["--version"])
+    assert result.exit_code == 0
+    assert __version__ in result.output
+
+
+def test_grapesjs_server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("src")
+    client = create_app().test_client()
+
+    response = client.post(
+        "/grapesjs", data={"html": "<p>Hello</p>", "css": "p {}"}
+    )
+    assert response.status_code == 200
+    with open(os.path.join("src", "index.html")) as file:
+        assert "<p>Hello</p>" in file.read()
@@ -2,10 +2,11 @@ import json
 import os
 import shutil
 import stat
+import subprocess
 
 import pytest
 from reactonite.Helpers import create_dir
-from reactonite.NodeWrapper import NodeWrapper
+from reactonite.NodeWrapper import NodeWrapper, PrettierWorker
 
 
 def delete_dir(filepath):
@@ -96,6 +97,202 @@ def test_build():
                                        "robots.txt"))
 
 
+def test_toolchain_detection_cached(monkeypatch):
+    node = NodeWrapper()
+    assert set(node.versions) == {"npx", "npm", "node"}
+
+    def fail_run(*args, **kwargs):
+        raise AssertionError("toolchain detected twice")
+
+    monkeypatch.setattr("reactonite.NodeWrapper.subprocess.run", fail_run)
+    assert NodeWrapper().versions == node.versions
+
+
+def test_prettify_files_chunks(monkeypatch):
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0)
+
+    node = NodeWrapper()
+    monkeypatch.setattr("reactonite.NodeWrapper.subprocess.run", fake_run)
+
+    paths = ["page{}.js".format(i) for i in range(10)]
+    assert node.prettify_files(paths, max_args_length=30)
+
+    formatted = []
+    for args in calls:
+        assert args[:3] == [node.npx, "prettier", "--write"]
+        assert len(" ".join(args[3:])) <= 30
+        formatted.extend(args[3:])
+    assert formatted == paths
+    assert len(calls) == 4
+
+
+FAKE_PRETTIER = """
+const fs = require("fs");
+const path = require("path");
+module.exports = {
+  version: "0.0.0-test",
+  resolveConfig: () => null,
+  format: (source, options) => {
+    const marker = path.join(__dirname, "crashed");
+    if (source === "crash" && !fs.existsSync(marker)) {
+      fs.writeFileSync(marker, "");
+      process.exit(1);
+    }
+    if (source === "invalid") {
+      throw new Error("syntax error");
+    }
+    return source.trim() + ";\\n";
+  }
+};
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs nodejs")
+def test_prettier_worker(tmp_path):
+    module_dir = tmp_path / "node_modules" / "prettier"
+    module_dir.mkdir(parents=True)
+    (module_dir / "package.json").write_text('{"main": "index.js"}')
+    (module_dir / "index.js").write_text(FAKE_PRETTIER)
+
+    node = NodeWrapper()
+    worker = node.prettier_worker(module_dir=str(tmp_path))
+    # Run the worker script directly instead of through npx
+    worker.command = worker.command[3:]
+
+    try:
+        assert worker.format("  let a = 1  ", "App.js") == "let a = 1;\n"
+        assert worker.version == "0.0.0-test"
+
+        with pytest.raises(RuntimeError):
+            worker.format("invalid", "App.js")
+
+        # Worker is restarted after crashing
+        assert worker.format("crash", "App.js") == "crash;\n"
+        assert worker.is_alive()
+    finally:
+        worker.stop()
+    assert not worker.is_alive()
+
+
+def test_prettier_worker_not_found(tmp_path, monkeypatch):
+    worker = PrettierWorker(["reactonite-missing-binary"])
+    with pytest.raises(RuntimeError):
+        worker.format("let a = 1", "App.js")
+    assert worker.disabled
+
+    # Not started again for every file once it failed
+    starts = []
+    monkeypatch.setattr(worker, "start", lambda: starts.append(1))
+    with pytest.raises(RuntimeError):
+        worker.format("let b = 2", "App.js")
+    assert starts == []
+
+
+FAKE_PRERENDER_MODULES = {
+    "@babel/core": """
+        exports.transformSync = (code) => ({ code: code });
+    """,
+    "babel-preset-react-app": "",
+    "react": """
+        exports.createElement = (type, props, ...children) =>
+            ({ type: type, props: Object.assign({ children: children },
+                                                props) });
+    """,
+    "react-dom": """
+        const render = (element) => {
+            if (typeof element === "string") return element;
+            if (typeof element.type === "function") {
+                return render(element.type(element.props));
+            }
+            const attrs = Object.keys(element.props)
+                .filter((key) => key !== "children")
+                .map((key) => " " + key + '="' + element.props[key] + '"');
+            return "<" + element.type + attrs.join("") + ">" +
+                element.props.children.map(render).join("") +
+                "</" + element.type + ">";
+        };
+        exports.renderToString = render;
+    """,
+    "react-router-dom": """
+        exports.StaticRouter = (props) => props.children[0];
+    """,
+    "react-helmet": """
+        const tag = (html) => ({ toString: () => html });
+        exports.Helmet = {
+            renderStatic: () => ({
+                title: tag("<title>Prerendered</title>"),
+                base: tag(""), meta: tag('<meta name="x">'), link: tag(""),
+                style: tag(""), script: tag(""), noscript: tag("")
+            })
+        };
+    """
+}
+
+
+def test_prerender(tmp_path):
+    for name, source in FAKE_PRERENDER_MODULES.items():
+        module_dir = tmp_path / "node_modules" / name
+        module_dir.mkdir(parents=True)
+        (module_dir / "index.js").write_text(source)
+    (tmp_path / "node_modules" / "react-dom" / "server.js").write_text(
+        'module.exports = require("./index.js");'
+    )
+
+    src_dir = tmp_path / "src"
+    (src_dir / "blog").mkdir(parents=True)
+    (src_dir / "logo.svg").write_text("<svg></svg>")
+    (src_dir / "banner.svg").write_text("<svg></svg>")
+    (src_dir / "style.css").write_text("p { color: red; }")
+    (src_dir / "App.js").write_text(
+        'const React = require("react");\n'
+        'exports.default = () => React.createElement("p", {}, "Home");\n'
+    )
+    (src_dir / "blog" / "post.js").write_text(
+        'const React = require("react");\n'
+        'require("../style.css");\n'
+        'const logo = require("../logo.svg").default;\n'
+        'const banner = require("../banner.svg").default;\n'
+        'exports.default = () => React.createElement("div", {},\n'
+        '  React.createElement("img", {src: logo}),\n'
+        '  React.createElement("img", {src: banner}));\n'
+    )
+
+    build_dir = tmp_path / "build"
+    (build_dir / "static" / "media").mkdir(parents=True)
+    # Webpack 4 hashes media with 8 hex digits, webpack 5 with 20
+    (build_dir / "static" / "media" / "logo.0123abcd.svg").write_text("")
+    (build_dir / "static" / "media" / "banner.0123456789abcdef0123.svg") \
+        .write_text("")
+    (build_dir / "index.html").write_text(
+        '<html><head><title>React App</title></head>'
+        '<body><div id="root"></div></body></html>'
+    )
+
+    npm = NodeWrapper()
+    npm.prerender([
+        {"path": "/", "module": "./App"},
+        {"path": "/blog/post", "module": "./blog/post"}
+    ], working_dir=str(tmp_path))
+
+    html = (build_dir / "index.html").read_text()
+    assert '<div id="root"><p>Home</p></div>' in html
+    assert '<title>Prerendered</title><meta name="x"></head>' in html
+    assert "React App" not in html
+
+    html = (build_dir / "blog" / "post" / "index.html").read_text()
+    assert '<div id="root"><div><img src="/static/media/logo.0123abcd.svg">' \
+        in html
+    assert '<img src="/static/media/banner.0123456789abcdef0123.svg">' in html
+
+    with pytest.raises(RuntimeError):
+        npm.prerender([{"path": "/missing", "module": "./missing"}],
+                      working_dir=str(tmp_path))
+
+
 @pytest.fixture(scope="session", autouse=True)
 def cleanup(request):
     """Cleanup a testing directory once we are finished."""
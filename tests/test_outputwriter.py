@@ -0,0 +1,55 @@
+import os
+
+from reactonite.OutputWriter import OutputWriter
+
+
+def test_output_writer_write(tmp_path):
+    path = os.path.join(str(tmp_path), "App.js")
+    writer = OutputWriter()
+
+    assert writer.write(path, "const App = 1;\n")
+    os.utime(path, (0, 0))
+    assert not writer.write(path, "const App = 1;\n")
+    assert os.stat(path).st_mtime == 0
+    assert writer.write(path, "const App = 2;\n")
+    assert (writer.written, writer.skipped) == (2, 1)
+
+
+def test_output_writer_formatted_later(tmp_path):
+    path = os.path.join(str(tmp_path), "index.js")
+    formatted = {}
+    writer = OutputWriter(formatted)
+
+    assert writer.write(path, "let a=1", formatted=False)
+    assert list(writer.pending) == [path]
+    with open(path, 'w') as file:
+        file.write("let a = 1;\n")
+    writer.mark_formatted([path])
+    assert writer.pending == {}
+    assert set(formatted[path]) == {"source", "output"}
+
+    # Compared with what was written before formatting
+    assert not OutputWriter(formatted).write(path, "let a=1", formatted=False)
+
+    # Modified outside of the writer, written again
+    with open(path, 'a') as file:
+        file.write("// edited\n")
+    assert OutputWriter(formatted).write(path, "let a=1", formatted=False)
+
+
+def test_output_writer_copy_and_merge(tmp_path):
+    src = os.path.join(str(tmp_path), "style.css")
+    dest = os.path.join(str(tmp_path), "style-copy.css")
+    with open(src, 'w') as file:
+        file.write("p {}")
+
+    writer = OutputWriter()
+    assert writer.copy(src, dest)
+    assert not writer.copy(src, dest)
+
+    fork = writer.fork()
+    assert (fork.written, fork.skipped) == (0, 0)
+    fork.write(os.path.join(str(tmp_path), "a.js"), "a", formatted=False)
+    writer.merge(fork)
+    assert (writer.written, writer.skipped) == (2, 1)
+    assert len(writer.pending) == 1
@@ -0,0 +1,40 @@
+import json
+import os
+import pickle
+
+from reactonite.Profiler import Profiler
+
+
+def test_profiler_summary(tmp_path):
+    profiler = Profiler()
+    with profiler.phase("transpile file", "a.html"):
+        with profiler.phase("parse"):
+            pass
+    with profiler.phase("transpile file", "b.html"):
+        with profiler.phase("parse"):
+            sum(range(100000))
+
+    totals = profiler.get_phase_totals()
+    assert [total[0] for total in totals] == ["transpile file", "parse"]
+    assert totals[0][1] == 2
+    assert [total[0] for total in profiler.get_file_totals()] == \
+        ["b.html", "a.html"]
+    assert "Slowest files" in profiler.format_summary()
+
+    trace_path = os.path.join(str(tmp_path), "trace.json")
+    profiler.write_chrome_trace(trace_path)
+    with open(trace_path) as file:
+        events = json.load(file)["traceEvents"]
+    assert len(events) == 4
+    assert events[0]["ph"] == "X"
+    assert events[1]["args"]["file"] == "a.html"
+
+    # Events aren't sent along with copies for worker processes
+    assert pickle.loads(pickle.dumps(profiler)).events == []
+
+
+def test_profiler_disabled():
+    profiler = Profiler(enabled=False)
+    with profiler.phase("parse"):
+        pass
+    assert profiler.events == []
@@ -0,0 +1,73 @@
+import io
+import pickle
+
+from reactonite.Progress import TranspileProgress, format_bytes, \
+    format_duration
+
+
+def test_progress_machine_readable():
+    stream = io.StringIO()
+    progress = TranspileProgress(stream=stream, min_interval=0)
+    assert not progress.interactive
+
+    progress.start(3, 300, unchanged_pages=2, unchanged_static=1)
+    progress.file_done("a.html", 100, TranspileProgress.PAGE)
+    progress.file_done("b.css", 100, TranspileProgress.COPIED)
+    progress.file_done("c.css", 100, TranspileProgress.SKIPPED)
+    progress.add_node_time(0.5)
+    progress.summary(routes=4)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 4
+    assert lines[0].startswith("progress files=1/3 bytes=100/300 ")
+    assert "eta_s=" in lines[0]
+    assert lines[2].endswith("eta_s=0.0")
+    assert lines[3].startswith(
+        "summary pages=1 unchanged_pages=2 static_copied=1 "
+        "static_skipped=2 routes=4 bytes=300 "
+    )
+    assert lines[3].endswith("node_s=0.500 writes_skipped=0")
+
+
+def test_progress_interactive():
+    stream = io.StringIO()
+    progress = TranspileProgress(
+        stream=stream, interactive=True, min_interval=0
+    )
+    progress.start(2, 2048)
+    progress.file_done("a.html", 1024, TranspileProgress.PAGE)
+    progress.file_done("b.html", 1024, TranspileProgress.PAGE)
+    progress.summary(routes=3)
+
+    output = stream.getvalue()
+    assert output.startswith("\r[1/2]  50% ")
+    assert "\r[2/2] 100% " in output
+    assert output.endswith(
+        "\nTranspiled 2 pages (0 unchanged), copied 0 static files "
+        "(0 skipped), 3 routes in " + output.split(" routes in ")[1]
+    )
+
+
+def test_progress_merge():
+    progress = TranspileProgress(stream=io.StringIO(), min_interval=0)
+    progress.start(2, 20)
+
+    # Copies sent to worker processes only record what they did
+    worker_progress = pickle.loads(pickle.dumps(progress))
+    worker_progress.file_done("a.html", 10, TranspileProgress.PAGE)
+    worker_progress.file_done("b.png", 10, TranspileProgress.COPIED)
+    assert worker_progress.stream is None
+    assert len(worker_progress.records) == 2
+
+    progress.merge(pickle.loads(pickle.dumps(worker_progress)))
+    assert progress.files_done == 2
+    assert progress.bytes_done == 20
+    assert progress.counts[TranspileProgress.PAGE] == 1
+    assert progress.counts[TranspileProgress.COPIED] == 1
+
+
+def test_progress_format():
+    assert format_bytes(512) == "512.0 B"
+    assert format_bytes(1536) == "1.5 KB"
+    assert format_duration(2.34) == "2.3s"
+    assert format_duration(65) == "1m05s"
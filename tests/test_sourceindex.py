@@ -0,0 +1,60 @@
+import os
+
+from reactonite.Helpers import create_dir
+from reactonite.IgnoreRules import IgnoreRules
+from reactonite.SourceIndex import SourceIndex
+
+
+def test_source_index(tmp_path):
+    src_dir = os.path.join(str(tmp_path), "src")
+    create_dir(os.path.join(src_dir, "blog"))
+    for path in ("index.html", os.path.join("blog", "index.html")):
+        open(os.path.join(src_dir, path), 'a').close()
+
+    source_index = SourceIndex(src_dir)
+    assert not source_index.isfile(os.path.join(src_dir, "index.html"))
+
+    filepaths = source_index.scan()
+    assert sorted(filepaths) == [
+        os.path.join(src_dir, "blog", "index.html"),
+        os.path.join(src_dir, "index.html")
+    ]
+    assert source_index.isfile(os.path.join(src_dir, "index.html"))
+    assert source_index.isfile(
+        os.path.join(src_dir, "blog", "..", "blog", "index.html")
+    )
+    assert not source_index.isfile(os.path.join(src_dir, "blog"))
+
+    about_path = os.path.join(src_dir, "about.html")
+    open(about_path, 'a').close()
+    source_index.add(about_path)
+    assert source_index.isfile(about_path)
+
+    os.rename(os.path.join(src_dir, "blog"), os.path.join(src_dir, "news"))
+    source_index.move(os.path.join(src_dir, "blog"),
+                      os.path.join(src_dir, "news"))
+    assert not source_index.isfile(os.path.join(src_dir, "blog",
+                                                "index.html"))
+    assert source_index.isfile(os.path.join(src_dir, "news", "index.html"))
+
+    source_index.remove(about_path)
+    assert not source_index.isfile(about_path)
+
+
+def test_source_index_outside_src_dir(tmp_path):
+    src_dir = os.path.join(str(tmp_path), "src")
+    create_dir(src_dir)
+    readme_path = os.path.join(str(tmp_path), "README.html")
+    open(readme_path, 'a').close()
+    draft_path = os.path.join(src_dir, "draft.html")
+    open(draft_path, 'a').close()
+
+    source_index = SourceIndex(
+        src_dir, IgnoreRules(str(tmp_path), ["draft.html"])
+    )
+    source_index.scan()
+    # Checked on the file system like before, not part of the index
+    assert source_index.isfile(readme_path)
+    assert not source_index.isfile(os.path.join(str(tmp_path), "x.html"))
+    # Ignored files aren't pages of the app
+    assert not source_index.isfile(draft_path)
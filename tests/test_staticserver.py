@@ -0,0 +1,97 @@
+import gzip
+import http.client
+import os
+import threading
+
+import pytest
+from reactonite.StaticServer import BuildServer
+
+
+def write(path, content):
+    with open(path, 'wb') as file:
+        file.write(content)
+
+
+@pytest.fixture
+def server(tmp_path):
+    build_dir = str(tmp_path)
+    os.makedirs(os.path.join(build_dir, "static", "js"))
+    os.makedirs(os.path.join(build_dir, "about"))
+    write(os.path.join(build_dir, "index.html"), b"<div id='root'></div>")
+    write(os.path.join(build_dir, "about", "index.html"), b"<p>About</p>")
+    main_js = os.path.join(build_dir, "static", "js", "main.1a2b3c4d.js")
+    write(main_js, b"0123456789")
+    write(main_js + ".gz", gzip.compress(b"0123456789"))
+
+    server = BuildServer(("127.0.0.1", 0), build_dir)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, headers=None):
+    connection = http.client.HTTPConnection(*server.server_address)
+    connection.request("GET", path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+
+def test_spa_fallback(server):
+    response, body = request(server, "/blog/post")
+    assert response.status == 200
+    assert body == b"<div id='root'></div>"
+    assert response.getheader("Cache-Control") == "no-cache"
+
+    response, body = request(server, "/about")
+    assert body == b"<p>About</p>"
+
+    response, _ = request(server, "/static/js/missing.js")
+    assert response.status == 404
+
+    # Paths can't escape the build directory
+    response, body = request(server, "/../../etc/passwd")
+    assert body == b"<div id='root'></div>"
+
+
+def test_caching_headers(server):
+    path = "/static/js/main.1a2b3c4d.js"
+    response, body = request(server, path)
+    assert body == b"0123456789"
+    assert response.getheader("Cache-Control") == \
+        "public, max-age=31536000, immutable"
+    assert response.getheader("Vary") == "Accept-Encoding"
+
+    etag = response.getheader("ETag")
+    response, body = request(server, path, {"If-None-Match": etag})
+    assert response.status == 304
+    assert body == b""
+
+
+def test_precompressed(server):
+    path = "/static/js/main.1a2b3c4d.js"
+    response, body = request(server, path, {"Accept-Encoding": "br, gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert gzip.decompress(body) == b"0123456789"
+
+    response, body = request(server, path, {"Accept-Encoding": "gzip;q=0"})
+    assert response.getheader("Content-Encoding") is None
+    assert body == b"0123456789"
+
+
+def test_range(server):
+    path = "/static/js/main.1a2b3c4d.js"
+    response, body = request(server, path, {"Range": "bytes=2-4"})
+    assert response.status == 206
+    assert response.getheader("Content-Range") == "bytes 2-4/10"
+    assert body == b"234"
+
+    response, body = request(server, path, {"Range": "bytes=-3"})
+    assert body == b"789"
+
+    response, _ = request(server, path, {"Range": "bytes=20-"})
+    assert response.status == 416
+    assert response.getheader("Content-Range") == "bytes */10"
@@ -1,11 +1,15 @@
 import os
 import shutil
+import threading
 import uuid
 
 import pytest
+from reactonite.EventScheduler import EventScheduler
 from reactonite.Helpers import create_dir
+from reactonite.Profiler import Profiler
 from reactonite.PropsMap import props_map
-from reactonite.Transpiler import Transpiler
+from reactonite.ReactoniteWatcher import ReactoniteWatcher
+from reactonite.Transpiler import ReactCodeMapper, Transpiler
 
 from file_vars import (full_working_example, full_working_example_js,
                        minimal_working_example, minimal_working_example_js)
@@ -128,3 +132,576 @@ def test_transpiler_transpileFile():
 
     assert os.path.isfile(dest_file_path)
     assert check_full_example_js(dest_file_path)
+
+
+def test_react_code_mapper_getReactTagAttrs(tmp_path):
+    src_dir = str(tmp_path)
+    open(os.path.join(src_dir, "logo.png"), 'a').close()
+    open(os.path.join(src_dir, "about.html"), 'a').close()
+
+    mapper = ReactCodeMapper(src_dir, src_dir, props_map)
+
+    attrs = mapper.getReactTagAttrs(
+        "p", {"class": "big", "onclick": "f()", "style": "color: red"}, ""
+    )
+    assert attrs == {"className": "big"}
+
+    attrs = mapper.getReactTagAttrs("img", {"src": "logo.png"}, "")
+    assert attrs == {"src": "{logo_png}"}
+    assert mapper.add_variables == ["logo_png"]
+
+    attrs = mapper.getReactTagAttrs("a", {"href": "about.html"}, "")
+    assert attrs == {"to": "about"}
+    assert mapper.router_link_imported
+
+    assert mapper.getReactTagAttrs("script", {}, "") is None
+
+
+def test_transpiler_transpileFile_identical_tags(project, monkeypatch):
+    page_path = project.write(
+        "about.html",
+        '<body>\n'
+        '<p class="big" onclick="f()">One</p>\n'
+        '<p class="big" onclick="f()">Two</p>\n'
+        '<p class="Big">Three</p>\n'
+        '</body>\n'
+    )
+    transpiler = Transpiler(project.config, props_map)
+    dest_filepath = transpiler.transpileFile(page_path, prettify=False)
+    with open(dest_filepath) as file:
+        react_code = file.read()
+
+    # Every tag is rewritten, not only the first one with the same attrs
+    assert react_code.count('<p className="big">') == 2
+    assert '<p className="Big">Three</p>' in react_code
+    assert "class=" not in react_code
+    assert "onclick" not in react_code
+
+    # Tags deleted while rewriting may contain other tags
+    get_attrs = ReactCodeMapper.getReactTagAttrs
+
+    def drop_divs(self, tag, attrs, filepath_from_src):
+        if tag == "div":
+            return None
+        return get_attrs(self, tag, attrs, filepath_from_src)
+
+    monkeypatch.setattr(ReactCodeMapper, "getReactTagAttrs", drop_divs)
+    project.write(
+        "about.html",
+        '<body><div><p class="a"><b>Gone</b></p></div><p>Kept</p></body>'
+    )
+    transpiler.transpileFile(page_path, prettify=False)
+    with open(dest_filepath) as file:
+        react_code = file.read()
+    assert "Gone" not in react_code
+    assert "<p>Kept</p>" in react_code
+
+
+def read_tree(base_path):
+    contents = {}
+    for dirpath, _, filenames in os.walk(base_path):
+        for filename in filenames:
+            filepath = os.path.join(dirpath, filename)
+            with open(filepath, 'rb') as file:
+                contents[os.path.relpath(filepath, base_path)] = file.read()
+    return contents
+
+
+def test_transpile_project_parallel(make_project, tmp_path):
+    project = make_project(str(tmp_path))
+    project.write("index.html", full_working_example)
+    for i in range(6):
+        project.write(
+            os.path.join("blog", "post{}.html".format(i)),
+            minimal_working_example.replace(
+                "https://google.com", "post{}.html".format(i + 1)
+            )
+        )
+    create_random_tree(project.src_dir, num_directories=2, num_files=2)
+
+    index_routes = []
+    outputs = []
+    for jobs in (1, 2):
+        dest_dir = os.path.join(str(tmp_path), "dest{}".format(jobs))
+        create_dir(os.path.join(dest_dir, "src"))
+        open(os.path.join(dest_dir, "src", "index.js"), 'a').close()
+        config = dict(project.config, dest_dir=dest_dir)
+        transpiler = Transpiler(config, props_map)
+        transpiler.transpile_project(jobs=jobs)
+        index_routes.append(list(transpiler.index_routes.items()))
+        outputs.append(read_tree(dest_dir))
+
+    assert len(index_routes[0]) == 6
+    assert index_routes[0] == index_routes[1]
+    assert outputs[0] == outputs[1]
+
+
+def test_transpile_project_incremental(project, transpiled):
+    for name in ("index", "about", "contact"):
+        project.write(name + ".html")
+    create_random_tree(project.src_dir, num_directories=1, num_files=2)
+
+    Transpiler(project.config, props_map).transpile_project()
+    assert os.path.isfile(os.path.join(project.base_dir,
+                                       ".reactonite-manifest.json"))
+
+    transpiled.clear()
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+    assert transpiled == []
+    assert sorted(transpiler.index_routes) == ["about", "contact"]
+
+    with open(os.path.join(project.src_dir, "about.html"), 'a') as file:
+        file.write("<p>More</p>")
+    os.remove(project.dest_path("contact.js"))
+    transpiler.transpile_project()
+    assert sorted(transpiled) == ["about.html", "contact.html"]
+
+    transpiled.clear()
+    transpiler.transpile_project(force=True)
+    assert len(transpiled) == 3 + 2 * 2
+
+
+def test_transpile_project_link_dependencies(project, transpiled):
+    project.write("index.html")
+    home_path = project.write("home.html", minimal_working_example.replace(
+        "https://google.com", "about.html"
+    ))
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+
+    about_path = os.path.join(project.src_dir, "about.html")
+    home_js_path = project.dest_path("home.js")
+    assert transpiler.get_dependent_pages(about_path) == [home_path]
+    with open(home_js_path) as file:
+        assert 'href="about.html"' in file.read()
+
+    transpiled.clear()
+    project.write("about.html")
+    transpiler.transpile_project()
+
+    assert sorted(transpiled) == ["about.html", "home.html"]
+    with open(home_js_path) as file:
+        assert 'to="about"' in file.read()
+
+
+def test_transpiler_update_files(project, transpiled):
+    project.write("index.html")
+    project.write("home.html", minimal_working_example.replace(
+        "https://google.com", "about.html"
+    ))
+    project.write("contact.html")
+    project.write(os.path.join("blog", "post.html"))
+    project.write("style.css", "p { color: red; }")
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+    home_js_path = project.dest_path("home.js")
+
+    # Only the new page and the page whose link flips are transpiled
+    transpiled.clear()
+    about_path = project.write("about.html")
+    assert transpiler.update_files(changed=[about_path])
+    assert sorted(transpiled) == ["about.html", "home.html"]
+    assert sorted(transpiler.index_routes) == \
+        ["about", "blog/post", "contact", "home"]
+    with open(home_js_path) as file:
+        assert 'to="about"' in file.read()
+    with open(project.index_js) as file:
+        assert '"./about"' in file.read()
+
+    # Deleted pages lose their route, pages linking to them flip back
+    del transpiled[:]
+    os.remove(about_path)
+    shutil.rmtree(os.path.join(project.src_dir, "blog"))
+    assert transpiler.update_files(
+        deleted=[about_path, os.path.join(project.src_dir, "blog")]
+    )
+    assert transpiled == ["home.html"]
+    assert sorted(transpiler.index_routes) == ["contact", "home"]
+    with open(home_js_path) as file:
+        assert 'href="about.html"' in file.read()
+    with open(project.index_js) as file:
+        index_js = file.read()
+    assert '"./about"' not in index_js
+    assert '"./blog/post"' not in index_js
+
+    # The manifest is kept up to date, a full run has nothing left to do
+    del transpiled[:]
+    transpiler.transpile_project()
+    assert transpiled == []
+
+
+def test_transpiler_routes_parent_dir_named_src(make_project, tmp_path):
+    # Only src_dir itself counts, not other directories named like it
+    project = make_project(os.path.join(str(tmp_path), "websrc", "site"))
+    project.write("index.html")
+    post_path = project.write(os.path.join("blog", "post.html"))
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+    assert list(transpiler.index_routes) == ["blog/post"]
+    assert os.path.isfile(project.dest_path("blog", "post.js"))
+
+    os.remove(post_path)
+    transpiler.update_files(deleted=[post_path])
+    assert transpiler.index_routes == {}
+
+
+def test_transpile_project_cancel(project):
+    for name in ("index", "about", "contact"):
+        project.write(name + ".html")
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.cancel_event = threading.Event()
+    transpiler.cancel_event.set()
+    assert transpiler.transpile_project() is False
+    assert not os.path.exists(transpiler.manifest_path)
+
+    transpiler.cancel_event = None
+    assert transpiler.transpile_project() is True
+    assert os.path.exists(transpiler.manifest_path)
+    assert os.path.isfile(project.dest_path("about.js"))
+
+
+def test_transpiler_update_files_delete_unsaved(project, monkeypatch):
+    project.write("index.html")
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+
+    # Cancelled after the first page, nothing gets saved to the manifest
+    transpiler.cancel_event = threading.Event()
+    transpile_file = transpiler.transpileFile
+
+    def cancelling_transpileFile(filepath, prettify=True):
+        dest_filepath = transpile_file(filepath, prettify=prettify)
+        transpiler.cancel_event.set()
+        return dest_filepath
+
+    monkeypatch.setattr(transpiler, "transpileFile", cancelling_transpileFile)
+    created = [project.write("about.html"), project.write("blog.html")]
+    assert transpiler.update_files(changed=created) is False
+    assert list(transpiler.index_routes) == ["about"]
+
+    transpiler.cancel_event = None
+    monkeypatch.delattr(transpiler, "transpileFile")
+    for filepath in created:
+        os.remove(filepath)
+    assert transpiler.update_files(deleted=created)
+    assert transpiler.index_routes == {}
+    with open(project.index_js) as file:
+        assert '"./about"' not in file.read()
+
+    # Same for pages of a run whose formatting failed
+    monkeypatch.setattr(
+        "reactonite.NodeWrapper.NodeWrapper.prettify_files",
+        lambda self, paths, **kwargs: False
+    )
+    contact_path = project.write("contact.html")
+    assert transpiler.update_files(changed=[contact_path])
+    assert list(transpiler.index_routes) == ["contact"]
+    os.remove(contact_path)
+    assert transpiler.update_files(deleted=[contact_path])
+    assert transpiler.index_routes == {}
+
+
+def test_transpile_project_ignore(project):
+    for path in ("index.html", os.path.join("drafts", "wip.html")):
+        project.write(path)
+    for path in (".DS_Store", "style.css", "style.css~", "notes.txt",
+                 ".htaccess", os.path.join(".well-known", "assetlinks.json"),
+                 os.path.join(".git", "HEAD")):
+        project.write(path, "")
+    with open(os.path.join(project.base_dir, ".reactoniteignore"),
+              'w') as file:
+        file.write("# Work in progress\n/src/drafts/\n*.txt\n")
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+
+    # Other hidden files are part of the project
+    assert sorted(os.listdir(project.dest_path())) == \
+        [".htaccess", ".well-known", "App.js", "index.js", "style.css"]
+    assert os.path.isfile(project.dest_path(".well-known", "assetlinks.json"))
+    assert transpiler.index_routes == {}
+
+    # Created files matching the rules are left out of updates as well
+    swap_path = project.write(".index.html.swp", "")
+    transpiler.update_files(
+        changed=[swap_path, os.path.join(project.src_dir, "drafts")]
+    )
+    assert sorted(os.listdir(project.dest_path())) == \
+        [".htaccess", ".well-known", "App.js", "index.js", "style.css"]
+
+
+def test_transpile_project_index_js_unchanged(project, monkeypatch):
+    formatted = []
+    monkeypatch.setattr(
+        "reactonite.NodeWrapper.NodeWrapper.prettify_files",
+        lambda self, paths, **kwargs: formatted.append(list(paths)) or True
+    )
+    for name in ("index", "about"):
+        project.write(name + ".html")
+    index_js = project.index_js
+
+    Transpiler(project.config, props_map).transpile_project()
+    assert index_js in formatted[-1]
+
+    # Nothing changed, nothing to write or format
+    formatted.clear()
+    Transpiler(project.config, props_map).transpile_project()
+    assert formatted == []
+
+    # Changed pages are formatted, the route table stays the same
+    project.write(
+        "about.html", minimal_working_example.replace("Heading", "About")
+    )
+    Transpiler(project.config, props_map).transpile_project()
+    assert formatted[-1] == [project.dest_path("about.js")]
+
+    # Externally modified index.js is regenerated
+    with open(index_js, 'a') as file:
+        file.write("// edited")
+    Transpiler(project.config, props_map).transpile_project()
+    assert formatted[-1] == [index_js]
+
+    project.write("contact.html")
+    Transpiler(project.config, props_map).transpile_project()
+    assert index_js in formatted[-1]
+    with open(index_js) as file:
+        assert "/contact" in file.read()
+
+
+def test_transpile_project_keeps_unchanged_outputs(project, monkeypatch):
+    formatted = []
+
+    def prettify_files(self, paths, **kwargs):
+        formatted.append(list(paths))
+        for path in paths:
+            with open(path, 'a') as file:
+                file.write("\n")
+        return True
+
+    monkeypatch.setattr(
+        "reactonite.NodeWrapper.NodeWrapper.prettify_files", prettify_files
+    )
+    for name in ("index", "about", "contact"):
+        project.write(name + ".html")
+    project.write("style.css", "p { color: red; }")
+
+    Transpiler(project.config, props_map).transpile_project()
+    assert len(formatted[-1]) == 4
+    outputs = {
+        name: project.dest_path(name)
+        for name in ("App.js", "about.js", "contact.js", "index.js")
+    }
+    for path in outputs.values():
+        os.utime(path, (0, 0))
+
+    # Every file is transpiled again, nothing is written or formatted
+    formatted.clear()
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project(force=True, jobs=2)
+    assert formatted == []
+    assert transpiler.output_writer.written == 0
+    assert transpiler.output_writer.skipped == 5
+    assert all(os.stat(path).st_mtime == 0 for path in outputs.values())
+
+    # Only the page whose output changed is written and formatted
+    project.write(
+        "about.html", minimal_working_example.replace("Heading", "About")
+    )
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project(force=True)
+    assert formatted == [[outputs["about.js"]]]
+    assert transpiler.output_writer.written == 1
+    assert os.stat(outputs["contact.js"]).st_mtime == 0
+
+
+def test_transpile_project_profile(project):
+    for name in ("index", "about", "contact"):
+        project.write(name + ".html")
+    project.write("style.css", "p { color: red; }")
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.profiler = Profiler()
+    transpiler.transpile_project(jobs=2)
+
+    phases = set(total[0] for total in transpiler.profiler.get_phase_totals())
+    assert {"scan", "transpile", "transpile file", "parse", "rewrite",
+            "emit", "write", "sync static", "index.js",
+            "prettier"} <= phases
+    files = [total[0] for total in transpiler.profiler.get_file_totals()]
+    assert sorted(os.path.basename(filepath) for filepath in files) == \
+        ["about.html", "contact.html", "index.html", "style.css"]
+
+
+def test_transpile_project_progress(project, capsys):
+    for name in ("index", "about", "contact"):
+        project.write(name + ".html")
+    project.write("style.css", "p { color: red; }")
+
+    transpiler = Transpiler(project.config, props_map, verbose=True)
+    transpiler.transpile_project(jobs=2)
+    assert transpiler.progress is None
+
+    lines = capsys.readouterr().out.splitlines()
+    assert not any(line.startswith("Transpiling file ") for line in lines)
+    assert any(line.startswith("progress files=4/4 ") for line in lines)
+    summary = [line for line in lines if line.startswith("summary ")]
+    assert len(summary) == 1
+    assert summary[0].startswith(
+        "summary pages=3 unchanged_pages=0 static_copied=1 "
+        "static_skipped=0 routes=3 "
+    )
+
+    # Everything is skipped using the build manifest on the next run
+    transpiler = Transpiler(project.config, props_map, verbose=True)
+    transpiler.transpile_project()
+    summary = capsys.readouterr().out.splitlines()[-1]
+    assert summary.startswith(
+        "summary pages=0 unchanged_pages=3 static_copied=0 "
+        "static_skipped=1 routes=3 bytes=0 "
+    )
+    assert summary.endswith(" writes_skipped=1")
+
+
+def test_watcher_build(project, transpiled):
+    for name in ("index", "about", "contact"):
+        project.write(name + ".html")
+
+    watcher = ReactoniteWatcher(project.config)
+    watcher.transpiler.transpile_project()
+    assert sorted(transpiled) == ["about.html", "contact.html", "index.html"]
+
+    # A burst of events ends up in one build of the net changes
+    del transpiled[:]
+    about = os.path.join(project.src_dir, "about.html")
+    contact = os.path.join(project.src_dir, "contact.html")
+    with open(about, 'a') as file:
+        file.write("<p>More</p>")
+    watcher.scheduler.changed(about)
+    watcher.scheduler.changed(about)
+    os.remove(contact)
+    watcher.scheduler.changed(contact)
+    watcher.scheduler.deleted(contact)
+    watcher.worker.start()
+    try:
+        watcher.scheduler.flush()
+        assert watcher.worker.wait_idle(10)
+    finally:
+        watcher.worker.stop()
+
+    assert transpiled == ["about.html"]
+    assert not os.path.exists(project.dest_path("contact.js"))
+    assert os.path.isfile(project.dest_path("about.js"))
+
+
+def test_watcher_build_errors(project, monkeypatch, capsys):
+    for name in ("index", "about"):
+        project.write(name + ".html")
+
+    watcher = ReactoniteWatcher(project.config)
+    watcher.transpiler.transpile_project()
+
+    # Deletions requeued after a cancelled build are removed once
+    about = os.path.join(project.src_dir, "about.html")
+    os.remove(about)
+    assert watcher.build({about: EventScheduler.DELETED})
+    assert watcher.build({about: EventScheduler.DELETED})
+    assert "could not remove" not in capsys.readouterr().out
+    assert not os.path.exists(project.dest_path("about.js"))
+
+    # Failures are left to the BuildWorker to report
+    def fail(changed, deleted):
+        raise RuntimeError("broken page")
+
+    monkeypatch.setattr(watcher.transpiler, "update_files", fail)
+    with pytest.raises(RuntimeError):
+        watcher.build({about: EventScheduler.CHANGED})
+    assert watcher.transpiler.cancel_event is None
+
+
+def test_watcher_reuses_transpiler(project, monkeypatch):
+    for name in ("index", "about"):
+        project.write(name + ".html")
+
+    transpiler = Transpiler(project.config, props_map)
+    transpiler.transpile_project()
+    watcher = ReactoniteWatcher(project.config, transpiler=transpiler)
+    assert watcher.transpiler is transpiler
+
+    # The first rebuild is incremental, without a full transpile_project
+    monkeypatch.setattr(transpiler, "transpile_project", None)
+    about = project.write(
+        "about.html", minimal_working_example.replace("Heading", "About")
+    )
+    assert watcher.build({about: EventScheduler.CHANGED})
+    with open(project.dest_path("about.js")) as file:
+        assert "About" in file.read()
+
+
+def test_transpile_project_code_splitting(project):
+    for name in ("index", "about", os.path.join("blog", "post")):
+        project.write(name + ".html")
+    config = project.config
+    index_js = project.index_js
+
+    Transpiler(config, props_map).transpile_project()
+    with open(index_js) as file:
+        content = file.read()
+    assert "React.lazy" not in content
+    assert "Suspense" not in content
+
+    config["code_splitting"] = True
+    config["eager_routes"] = ["/about"]
+    Transpiler(config, props_map).transpile_project()
+    with open(index_js) as file:
+        content = file.read()
+    assert 'import REACTONITE__ABOUT from "./about";' in content
+    assert 'const REACTONITE__BLOG_POST = ' \
+        'React.lazy(() => import("./blog/post"));' in content
+    assert 'import App from "./App";' in content
+    assert "<React.Suspense fallback={null}>" in content
+
+    transpiler = Transpiler(config, props_map)
+    transpiler.prerender = True
+    transpiler.transpile_project()
+    with open(index_js) as file:
+        content = file.read()
+    assert 'const REACTONITE__BLOG_POST = ' \
+        'lazyRoute(() => import("./blog/post"));' in content
+    assert '{ path: "/blog/post", preload: REACTONITE__BLOG_POST.preload },' \
+        in content
+    assert "ReactDOM.hydrate(app, rootElement)" in content
+    assert content.rindex("import ") < content.index("function lazyRoute")
+    assert transpiler.get_prerender_routes() == [
+        {"path": "/", "module": "./App"},
+        {"path": "/about", "module": "./about"},
+        {"path": "/blog/post", "module": "./blog/post"}
+    ]
+
+
+def test_transpile_project_prefetch_links(project):
+    project.write("index.html")
+    project.write(os.path.join("blog", "index.html"))
+    project.write(
+        os.path.join("blog", "post.html"),
+        '<html><body><a href="index.html">Blog</a>'
+        '<a href="../index.html">Home</a></body></html>'
+    )
+
+    config = dict(project.config, code_splitting=True, prefetch_links=True)
+    Transpiler(config, props_map).transpile_project()
+
+    with open(project.dest_path("blog", "post.js")) as file:
+        content = file.read()
+    assert 'import Link from "../ReactonitePrefetch";' in content
+    assert '<Link prefetch="blog" to="blog/index">' in content
+    assert '<Link to="/">' in content
+
+    with open(project.dest_path("ReactonitePrefetch.js")) as file:
+        content = file.read()
+    assert '"blog": () => import("./blog/index"),' in content
+    assert '"blog/post": () => import("./blog/post"),' in content